@@ -0,0 +1,148 @@
+"""
+Async views in front of DRF views, for the hot read endpoints under ASGI
+
+Django's async ORM (aget, afirst, ...) runs each query on the request's one
+sync thread, so queries awaited together still run one after another, and
+DRF views are synchronous end to end. AsyncAPIView answers GET itself:
+authentication is awaited (SupabaseAuthentication.authenticate_async), the
+DRF view's permission, ETag and error handling are reused, and blocking ORM
+work goes through run(), which gives each call a worker thread and database
+connection of its own so independent queries of one request overlap. Other
+methods are handed to the DRF view unchanged.
+"""
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+from django.http import HttpResponse
+from django.views import View
+from rest_framework import status
+from rest_framework.response import Response
+
+from .etags import ConditionalRequestMixin, etag_matches
+
+
+_executor = None
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=getattr(settings, 'ASYNC_DB_THREADS', 32),
+            thread_name_prefix='async-db',
+        )
+    return _executor
+
+
+def _released(func):
+    @functools.wraps(func)
+    def call(*args, **kwargs):
+        try:
+            return func(*args, **kwargs)
+        finally:
+            # As at the end of a request: close (or pool) expired connections
+            close_old_connections()
+    return call
+
+
+async def run(func, *args, **kwargs):
+    """Await a blocking (ORM) call on a worker thread with its own connection"""
+    return await sync_to_async(
+        _released(func), thread_sensitive=False, executor=_get_executor()
+    )(*args, **kwargs)
+
+
+class AsyncAPIView(View):
+    """
+    Async GET for the DRF view class in api_view
+    Subclasses override read() (sync, runs on a worker thread) or respond()
+    (async, for reads that can overlap). Conditional views must override
+    read(), since the DRF view's own get() would compute the ETag again.
+    """
+
+    api_view = None
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        view = super().as_view(**initkwargs)
+        # Token authentication, no cookies; same as the DRF views
+        view.csrf_exempt = True
+        return view
+
+    async def get(self, request, *args, **kwargs):
+        view = self.api_view()
+        view.setup(request, *args, **kwargs)
+        view.format_kwarg = None
+        view.headers = view.default_response_headers
+        request = view.request = view.initialize_request(request, *args, **kwargs)
+
+        try:
+            await self.authenticate(view, request)
+            view.initial(request, *args, **kwargs)
+            response = await self.respond(view, request, *args, **kwargs)
+        except Exception as exc:
+            response = view.handle_exception(exc)
+
+        response = view.finalize_response(request, response, *args, **kwargs)
+        return self.rendered(response)
+
+    async def delegate(self, request, *args, **kwargs):
+        """Writes go through the DRF view as before"""
+        view = self.api_view.as_view()
+        return await sync_to_async(view)(request, *args, **kwargs)
+
+    post = put = patch = delete = delegate
+
+    async def authenticate(self, view, request):
+        """Request.user without blocking; mirrors Request._authenticate()"""
+        for authenticator in view.get_authenticators():
+            try:
+                if hasattr(authenticator, 'authenticate_async'):
+                    result = await authenticator.authenticate_async(request)
+                else:
+                    result = await run(authenticator.authenticate, request)
+            except Exception:
+                request._not_authenticated()
+                raise
+            if result is not None:
+                request._authenticator = authenticator
+                request.user, request.auth = result
+                return
+        request._not_authenticated()
+
+    async def respond(self, view, request, *args, **kwargs):
+        etag = None
+        if isinstance(view, ConditionalRequestMixin):
+            etag = await run(view.get_etag)
+            if self.fresh(request, etag):
+                return self.not_modified(etag)
+        response = await run(self.read, view, request, *args, **kwargs)
+        return self.with_etag(response, etag)
+
+    def read(self, view, request, *args, **kwargs):
+        return view.get(request, *args, **kwargs)
+
+    def fresh(self, request, etag):
+        return etag is not None and etag_matches(etag, request.headers.get('If-None-Match'), weak=True)
+
+    def not_modified(self, etag):
+        return Response(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+
+    def with_etag(self, response, etag):
+        if etag is not None and response.status_code == status.HTTP_200_OK:
+            response['ETag'] = etag
+        return response
+
+    def rendered(self, response):
+        """
+        Render here, as a plain response, so the handler does not hop to a
+        thread to render it
+        """
+        response.render()
+        plain = HttpResponse(response.content, status=response.status_code)
+        for header, value in response.items():
+            plain[header] = value
+        return plain
@@ -0,0 +1,142 @@
+"""
+PostgreSQL backend with a per-process pool of open connections
+
+For long-running servers (gunicorn/uvicorn workers). Closing a Django
+connection returns it to the pool instead of ending the session, and the
+next request checks it out again, so connection setup (TCP, TLS, auth) is
+paid once per pooled connection rather than once per request. Use with
+CONN_MAX_AGE = 0 so every request hands its connection back.
+
+OPTIONS:
+    POOL_SIZE       most connections per process (default 5)
+    POOL_TIMEOUT    seconds to wait for a free connection (default 10)
+    POOL_CHECK_IDLE connections idle longer than this many seconds are
+                    checked with SELECT 1 before reuse (default 30)
+"""
+import os
+import threading
+import time
+
+from django.db.backends.postgresql import base
+from psycopg2 import extensions
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+class PoolExhausted(base.Database.OperationalError):
+    """No pooled connection became free within POOL_TIMEOUT"""
+
+
+class ConnectionPool:
+    """Thread-safe pool of psycopg2 connections"""
+
+    def __init__(self, size, timeout, check_idle):
+        self.timeout = timeout
+        self.check_idle = check_idle
+        self.idle = []
+        self.lock = threading.Lock()
+        self.slots = threading.BoundedSemaphore(size)
+
+    def get(self, connect):
+        """An idle connection that still works, or a new one from connect()"""
+        if not self.slots.acquire(timeout=self.timeout):
+            raise PoolExhausted(f'No database connection free within {self.timeout}s')
+        try:
+            while True:
+                with self.lock:
+                    if not self.idle:
+                        break
+                    connection, returned_at = self.idle.pop()
+                if self._usable(connection, returned_at):
+                    return connection
+                self._discard(connection)
+            return connect()
+        except BaseException:
+            self.slots.release()
+            raise
+
+    def put(self, connection, discard=False):
+        try:
+            if discard or connection.closed:
+                self._discard(connection)
+                return
+            # Never hand out a session with an open transaction
+            if connection.info.transaction_status != extensions.TRANSACTION_STATUS_IDLE:
+                connection.rollback()
+            with self.lock:
+                self.idle.append((connection, time.monotonic()))
+        except base.Database.Error:
+            self._discard(connection)
+        finally:
+            self.slots.release()
+
+    def clear(self):
+        """Close every idle connection"""
+        with self.lock:
+            idle, self.idle = self.idle, []
+        for connection, _ in idle:
+            self._discard(connection)
+
+    def _usable(self, connection, returned_at):
+        if connection.closed:
+            return False
+        if time.monotonic() - returned_at < self.check_idle:
+            return True
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+            connection.rollback()
+        except base.Database.Error:
+            return False
+        return True
+
+    def _discard(self, connection):
+        try:
+            connection.close()
+        except base.Database.Error:
+            pass
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+
+    @property
+    def connection_pool(self):
+        # Keyed by process so a forked worker never shares its parent's sockets
+        key = (os.getpid(), self.alias)
+        pool = _pools.get(key)
+        if pool is None:
+            with _pools_lock:
+                pool = _pools.get(key)
+                if pool is None:
+                    options = self.settings_dict['OPTIONS']
+                    pool = _pools[key] = ConnectionPool(
+                        size=options.get('POOL_SIZE', 5),
+                        timeout=options.get('POOL_TIMEOUT', 10),
+                        check_idle=options.get('POOL_CHECK_IDLE', 30),
+                    )
+        return pool
+
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        for name in ('POOL_SIZE', 'POOL_TIMEOUT', 'POOL_CHECK_IDLE'):
+            params.pop(name, None)
+        return params
+
+    def get_new_connection(self, conn_params):
+        connect = super().get_new_connection
+        connection = self.connection_pool.get(lambda: connect(conn_params))
+        # A reused session keeps the isolation level it was last given
+        isolation_level = self.settings_dict['OPTIONS'].get('isolation_level')
+        if isolation_level is None:
+            self.isolation_level = base.IsolationLevel.READ_COMMITTED
+        else:
+            self.isolation_level = base.IsolationLevel(isolation_level)
+            connection.isolation_level = self.isolation_level
+        return connection
+
+    def _close(self):
+        # Closed inside atomic() Django keeps referring to the connection,
+        # so it must not go back to the pool for another thread to use
+        self.connection_pool.put(self.connection, discard=self.in_atomic_block)
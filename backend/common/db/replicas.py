@@ -0,0 +1,188 @@
+"""
+Read replicas: which database reads may use, and read-your-writes stickiness
+
+Safe reads go to a replica that answered its lag check recently enough.
+Reads go to the primary instead when
+- the request is a write (PUT/PATCH/POST/DELETE), so validation and
+  read-modify-write code never sees stale rows,
+- the caller wrote within REPLICA_STICKY_SECONDS (their own job, status or
+  profile change must show up on their next read),
+- the code runs inside a transaction on the primary, or under use_primary().
+
+A request keeps the replica it first read from, so cursors and rows read
+in one request agree. Shared caches fill from the primary (use_primary())
+so an invalidated entry is never refilled from a replica that is behind.
+"""
+import contextvars
+import hashlib
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+import jwt
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'dbpin'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+# Replica lag is measured at most this often per process and replica
+CHECK_INTERVAL_SECONDS = 5
+
+_primary = contextvars.ContextVar('db_primary', default=False)
+_replica = contextvars.ContextVar('db_replica', default=None)
+_health = {}
+_health_lock = threading.Lock()
+
+
+def replica_aliases():
+    return getattr(settings, 'DATABASE_READ_REPLICAS', [])
+
+
+def _sticky_seconds():
+    return getattr(settings, 'REPLICA_STICKY_SECONDS', 5)
+
+
+def _max_lag_seconds():
+    return getattr(settings, 'REPLICA_MAX_LAG_SECONDS', 10)
+
+
+@contextmanager
+def use_primary():
+    """Route every read in the block to the primary"""
+    token = _primary.set(True)
+    try:
+        yield
+    finally:
+        _primary.reset(token)
+
+
+def primary_required():
+    if _primary.get():
+        return True
+    # Reads inside a transaction must see its own uncommitted writes
+    return connections[DEFAULT_DB_ALIAS].in_atomic_block
+
+
+def replica_lag(alias):
+    """Seconds the replica is behind the primary; 0 for non-Postgres stand-ins"""
+    connection = connections[alias]
+    if connection.vendor != 'postgresql':
+        return 0.0
+    with connection.cursor() as cursor:
+        # Caught up when everything received is replayed; otherwise the age
+        # of the last replayed transaction
+        cursor.execute(
+            'SELECT CASE '
+            'WHEN NOT pg_is_in_recovery() THEN 0 '
+            'WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 '
+            'ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END'
+        )
+        return float(cursor.fetchone()[0])
+
+
+def is_healthy(alias):
+    """Whether a replica's last lag check passed; re-checked every few seconds"""
+    now = time.monotonic()
+    checked = _health.get(alias)
+    if checked is not None and now - checked[0] < CHECK_INTERVAL_SECONDS:
+        return checked[1]
+
+    # One thread measures while the others keep the previous answer
+    if not _health_lock.acquire(blocking=False):
+        return checked[1] if checked is not None else False
+    try:
+        try:
+            lag = replica_lag(alias)
+            healthy = lag <= _max_lag_seconds()
+            if not healthy:
+                logger.warning('Replica %s is %.1fs behind, reading from primary', alias, lag)
+        except DatabaseError:
+            logger.exception('Replica %s lag check failed', alias)
+            healthy = False
+        _health[alias] = (time.monotonic(), healthy)
+        return healthy
+    finally:
+        _health_lock.release()
+
+
+def read_alias():
+    """Database a read should use right now"""
+    if primary_required():
+        return DEFAULT_DB_ALIAS
+    chosen = _replica.get()
+    if chosen is not None:
+        return chosen
+    healthy = [alias for alias in replica_aliases() if is_healthy(alias)]
+    chosen = random.choice(healthy) if healthy else DEFAULT_DB_ALIAS
+    _replica.set(chosen)
+    return chosen
+
+
+def caller_key(request):
+    """
+    Pin key for the caller, from the bearer token's subject
+    The token is not verified here; it only picks a database, and
+    authentication still verifies it
+    """
+    header = request.headers.get('Authorization', '')
+    if not header.startswith('Bearer '):
+        return None
+    token = header.split(' ', 1)[1]
+    try:
+        subject = jwt.decode(token, options={'verify_signature': False}).get('sub')
+    except jwt.InvalidTokenError:
+        subject = None
+    subject = subject or hashlib.sha1(token.encode()).hexdigest()
+    return f'{KEY_PREFIX}:{subject}'
+
+
+class ReplicaStickinessMiddleware:
+    """
+    Sends writes, and reads by callers who just wrote, to the primary
+    Place it first so everything after it runs with the routing decided
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        key = caller_key(request) if replica_aliases() else None
+        write = request.method not in SAFE_METHODS
+        token = _primary.set(write or (key is not None and bool(cache.get(key))))
+        replica_token = _replica.set(None)
+        try:
+            response = self.get_response(request)
+        finally:
+            _replica.reset(replica_token)
+            _primary.reset(token)
+        if write and key is not None and response.status_code < 400:
+            cache.set(key, 1, timeout=_sticky_seconds())
+        return response
+
+    async def __acall__(self, request):
+        key = caller_key(request) if replica_aliases() else None
+        write = request.method not in SAFE_METHODS
+        token = _primary.set(write or (key is not None and bool(await cache.aget(key))))
+        replica_token = _replica.set(None)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _replica.reset(replica_token)
+            _primary.reset(token)
+        if write and key is not None and response.status_code < 400:
+            await cache.aset(key, 1, timeout=_sticky_seconds())
+        return response
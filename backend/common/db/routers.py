@@ -0,0 +1,22 @@
+"""
+Database router: writes to the primary, safe reads to healthy replicas
+"""
+from django.db import DEFAULT_DB_ALIAS
+
+from . import replicas
+
+
+class ReplicaRouter:
+    """Replicas mirror the primary, so relations and reads span all of them"""
+
+    def db_for_read(self, model, **hints):
+        return replicas.read_alias()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
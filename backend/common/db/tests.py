@@ -0,0 +1,111 @@
+"""
+Replica routing tests
+Run with config.test_settings, where replica_1 mirrors the test database:
+queries are told apart by the connection that ran them
+"""
+from unittest import mock
+
+import jwt
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections, transaction
+from django.http import HttpResponse
+from django.test import RequestFactory, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from users.models import User
+from . import replicas
+
+
+REPLICA = 'replica_1'
+
+
+def bearer(subject):
+    # Signature is never checked when picking a database
+    token = jwt.encode({'sub': subject}, 'x' * 32, algorithm='HS256')
+    return {'HTTP_AUTHORIZATION': f'Bearer {token}'}
+
+
+@override_settings(DATABASE_READ_REPLICAS=[REPLICA], REPLICA_STICKY_SECONDS=5, REPLICA_MAX_LAG_SECONDS=10)
+class ReplicaRoutingTests(TransactionTestCase):
+    # TestCase would wrap every test in a transaction, which pins reads to
+    # the primary
+    databases = {DEFAULT_DB_ALIAS, REPLICA}
+
+    def setUp(self):
+        cache.clear()
+        replicas._health.clear()
+        token = replicas._replica.set(None)
+        self.addCleanup(replicas._replica.reset, token)
+        self.factory = RequestFactory()
+
+    def run_queries(self, action):
+        """Run action(); returns the (primary, replica) query counts"""
+        with CaptureQueriesContext(connections[DEFAULT_DB_ALIAS]) as primary, \
+                CaptureQueriesContext(connections[REPLICA]) as replica:
+            action()
+        return len(primary), len(replica)
+
+    def request(self, method, subject):
+        """Send a request through the middleware; returns the alias reads used"""
+        seen = {}
+
+        def get_response(request):
+            seen['alias'] = replicas.read_alias()
+            return HttpResponse(status=201 if method == 'post' else 200)
+
+        middleware = replicas.ReplicaStickinessMiddleware(get_response)
+        middleware(getattr(self.factory, method)('/', **bearer(subject)))
+        return seen['alias']
+
+    def test_reads_go_to_replica(self):
+        self.assertEqual(self.run_queries(lambda: list(User.objects.all())), (0, 1))
+
+    def test_writes_go_to_primary(self):
+        primary, replica = self.run_queries(
+            lambda: User.objects.create_user('writer@example.com', 'Writer')
+        )
+        self.assertGreater(primary, 0)
+        self.assertEqual(replica, 0)
+
+    def test_reads_in_a_transaction_go_to_primary(self):
+        def read():
+            with transaction.atomic():
+                list(User.objects.all())
+
+        self.assertEqual(self.run_queries(read)[1], 0)
+
+    def test_reads_stick_to_primary_after_a_write(self):
+        self.assertEqual(self.request('get', 'alice'), REPLICA)
+        self.assertEqual(self.request('post', 'alice'), DEFAULT_DB_ALIAS)
+
+        # The writer reads from the primary; other callers are not affected
+        self.assertEqual(self.request('get', 'alice'), DEFAULT_DB_ALIAS)
+        self.assertEqual(self.request('get', 'bob'), REPLICA)
+
+        # Until the pin expires
+        cache.delete(replicas.caller_key(self.factory.get('/', **bearer('alice'))))
+        self.assertEqual(self.request('get', 'alice'), REPLICA)
+
+    def test_failed_writes_do_not_pin(self):
+        def failing(request):
+            return HttpResponse(status=400)
+
+        replicas.ReplicaStickinessMiddleware(failing)(self.factory.post('/', **bearer('carol')))
+        self.assertEqual(self.request('get', 'carol'), REPLICA)
+
+    def test_failed_lag_check_falls_back_to_primary(self):
+        with mock.patch.object(replicas, 'replica_lag', side_effect=DatabaseError('replica down')), \
+                self.assertLogs(replicas.logger, 'ERROR'):
+            self.assertEqual(self.run_queries(lambda: list(User.objects.all())), (1, 0))
+
+    def test_lagging_replica_falls_back_to_primary(self):
+        with mock.patch.object(replicas, 'replica_lag', return_value=60.0), \
+                self.assertLogs(replicas.logger, 'WARNING'):
+            self.assertEqual(replicas.read_alias(), DEFAULT_DB_ALIAS)
+
+    def test_lag_checks_are_cached(self):
+        with mock.patch.object(replicas, 'replica_lag', return_value=0.0) as lag:
+            for _ in range(3):
+                replicas._replica.set(None)
+                self.assertEqual(replicas.read_alias(), REPLICA)
+        self.assertEqual(lag.call_count, 1)
@@ -0,0 +1,159 @@
+"""
+Strong ETags and conditional requests for DRF views
+
+A view describes the current version of its resource with a few cheap
+values (updated_at stamps, counts) in get_etag_parts(). GET requests whose
+If-None-Match matches are answered with 304 before the object is loaded or
+serialized, and writes carrying a stale If-Match are refused with 412.
+"""
+import hashlib
+
+from django.db import transaction
+from django.db.models import Count, Max
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+
+from .fieldsets import selection_key
+
+
+def _part(value):
+    if hasattr(value, 'timestamp'):
+        return f'{value.timestamp():.6f}'
+    return str(value)
+
+
+def make_etag(*parts):
+    """Quoted strong ETag from version parts"""
+    digest = hashlib.sha1('|'.join(_part(part) for part in parts).encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def etag_matches(etag, header, weak=False):
+    """
+    Whether an If-Match / If-None-Match header matches etag
+    If-None-Match uses weak comparison, If-Match strong comparison
+    """
+    if not header:
+        return False
+    for tag in parse_etags(header):
+        if tag == '*':
+            return True
+        if weak and tag.startswith('W/'):
+            tag = tag[2:]
+        if tag == etag:
+            return True
+    return False
+
+
+class ConditionalRequestMixin:
+    """
+    ETag / If-None-Match / If-Match support for generic views
+    Subclasses implement get_etag_parts(), returning None when the resource
+    does not exist (the normal 404 path then runs)
+    """
+
+    # Bump with the representation so clients do not keep an old body
+    etag_version = 1
+
+    def get_etag_parts(self):
+        raise NotImplementedError
+
+    def get_etag(self):
+        parts = self.get_etag_parts()
+        if parts is None:
+            return None
+        # Sparse GETs are different representations of the same version
+        if self.request.method in ('GET', 'HEAD'):
+            selection = selection_key(self.request)
+            if selection:
+                parts = (*parts, selection)
+        return make_etag(type(self).__name__, self.etag_version, *parts)
+
+    def lock_for_write(self, queryset):
+        """Lock version rows while a conditional write is checked and applied"""
+        if self.request.method in ('GET', 'HEAD', 'OPTIONS'):
+            return queryset
+        return queryset.select_for_update(of=('self',))
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        # Representations depend on who is asking
+        patch_vary_headers(response, ['Authorization'])
+        return response
+
+    def get(self, request, *args, **kwargs):
+        # The version is read before the body is built; if the resource
+        # changes in between, the tag is older than the body and the next
+        # request simply refetches
+        etag = self.get_etag()
+        if etag is not None and etag_matches(etag, request.headers.get('If-None-Match'), weak=True):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+
+        response = super().get(request, *args, **kwargs)
+        if etag is not None and response.status_code == status.HTTP_200_OK:
+            response['ETag'] = etag
+        return response
+
+    def precondition_failed(self, request):
+        """412 response when If-Match does not match the current version"""
+        header = request.headers.get('If-Match')
+        if not header:
+            return None
+        etag = self.get_etag()
+        if etag is None or not etag_matches(etag, header):
+            return Response({
+                'error': 'Resource has changed since it was fetched'
+            }, status=status.HTTP_412_PRECONDITION_FAILED)
+        return None
+
+    def update(self, request, *args, **kwargs):
+        with transaction.atomic():
+            failed = self.precondition_failed(request)
+            if failed is not None:
+                return failed
+            response = super().update(request, *args, **kwargs)
+
+            if response.status_code == status.HTTP_200_OK:
+                etag = self.get_etag()
+                if etag is not None:
+                    response['ETag'] = etag
+            return response
+
+    def destroy(self, request, *args, **kwargs):
+        with transaction.atomic():
+            failed = self.precondition_failed(request)
+            if failed is not None:
+                return failed
+            return super().destroy(request, *args, **kwargs)
+
+
+class ConditionalListMixin(ConditionalRequestMixin):
+    """
+    Conditional GET for list views
+    The version of a page is the requesting user, the query string and one
+    aggregate (row count plus latest updated_at stamps) over the filtered
+    queryset, so adds, edits and deletes all change it
+    """
+
+    # Extra updated_at columns whose changes alter the rendered rows
+    etag_related_stamps = ()
+
+    def filtered_queryset(self):
+        """filter_queryset(get_queryset()), built once for both the ETag and the page"""
+        if getattr(self, '_filtered_queryset', None) is None:
+            self._filtered_queryset = self.filter_queryset(self.get_queryset())
+        return self._filtered_queryset
+
+    def get_etag_parts(self):
+        aggregates = {'count': Count('pk'), 'latest': Max('updated_at')}
+        for i, field in enumerate(self.etag_related_stamps):
+            aggregates[f'related_{i}'] = Max(field)
+        row = self.filtered_queryset().order_by().aggregate(**aggregates)
+
+        user = self.request.user
+        return (
+            user.pk, user.updated_at, self.request.get_full_path(),
+            *(row[name] for name in sorted(row))
+        )
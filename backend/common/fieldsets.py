@@ -0,0 +1,123 @@
+"""
+Sparse fieldsets: ?fields=a,b keeps only the named fields, ?exclude=c drops them
+
+Serializers with SparseFieldsMixin trim their output to the selection and
+report which model fields and relations the kept fields read, so views can
+narrow the query with only() and skip joins and prefetches nobody asked for.
+Only top-level fields are selectable.
+"""
+from django.core.exceptions import FieldDoesNotExist
+
+
+def _parse(value):
+    if value is None:
+        return None
+    return {name.strip() for name in value.split(',') if name.strip()}
+
+
+def requested_fields(request):
+    """(fields, exclude) from the query string; fields is None when not given"""
+    if request is None:
+        return None, set()
+    params = getattr(request, 'query_params', request.GET)
+    return _parse(params.get('fields')), _parse(params.get('exclude')) or set()
+
+
+def keeps(name, fields, exclude):
+    return (fields is None or name in fields) and name not in exclude
+
+
+def wants(request, name):
+    """Whether a field added outside the serializer (e.g. distance_km) is selected"""
+    return keeps(name, *requested_fields(request))
+
+
+def selection_key(request):
+    """Canonical form of the request's selection; '' when everything is rendered"""
+    fields, exclude = requested_fields(request)
+    if fields is None and not exclude:
+        return ''
+    return f"fields={','.join(sorted(fields or ()))};exclude={','.join(sorted(exclude))}"
+
+
+def trim(data, request):
+    """Apply the request's selection to an already rendered dict"""
+    fields, exclude = requested_fields(request)
+    if fields is None and not exclude:
+        return data
+    return {name: value for name, value in data.items() if keeps(name, fields, exclude)}
+
+
+class SparseFieldsMixin:
+    """
+    Serializer mixin honouring ?fields= / ?exclude= on GET requests in the
+    context, or fields= / exclude= keyword arguments
+
+    field_requirements maps fields whose source is not a plain model field
+    (method fields, counts) to the model fields or relations they read.
+    always_load names model fields other code needs even when not rendered.
+    """
+
+    field_requirements = {}
+    always_load = ('pk',)
+
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop('fields', None)
+        exclude = kwargs.pop('exclude', None)
+        super().__init__(*args, **kwargs)
+
+        request = self.context.get('request')
+        if fields is None and exclude is None:
+            # Writes always see every field
+            if request is not None and request.method in ('GET', 'HEAD'):
+                fields, exclude = requested_fields(request)
+        elif fields is not None:
+            fields = set(fields)
+        exclude = set(exclude or ())
+
+        if fields is None and not exclude:
+            return
+        for name in list(self.fields):
+            if not keeps(name, fields, exclude):
+                self.fields.pop(name)
+
+    def required_names(self):
+        """Model attribute names (fields and relations) the kept fields read"""
+        names = set()
+        for name, field in self.fields.items():
+            if name in self.field_requirements:
+                names.update(self.field_requirements[name])
+            elif field.source != '*':
+                names.add(field.source.split('.')[0])
+        return names
+
+    def _split_required(self):
+        model = self.Meta.model
+        concrete, relations = {model._meta.pk.name}, set()
+        for name in set(self.always_load) | self.required_names():
+            if name == 'pk':
+                continue
+            try:
+                field = model._meta.get_field(name)
+            except FieldDoesNotExist:
+                continue
+            if field.concrete and not field.many_to_many:
+                concrete.add(field.name)
+            elif field.is_relation:
+                relations.add(name)
+        return concrete, relations
+
+    def required_relations(self):
+        """Relations (select_related / prefetch) the kept fields use"""
+        return self._split_required()[1]
+
+    def narrow(self, queryset, select_related=()):
+        """
+        queryset loading only the columns the kept fields need, joined to
+        those of the select_related relations they render
+        """
+        concrete, relations = self._split_required()
+        joins = [name for name in select_related if name in relations]
+        if joins:
+            queryset = queryset.select_related(*joins)
+        return queryset.only(*concrete)
@@ -0,0 +1,126 @@
+"""
+Geographic helpers shared by the users and jobs apps
+Distances are in kilometers, coordinates in decimal degrees
+"""
+from math import radians, cos, sin, asin, sqrt, floor, isfinite
+
+import numpy as np
+from django.conf import settings
+
+EARTH_RADIUS_KM = 6371
+KM_PER_DEGREE_LAT = 111.32
+DEFAULT_GEOCELL_SIZE_DEG = 0.25
+
+
+def finite_float(value):
+    """value as a float; None when missing, malformed or not finite (nan, inf)"""
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    return value if isfinite(value) else None
+
+
+def valid_point(lat, lon):
+    """Whether finite_float() coordinates are a point on the map"""
+    return lat is not None and lon is not None and -90 <= lat <= 90 and -180 <= lon <= 180
+
+
+def calculate_distance(lat1, lon1, lat2, lon2):
+    """
+    Calculate distance between two coordinates in kilometers
+    Using Haversine formula
+    """
+    lat1, lon1, lat2, lon2 = map(float, [lat1, lon1, lat2, lon2])
+    lat1, lon1, lat2, lon2 = map(radians, [lat1, lon1, lat2, lon2])
+    
+    dlat = lat2 - lat1
+    dlon = lon2 - lon1
+    
+    a = sin(dlat/2)**2 + cos(lat1) * cos(lat2) * sin(dlon/2)**2
+    c = 2 * asin(sqrt(a))
+    km = EARTH_RADIUS_KM * c
+    
+    return km
+
+
+def distances_from(lat, lon, lats, lons):
+    """
+    Vectorized Haversine distance from one point to arrays of points
+    Returns a float64 array in kilometers
+    """
+    lat1 = np.radians(float(lat))
+    lon1 = np.radians(float(lon))
+    lat2 = np.radians(np.asarray(lats, dtype=np.float64))
+    lon2 = np.radians(np.asarray(lons, dtype=np.float64))
+    
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def bounding_box(lat, lon, radius_km):
+    """
+    Latitude/longitude box that fully contains the circle of radius_km
+    Returns (min_lat, max_lat, min_lon, max_lon); used to pre-filter rows
+    with an index range scan before computing exact distances
+    """
+    lat, lon, radius_km = float(lat), float(lon), float(radius_km)
+    dlat = radius_km / KM_PER_DEGREE_LAT
+    
+    # Longitude degrees shrink towards the poles
+    cos_lat = max(cos(radians(lat)), 0.01)
+    dlon = min(radius_km / (KM_PER_DEGREE_LAT * cos_lat), 180.0)
+    
+    return (
+        max(lat - dlat, -90.0), min(lat + dlat, 90.0),
+        max(lon - dlon, -180.0), min(lon + dlon, 180.0),
+    )
+
+
+def geocell_size():
+    """Edge length of a geocell in degrees (settings.GEOCELL_SIZE_DEG)"""
+    return float(getattr(settings, 'GEOCELL_SIZE_DEG', DEFAULT_GEOCELL_SIZE_DEG))
+
+
+def geocell(lat, lon, size=None):
+    """
+    Key of the fixed lat/lon grid cell containing a point, e.g. '76:291'
+    Returns '' when the point has no coordinates
+    """
+    if lat is None or lon is None:
+        return ''
+    size = size or geocell_size()
+    return f'{floor(float(lat) / size)}:{floor(float(lon) / size)}'
+
+
+def covering_cells(lat, lon, radius_km, size=None):
+    """
+    Keys of every grid cell that intersects the bounding box of the circle
+    """
+    size = size or geocell_size()
+    min_lat, max_lat, min_lon, max_lon = bounding_box(lat, lon, radius_km)
+    
+    return [
+        f'{lat_idx}:{lon_idx}'
+        for lat_idx in range(floor(min_lat / size), floor(max_lat / size) + 1)
+        for lon_idx in range(floor(min_lon / size), floor(max_lon / size) + 1)
+    ]
+
+
+def covering_cell_count(lat, lon, radius_km, size=None):
+    """Number of keys covering_cells() returns, without building them"""
+    size = size or geocell_size()
+    min_lat, max_lat, min_lon, max_lon = bounding_box(lat, lon, radius_km)
+    lat_cells = floor(max_lat / size) - floor(min_lat / size) + 1
+    lon_cells = floor(max_lon / size) - floor(min_lon / size) + 1
+    return max(lat_cells, 0) * max(lon_cells, 0)
+
+
+def area_cells(lat, lon, radius_km, limit, size=None):
+    """
+    covering_cells(), or None when there would be more than limit of them
+    (a plain bounding-box range is cheaper than a huge IN list)
+    """
+    if covering_cell_count(lat, lon, radius_km, size) > limit:
+        return None
+    return covering_cells(lat, lon, radius_km, size)
@@ -0,0 +1,122 @@
+"""
+Single-flight cache fills with stampede protection
+
+get_or_compute() makes sure an expensive value is computed once per key:
+- within a process, concurrent callers for the same key wait for the
+  first caller's result instead of computing it again
+- across processes, a short-lived cache lock elects one filler while the
+  others wait for the value to appear (or fall back after a timeout)
+- entries are refreshed early with probabilistic early expiration
+  (XFetch): the closer an entry is to expiry and the longer it took to
+  compute, the more likely a caller refreshes it ahead of time, so popular
+  keys rarely expire under load
+"""
+import math
+import random
+import threading
+import time
+import uuid
+
+from django.core.cache import cache
+
+
+DEFAULT_BETA = 1.0
+LOCK_TIMEOUT = 10
+WAIT_TIMEOUT = 5
+POLL_INTERVAL = 0.05
+
+
+class _Call:
+    """An in-flight computation other threads can wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class SingleFlight:
+    """Coalesce concurrent calls for the same key within one process"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            call.value = fn()
+            return call.value
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+_flights = SingleFlight()
+
+
+def should_refresh(delta, expiry, beta=DEFAULT_BETA, now=None):
+    """
+    XFetch test: refresh when now - delta * beta * ln(rand) >= expiry
+    delta is how long the value took to compute, in seconds
+    """
+    now = time.time() if now is None else now
+    return now - delta * beta * math.log(1.0 - random.random()) >= expiry
+
+
+def _fill(key, compute, timeout, stale, lock_timeout, wait_timeout):
+    lock_key = f'{key}:lock'
+    token = uuid.uuid4().hex
+
+    if not cache.add(lock_key, token, timeout=lock_timeout):
+        # Another process is computing; serve the stale value if we have one
+        if stale is not None:
+            return stale[0]
+
+        deadline = time.monotonic() + wait_timeout
+        while time.monotonic() < deadline:
+            time.sleep(POLL_INTERVAL)
+            entry = cache.get(key)
+            if entry is not None:
+                return entry[0]
+        # The filler is slow or died; compute without the lock
+
+    try:
+        started = time.monotonic()
+        value = compute()
+        delta = time.monotonic() - started
+        cache.set(key, (value, delta, time.time() + timeout), timeout=timeout)
+        return value
+    finally:
+        if cache.get(lock_key) == token:
+            cache.delete(lock_key)
+
+
+def get_or_compute(key, compute, timeout, beta=DEFAULT_BETA,
+                   lock_timeout=LOCK_TIMEOUT, wait_timeout=WAIT_TIMEOUT):
+    """
+    Return the cached value for key, computing it at most once at a time
+    Values are stored as (value, compute_seconds, expires_at)
+    """
+    entry = cache.get(key)
+    if entry is not None and not should_refresh(entry[1], entry[2], beta):
+        return entry[0]
+
+    return _flights.do(
+        key, lambda: _fill(key, compute, timeout, entry, lock_timeout, wait_timeout)
+    )
@@ -5,6 +5,8 @@ Django settings for Mistribazar project.
 from pathlib import Path
 from datetime import timedelta
 from decouple import config
+from django.core.exceptions import ImproperlyConfigured
+from corsheaders.defaults import default_headers
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -28,9 +30,11 @@ INSTALLED_APPS = [
     # Local apps
     'users',
     'jobs',
+    'ratings',
 ]
 
 MIDDLEWARE = [
+    'common.db.replicas.ReplicaStickinessMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -70,9 +74,83 @@ DATABASES = {
         'PASSWORD': config('DATABASE_PASSWORD', default=''),
         'HOST': config('DATABASE_HOST', default='localhost'),
         'PORT': config('DATABASE_PORT', default='5432'),
+        # Reuse a connection for this many seconds instead of reconnecting
+        # (TCP + TLS + auth) on every request; checked before each reuse
+        'CONN_MAX_AGE': config('DATABASE_CONN_MAX_AGE', default=60, cast=int),
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'connect_timeout': config('DATABASE_CONNECT_TIMEOUT', default=10, cast=int),
+        },
     }
 }
 
+# 'transaction' when DATABASE_HOST/PORT point at Supabase's transaction pooler
+# (port 6543): sessions are shared between clients, so nothing may outlive a
+# transaction - no server-side cursors, no session SETs (the database time
+# zone must already be UTC)
+DATABASE_POOLER = config('DATABASE_POOLER', default='')
+if DATABASE_POOLER == 'transaction':
+    DATABASES['default']['DISABLE_SERVER_SIDE_CURSORS'] = True
+
+# Per-process connection pool for long-running servers (gunicorn/uvicorn);
+# connections go back to the pool after every request. Leave at 0 on
+# serverless, where CONN_MAX_AGE reuse across warm invocations applies
+DATABASE_POOL_SIZE = config('DATABASE_POOL_SIZE', default=0, cast=int)
+if DATABASE_POOL_SIZE:
+    DATABASES['default'].update({
+        'ENGINE': 'common.db.pooled',
+        'CONN_MAX_AGE': 0,
+    })
+    DATABASES['default']['OPTIONS'].update({
+        'POOL_SIZE': DATABASE_POOL_SIZE,
+        'POOL_TIMEOUT': config('DATABASE_POOL_TIMEOUT', default=10, cast=int),
+    })
+
+# Read replicas - comma-separated host[:port] list; safe reads go to a replica
+# whose lag is under REPLICA_MAX_LAG_SECONDS, and callers stick to the primary
+# for REPLICA_STICKY_SECONDS after a write (read-your-writes). Tests mirror
+# the replicas onto the test primary
+DATABASE_READ_REPLICAS = []
+for index, replica in enumerate(config('DATABASE_REPLICA_HOSTS', default='').split(','), start=1):
+    if not replica.strip():
+        continue
+    host, _, port = replica.strip().partition(':')
+    alias = f'replica_{index}'
+    DATABASES[alias] = {
+        **DATABASES['default'],
+        'HOST': host,
+        'PORT': port or DATABASES['default']['PORT'],
+        'OPTIONS': dict(DATABASES['default']['OPTIONS']),
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_READ_REPLICAS.append(alias)
+
+if DATABASE_READ_REPLICAS:
+    DATABASE_ROUTERS = ['common.db.routers.ReplicaRouter']
+REPLICA_STICKY_SECONDS = config('REPLICA_STICKY_SECONDS', default=5, cast=int)
+REPLICA_MAX_LAG_SECONDS = config('REPLICA_MAX_LAG_SECONDS', default=10, cast=float)
+
+# Cache - Redis when REDIS_URL is set, per-process memory otherwise
+REDIS_URL = config('REDIS_URL', default='')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Read-your-writes pins live in the cache; a per-process cache would lose
+# them as soon as the next request reaches another process
+if DATABASE_READ_REPLICAS and not REDIS_URL:
+    raise ImproperlyConfigured('DATABASE_REPLICA_HOSTS requires REDIS_URL (a cache shared by all processes)')
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
@@ -126,6 +204,9 @@ SUPABASE_JWT_SECRET = config('SUPABASE_JWT_SECRET', default='')
 CORS_ALLOW_ALL_ORIGINS = config('CORS_ALLOW_ALL_ORIGINS', default=False, cast=bool)
 CORS_ALLOWED_ORIGINS = config('CORS_ALLOWED_ORIGINS', default='http://localhost:3000,http://localhost:5173').split(',')
 CORS_ALLOW_CREDENTIALS = True
+# Conditional requests: clients read ETag and send it back
+CORS_ALLOW_HEADERS = (*default_headers, 'if-match', 'if-none-match')
+CORS_EXPOSE_HEADERS = ['ETag']
 
 # Cloudinary settings (for image uploads)
 CLOUDINARY_STORAGE = {
@@ -133,3 +214,63 @@ CLOUDINARY_STORAGE = {
     'API_KEY': config('CLOUDINARY_API_KEY', default=''),
     'API_SECRET': config('CLOUDINARY_API_SECRET', default=''),
 }
+
+# Geocell grid (degrees) used for area lookups
+GEOCELL_SIZE_DEG = config('GEOCELL_SIZE_DEG', default=0.25, cast=float)
+
+# Budget bucket boundaries for job list facets
+JOB_BUDGET_BUCKETS = [0, 1000, 5000, 20000, 100000]
+
+# Geocell cache of nearby/list job feeds; its invalidation needs a shared
+# cache, so it is off without REDIS_URL
+JOB_FEED_CACHE = config('JOB_FEED_CACHE', default=bool(REDIS_URL), cast=bool)
+# Seconds a cached nearby/list job feed entry lives
+JOB_FEED_CACHE_TIMEOUT = config('JOB_FEED_CACHE_TIMEOUT', default=300, cast=int)
+
+# Seconds a rendered job fragment stays cached (keys are versioned)
+JOB_FRAGMENT_CACHE_TIMEOUT = config('JOB_FRAGMENT_CACHE_TIMEOUT', default=3600, cast=int)
+
+# Seconds a cached user summary lives (dropped on every user/profile write)
+USER_SUMMARY_CACHE_TIMEOUT = config('USER_SUMMARY_CACHE_TIMEOUT', default=3600, cast=int)
+
+# Delta-sync change log: retention, and how long a gap in the sequence is
+# treated as an uncommitted change
+JOB_CHANGES_RETENTION_DAYS = config('JOB_CHANGES_RETENTION_DAYS', default=30, cast=int)
+JOB_CHANGES_SETTLE_SECONDS = config('JOB_CHANGES_SETTLE_SECONDS', default=5, cast=int)
+
+# Days a completed or cancelled job stays in the hot jobs table before
+# archive_closed_jobs moves it to jobs_archive
+JOB_ARCHIVE_AFTER_DAYS = config('JOB_ARCHIVE_AFTER_DAYS', default=90, cast=int)
+
+# Days an OPEN job stays listed before expire_jobs expires it, deadline or
+# not; 0 expires jobs only at their deadline
+JOB_MAX_OPEN_DAYS = config('JOB_MAX_OPEN_DAYS', default=0, cast=int)
+
+# Provider ratings are Bayesian averages: RATING_PRIOR_WEIGHT imaginary
+# ratings of RATING_PRIOR_MEAN are added to the real ones (0 = plain mean)
+RATING_PRIOR_WEIGHT = config('RATING_PRIOR_WEIGHT', default=5, cast=int)
+RATING_PRIOR_MEAN = config('RATING_PRIOR_MEAN', default=3.5, cast=float)
+
+# Server-sent job streams (served through config.asgi): open streams per
+# process and seconds before a stream is recycled
+JOB_STREAM_MAX_CONNECTIONS = config('JOB_STREAM_MAX_CONNECTIONS', default=5000, cast=int)
+JOB_STREAM_MAX_SECONDS = config('JOB_STREAM_MAX_SECONDS', default=300, cast=int)
+
+# Async job list/detail/nearby and profile views; set when serving through
+# config.asgi. ASYNC_DB_THREADS bounds the worker threads (and connections)
+# their concurrent queries use per process
+ASYNC_VIEWS = config('ASYNC_VIEWS', default=False, cast=bool)
+ASYNC_DB_THREADS = config('ASYNC_DB_THREADS', default=32, cast=int)
+
+# Completion counters logged in the cache and flushed by flush_counters;
+# needs a shared cache, otherwise they are updated inline
+COMPLETION_COUNTERS_WRITE_BEHIND = config('COMPLETION_COUNTERS_WRITE_BEHIND', default=bool(REDIS_URL), cast=bool)
+
+# Cache counters behind the new-jobs-nearby badge; needs a shared cache,
+# otherwise badges count job rows
+JOB_BADGE_COUNTERS = config('JOB_BADGE_COUNTERS', default=bool(REDIS_URL), cast=bool)
+
+# Fan-out-on-write nearby feeds for active workers; needs a shared cache
+JOB_FEED_FANOUT = config('JOB_FEED_FANOUT', default=bool(REDIS_URL), cast=bool)
+# Seconds without reading the feed after which a user stops receiving fan-out
+JOB_FEED_ACTIVE_SECONDS = config('JOB_FEED_ACTIVE_SECONDS', default=172800, cast=int)
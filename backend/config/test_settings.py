@@ -0,0 +1,28 @@
+"""
+Settings for the test suite
+SQLite stands in for the primary and a read replica (mirroring the test
+database), so replica routing runs without PostgreSQL:
+python manage.py test --settings=config.test_settings
+"""
+from .settings import *  # noqa: F401,F403
+
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'test_primary.sqlite3',
+    },
+    'replica_1': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'test_replica.sqlite3',
+        'TEST': {'MIRROR': 'default'},
+    },
+}
+DATABASE_READ_REPLICAS = ['replica_1']
+DATABASE_ROUTERS = ['common.db.routers.ReplicaRouter']
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
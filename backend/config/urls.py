@@ -10,6 +10,7 @@ urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/users/', include('users.urls')),
     path('api/jobs/', include('jobs.urls')),
+    path('api/ratings/', include('ratings.urls')),
 ]
 
 if settings.DEBUG:
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Job, JobImage
+from .models import ArchivedJob, Job, JobImage, SavedSearch
 
 
 class JobImageInline(admin.TabularInline):
@@ -16,7 +16,28 @@ class JobAdmin(admin.ModelAdmin):
     readonly_fields = ('created_at', 'updated_at')
 
 
+@admin.register(ArchivedJob)
+class ArchivedJobAdmin(admin.ModelAdmin):
+    list_display = ('title', 'customer', 'job_type', 'status', 'created_at', 'archived_at')
+    list_filter = ('job_type', 'status')
+    search_fields = ('title', 'description', 'customer__name')
+    
+    # Written only by the archive_closed_jobs command
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
 @admin.register(JobImage)
 class JobImageAdmin(admin.ModelAdmin):
     list_display = ('job', 'caption', 'uploaded_at')
     search_fields = ('job__title', 'caption')
+
+
+@admin.register(SavedSearch)
+class SavedSearchAdmin(admin.ModelAdmin):
+    list_display = ('user', 'name', 'job_type', 'radius_km', 'min_budget', 'is_active', 'created_at')
+    list_filter = ('job_type', 'is_active')
+    search_fields = ('user__name', 'name', 'skills')
@@ -0,0 +1,119 @@
+"""
+Hot/cold separation of jobs
+Completed, cancelled and expired jobs that have not changed for
+JOB_ARCHIVE_AFTER_DAYS move, with their images, from jobs/job_images to
+jobs_archive/job_images_archive. The hot tables then hold open and
+in-progress work plus recently closed jobs, so feed and listing scans and
+their indexes stay small.
+Archived jobs keep their ids and are read through Job.objects.archived().
+
+Moving a job is storage only: no job_changed event is emitted, since the
+job itself did not change.
+"""
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from ratings.models import Rating
+from users.models import AvailabilitySlot
+from .models import ArchivedJob, ArchivedJobImage, Job, JobImage
+
+
+CLOSED_STATUSES = ('COMPLETED', 'CANCELLED', 'EXPIRED')
+
+
+def archive_after_days():
+    return getattr(settings, 'JOB_ARCHIVE_AFTER_DAYS', 90)
+
+
+def cold_jobs(days=None):
+    """
+    Jobs eligible for archiving
+    Jobs linked to bookings or ratings stay hot; archiving them would null
+    or break the link
+    """
+    days = days if days is not None else archive_after_days()
+    cutoff = timezone.now() - timedelta(days=days)
+    return Job.objects.filter(
+        status__in=CLOSED_STATUSES, updated_at__lt=cutoff
+    ).exclude(
+        Exists(AvailabilitySlot.objects.filter(job=OuterRef('pk')))
+    ).exclude(
+        Exists(Rating.objects.filter(job=OuterRef('pk')))
+    )
+
+
+def _columns(model, exclude=()):
+    return [field.column for field in model._meta.concrete_fields if field.name not in exclude]
+
+
+def _copy(cursor, source, target, key, ids, extra=None):
+    """INSERT ... SELECT the rows of source whose key is in ids into target"""
+    quote = connection.ops.quote_name
+    columns = _columns(target, exclude=extra or ())
+    selected = ', '.join(quote(column) for column in columns)
+    placeholders = ', '.join(['%s'] * len(ids))
+    params = []
+    target_columns = selected
+    if extra:
+        target_columns += ', ' + ', '.join(quote(name) for name in extra)
+        selected += ', ' + ', '.join(['%s'] * len(extra))
+        params.extend(extra.values())
+    cursor.execute(
+        f'INSERT INTO {quote(target._meta.db_table)} ({target_columns}) '
+        f'SELECT {selected} FROM {quote(source._meta.db_table)} '
+        f'WHERE {quote(key)} IN ({placeholders})',
+        params + list(ids)
+    )
+
+
+def _delete(cursor, model, key, ids):
+    quote = connection.ops.quote_name
+    placeholders = ', '.join(['%s'] * len(ids))
+    cursor.execute(
+        f'DELETE FROM {quote(model._meta.db_table)} WHERE {quote(key)} IN ({placeholders})',
+        list(ids)
+    )
+    return cursor.rowcount
+
+
+def archive_batch(days=None, batch_size=500):
+    """Move one batch of cold jobs and their images; returns the jobs moved"""
+    with transaction.atomic():
+        # Rows another node is archiving (or a request is updating) are
+        # skipped rather than waited on
+        ids = list(
+            cold_jobs(days).order_by('id')
+            .select_for_update(skip_locked=True)
+            .values_list('id', flat=True)[:batch_size]
+        )
+        if not ids:
+            return 0
+        with connection.cursor() as cursor:
+            _copy(cursor, Job, ArchivedJob, 'id', ids, extra={'archived_at': timezone.now()})
+            _copy(cursor, JobImage, ArchivedJobImage, 'job_id', ids)
+            # Raw deletes: the rows live on in the archive, so no delete
+            # signals (change log tombstones, cache invalidation) apply
+            _delete(cursor, JobImage, 'job_id', ids)
+            return _delete(cursor, Job, 'id', ids)
+
+
+def archive(days=None, batch_size=500, pause=0.0, limit=None):
+    """
+    Archive cold jobs batch by batch, one short transaction each
+    Returns the number of jobs moved
+    """
+    moved = 0
+    while limit is None or moved < limit:
+        size = batch_size if limit is None else min(batch_size, limit - moved)
+        count = archive_batch(days, size)
+        moved += count
+        if count < size:
+            break
+        if pause:
+            time.sleep(pause)
+    return moved
@@ -0,0 +1,147 @@
+"""
+Online backfills of derived data (geocells, normalized skills, counters, ...)
+A backfill walks its table in primary-key order with keyset chunks
+(pk > last, never OFFSET), one short transaction per chunk, so it never holds
+locks on more than one chunk and can run next to live traffic.
+
+- The chunk size adapts toward a target duration per chunk
+- The last processed pk is checkpointed in the chunk's transaction, so an
+  interrupted run resumes exactly where it stopped
+- Runs pause between chunks and while read replicas lag behind
+
+Backfills are subclasses of Backfill registered with @register in an app's
+backfills.py; `python manage.py backfill` lists and runs them.
+"""
+import logging
+import time
+from collections import namedtuple
+
+from django.conf import settings
+from django.db import DatabaseError, transaction
+from django.utils import timezone
+from django.utils.module_loading import autodiscover_modules
+
+from common.db import replicas
+from .models import BackfillCheckpoint
+
+
+logger = logging.getLogger(__name__)
+
+_registry = {}
+
+# rows/total over the whole backfill; processed and elapsed for this run
+Progress = namedtuple('Progress', ['rows', 'total', 'processed', 'elapsed', 'last_pk', 'chunk_size'])
+
+
+def register(backfill_class):
+    """Class decorator adding a Backfill to the registry under its name"""
+    _registry[backfill_class.name] = backfill_class
+    return backfill_class
+
+
+def registry():
+    autodiscover_modules('backfills')
+    return dict(sorted(_registry.items()))
+
+
+class Backfill:
+    """
+    One backfill: the rows to visit and what to do with a chunk of them
+    process() runs inside the chunk's transaction
+    """
+    
+    name = None
+    description = ''
+    
+    def queryset(self):
+        raise NotImplementedError
+    
+    def process(self, rows):
+        raise NotImplementedError
+
+
+class Runner:
+    """Runs a backfill chunk by chunk, adapting the chunk size"""
+    
+    def __init__(self, backfill, target_seconds=0.5, chunk_size=500, min_chunk=50,
+                 max_chunk=10000, pause=0.0, max_lag=None, report=None):
+        self.backfill = backfill
+        self.target_seconds = target_seconds
+        self.chunk_size = chunk_size
+        self.min_chunk = min_chunk
+        self.max_chunk = max_chunk
+        self.pause = pause
+        self.max_lag = max_lag if max_lag is not None else getattr(settings, 'REPLICA_MAX_LAG_SECONDS', 10)
+        self.report = report
+    
+    def next_chunk_size(self, size, elapsed):
+        """Scale toward target_seconds; at most double or halve per chunk"""
+        scaled = size * self.target_seconds / elapsed if elapsed > 0 else size * 2
+        scaled = max(size / 2, min(size * 2, scaled))
+        return int(max(self.min_chunk, min(self.max_chunk, scaled)))
+    
+    def wait_for_replicas(self):
+        """Hold off while a replica lags, so the backfill cannot widen the gap"""
+        for alias in replicas.replica_aliases():
+            while True:
+                try:
+                    lag = replicas.replica_lag(alias)
+                except DatabaseError:
+                    logger.exception('Replica %s lag check failed', alias)
+                    break
+                if lag <= self.max_lag:
+                    break
+                logger.info('Replica %s is %.1fs behind, backfill paused', alias, lag)
+                time.sleep(1)
+    
+    def run_chunk(self, checkpoint, size):
+        """Process the next chunk; returns the number of rows it held"""
+        with transaction.atomic():
+            rows = list(
+                self.backfill.queryset().filter(pk__gt=checkpoint.last_pk).order_by('pk')[:size]
+            )
+            if rows:
+                self.backfill.process(rows)
+                checkpoint.last_pk = rows[-1].pk
+                checkpoint.rows_done += len(rows)
+            if len(rows) < size:
+                checkpoint.finished_at = timezone.now()
+            checkpoint.save()
+        return len(rows)
+    
+    def run(self, limit=None, reset=False):
+        """
+        Run (or resume) the backfill; returns the final checkpoint
+        A finished backfill only runs again after reset
+        """
+        if reset:
+            BackfillCheckpoint.objects.filter(name=self.backfill.name).delete()
+        checkpoint, _ = BackfillCheckpoint.objects.get_or_create(name=self.backfill.name)
+        if checkpoint.finished_at is not None:
+            return checkpoint
+        
+        total = checkpoint.rows_done + self.backfill.queryset().filter(pk__gt=checkpoint.last_pk).count()
+        size = self.chunk_size
+        processed = 0
+        started = time.monotonic()
+        while limit is None or processed < limit:
+            self.wait_for_replicas()
+            
+            step = size if limit is None else min(size, limit - processed)
+            chunk_started = time.monotonic()
+            count = self.run_chunk(checkpoint, step)
+            elapsed = time.monotonic() - chunk_started
+            processed += count
+            
+            if self.report:
+                self.report(Progress(
+                    checkpoint.rows_done, total, processed, time.monotonic() - started,
+                    checkpoint.last_pk, step
+                ))
+            if checkpoint.finished_at is not None:
+                break
+            
+            size = self.next_chunk_size(step, elapsed)
+            if self.pause:
+                time.sleep(self.pause)
+        return checkpoint
@@ -0,0 +1,18 @@
+"""
+Backfills of derived job data (run with `python manage.py backfill`)
+"""
+from . import percolator
+from .backfill import Backfill, register
+from .models import SavedSearch
+
+
+@register
+class SavedSearchCells(Backfill):
+    name = 'saved_search_cells'
+    description = 'Re-index saved searches by geocell (after a GEOCELL_SIZE_DEG change)'
+    
+    def queryset(self):
+        return SavedSearch.objects.all()
+    
+    def process(self, rows):
+        percolator.index_searches(rows)
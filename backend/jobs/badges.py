@@ -0,0 +1,146 @@
+"""
+"New jobs near you" badge counters
+Every job that becomes OPEN increments cache counters for its geocell and
+job type in a day, an hour and a 5-minute bucket. A badge sums the counters
+of the cells covering the caller's radius since their last look: whole days
+from day buckets, whole hours from hour buckets and the ragged ends from
+5-minute buckets, all in one multi-get and without reading job rows.
+
+Marking jobs as seen snapshots the counters of the current 5-minute bucket,
+so jobs already counted when the user looked are not shown again. Counts
+are still approximate: whole covering cells are counted, not the exact circle.
+
+The counters need a cache shared by all processes, so they are on by
+default only with REDIS_URL (settings.JOB_BADGE_COUNTERS). Without them a
+badge is one indexed count of OPEN jobs posted in the radius's bounding box.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from common.geo import bounding_box, covering_cells, geocell
+from .models import Job
+
+
+KEY_PREFIX = 'jobbadge'
+MAX_RADIUS_KM = 100
+# Bucket sizes in seconds, largest first; each divides the one above it
+LEVELS = [('d', 86400), ('h', 3600), ('m', 300)]
+# How far back a badge can count; older buckets expire
+MAX_LOOKBACK_DAYS = 7
+# Start of the badge for users who never looked
+DEFAULT_LOOKBACK = timedelta(days=1)
+
+
+def enabled():
+    return getattr(settings, 'JOB_BADGE_COUNTERS', False)
+
+
+def _timeout():
+    return (MAX_LOOKBACK_DAYS + 1) * 86400
+
+
+def counter_key(cell, job_type, bucket):
+    kind, index = bucket
+    return f'{KEY_PREFIX}:{job_type}:{cell}:{kind}{index}'
+
+
+def buckets_between(start, end):
+    """
+    Buckets (kind, index) covering [start, end], using the largest bucket
+    that fits whole at each step; indexes count from the Unix epoch (UTC)
+    """
+    step = LEVELS[-1][1]
+    position = int(start.timestamp() // step) * step
+    last = int(end.timestamp() // step) * step
+    buckets = []
+    while position <= last:
+        for kind, size in LEVELS:
+            if position % size == 0 and position + size - step <= last:
+                buckets.append((kind, position // size))
+                position += size
+                break
+    return buckets
+
+
+def record_new_job(latitude, longitude, job_type, moment=None):
+    """Count a job that just became OPEN at this location"""
+    timestamp = int((moment or timezone.now()).timestamp())
+    cell = geocell(latitude, longitude)
+    for kind, size in LEVELS:
+        key = counter_key(cell, job_type, (kind, timestamp // size))
+        # add() is a no-op when the counter exists; incr() is atomic
+        cache.add(key, 0, timeout=_timeout())
+        try:
+            cache.incr(key)
+        except ValueError:
+            # Evicted between add() and incr()
+            cache.add(key, 1, timeout=_timeout())
+
+
+def clamp_since(since, now=None):
+    now = now or timezone.now()
+    earliest = now - timedelta(days=MAX_LOOKBACK_DAYS)
+    if since is None:
+        return now - DEFAULT_LOOKBACK
+    return max(since, earliest)
+
+
+def _seen_key(user_id):
+    return f'{KEY_PREFIX}:seen:{user_id}'
+
+
+def mark_seen(user_id, lat, lon, job_type, moment):
+    """
+    Snapshot the partly elapsed 5-minute bucket around the user at the
+    moment they looked; count_new_jobs() subtracts it
+    """
+    kind, size = LEVELS[-1]
+    bucket = (kind, int(moment.timestamp() // size))
+    cells = covering_cells(lat, lon, MAX_RADIUS_KM)
+    counts = cache.get_many([counter_key(cell, job_type, bucket) for cell in cells])
+    baseline = {
+        cell: counts[counter_key(cell, job_type, bucket)]
+        for cell in cells if counter_key(cell, job_type, bucket) in counts
+    }
+    cache.set(_seen_key(user_id), (bucket, baseline), timeout=_timeout())
+
+
+def seen_baseline(user_id):
+    return cache.get(_seen_key(user_id))
+
+
+def count_new_jobs(lat, lon, radius_km, job_type, since, now=None, baseline=None):
+    """
+    New OPEN jobs of job_type posted near (lat, lon) since a moment
+    baseline is a mark_seen() snapshot taken at `since`, if any
+    """
+    now = now or timezone.now()
+    since = clamp_since(since, now)
+    if not enabled():
+        return _count_open_jobs(lat, lon, radius_km, job_type, since)
+    
+    buckets = buckets_between(since, now)
+    cells = covering_cells(lat, lon, min(radius_km, MAX_RADIUS_KM))
+    counts = cache.get_many([
+        counter_key(cell, job_type, bucket) for cell in cells for bucket in buckets
+    ])
+    total = sum(counts.values())
+    
+    if baseline is not None:
+        bucket, seen = baseline
+        if buckets and buckets[0] == bucket:
+            total -= sum(seen.get(cell, 0) for cell in cells)
+    
+    return max(total, 0)
+
+
+def _count_open_jobs(lat, lon, radius_km, job_type, since):
+    """count_new_jobs() from the jobs table, when there are no counters"""
+    min_lat, max_lat, min_lon, max_lon = bounding_box(lat, lon, min(radius_km, MAX_RADIUS_KM))
+    return Job.objects.filter(
+        status='OPEN', job_type=job_type, created_at__gte=since,
+        latitude__range=(min_lat, max_lat), longitude__range=(min_lon, max_lon),
+    ).count()
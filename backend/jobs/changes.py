@@ -0,0 +1,225 @@
+"""
+Delta-sync change feed for jobs
+Every job_changed event appends a JobChange row in the writing transaction.
+Clients hold an opaque cursor (the last seq they have seen) and fetch only
+the jobs changed since, scoped like JobListView for their role. Jobs that
+were deleted or left the caller's scope come back as tombstones.
+"""
+import base64
+import binascii
+from collections import namedtuple
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Max, Q
+from django.utils import timezone
+
+from common.geo import bounding_box, distances_from
+from .models import Job, JobChange
+
+
+CURSOR_VERSION = 'v1'
+DEFAULT_LIMIT = 200
+MAX_LIMIT = 500
+
+ChangeBatch = namedtuple('ChangeBatch', ['changes', 'cursor', 'has_more'])
+
+
+class CursorExpired(Exception):
+    """The cursor points before the retained log; the client must resync"""
+
+
+def _settle_seconds():
+    # A missing seq younger than this may belong to a transaction that has
+    # not committed yet, so the feed stops in front of it
+    return getattr(settings, 'JOB_CHANGES_SETTLE_SECONDS', 5)
+
+
+def encode_cursor(seq):
+    raw = f'{CURSOR_VERSION}:{seq}'.encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """seq encoded in a cursor; raises ValueError when it is malformed"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        version, seq = base64.urlsafe_b64decode(padded.encode()).decode().split(':')
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError('Malformed cursor')
+    if version != CURSOR_VERSION or not seq.isdigit():
+        raise ValueError('Malformed cursor')
+    return int(seq)
+
+
+def head_seq():
+    return JobChange.objects.aggregate(head=Max('seq'))['head'] or 0
+
+
+def oldest_seq():
+    return JobChange.objects.order_by('seq').values_list('seq', flat=True).first()
+
+
+def current_cursor():
+    """
+    Cursor for "now"; hand it out before the data it goes with is read
+    It stops in front of changes still in flight, so one that commits after
+    a higher seq is not skipped by the client's next changes_since
+    """
+    oldest = oldest_seq()
+    return encode_cursor(settled_head(oldest - 1 if oldest is not None else 0))
+
+
+def record(job, action, previous_status=None, previous_location=None):
+    """Append one change row; runs inside the writing transaction"""
+    moved = previous_location and previous_location != (job.latitude, job.longitude)
+    return JobChange.objects.create(
+        job_id=job.pk,
+        action=action,
+        customer_id=job.customer_id,
+        job_type=job.job_type,
+        status=job.status,
+        previous_status=previous_status or '',
+        latitude=job.latitude,
+        longitude=job.longitude,
+        previous_latitude=previous_location[0] if moved else None,
+        previous_longitude=previous_location[1] if moved else None,
+    )
+
+
+def settled_bound(since):
+    """
+    Highest seq the feed may return without skipping an uncommitted change
+    Sequence values are handed out at insert time, so a later seq can commit
+    first; a gap followed by recent rows is treated as still in flight
+    """
+    horizon = timezone.now() - timedelta(seconds=_settle_seconds())
+    recent = list(
+        JobChange.objects.filter(seq__gt=since, created_at__gte=horizon)
+        .order_by('seq').values_list('seq', flat=True)
+    )
+    if not recent:
+        return None
+
+    previous = JobChange.objects.filter(
+        seq__gt=since, seq__lt=recent[0]
+    ).aggregate(previous=Max('seq'))['previous'] or since
+
+    for seq in recent:
+        if seq != previous + 1:
+            return previous
+        previous = seq
+    return None
+
+
+def settled_head(since):
+    """Head of the log, held back to settled_bound(since)"""
+    # Read the head before the rows so a quiet scope never skips a change
+    head = head_seq()
+    settled = settled_bound(since)
+    return head if settled is None else min(head, settled)
+
+
+class FeedScope:
+    """
+    Which jobs a caller sees, mirroring JobListView
+    Customers see every job (or only their own with my_jobs); workers and
+    constructors see OPEN jobs of their type within the radius
+    """
+
+    def __init__(self, user, radius_km=50, my_jobs=False):
+        self.user = user
+        self.radius_km = radius_km
+        self.customer_id = None
+        self.job_type = None
+        self.center = None
+
+        if user.role == 'CUSTOMER' and my_jobs:
+            self.customer_id = user.pk
+        elif user.role in ['WORKER', 'CONSTRUCTOR']:
+            self.job_type = 'WORKER_JOB' if user.role == 'WORKER' else 'CONSTRUCTOR_JOB'
+            if user.latitude and user.longitude:
+                self.center = (float(user.latitude), float(user.longitude))
+
+    def filter_changes(self, queryset):
+        """Drop change rows that cannot concern this caller"""
+        if self.customer_id is not None:
+            return queryset.filter(customer_id=self.customer_id)
+        if self.job_type is None:
+            return queryset
+
+        queryset = queryset.filter(job_type=self.job_type).filter(
+            Q(status='OPEN') | Q(previous_status='OPEN')
+        )
+        if self.center is not None:
+            min_lat, max_lat, min_lon, max_lon = bounding_box(*self.center, self.radius_km)
+            queryset = queryset.filter(
+                Q(latitude__range=(min_lat, max_lat), longitude__range=(min_lon, max_lon)) |
+                Q(previous_latitude__range=(min_lat, max_lat), previous_longitude__range=(min_lon, max_lon))
+            )
+        return queryset
+
+    def visible(self, jobs):
+        """Ids of the given current jobs that are in scope"""
+        if self.job_type is None:
+            return {job.pk for job in jobs}
+
+        candidates = [job for job in jobs if job.status == 'OPEN' and job.job_type == self.job_type]
+        if self.center is None or not candidates:
+            return {job.pk for job in candidates}
+
+        distances = distances_from(
+            *self.center,
+            [job.latitude for job in candidates],
+            [job.longitude for job in candidates],
+        )
+        return {job.pk for job, distance in zip(candidates, distances) if distance <= self.radius_km}
+
+
+def changes_since(scope, since, limit=DEFAULT_LIMIT):
+    """
+    ChangeBatch of the jobs changed after seq `since` for a scope
+    changes are (job_id, Job or None) in change order, collapsed per job;
+    None marks a tombstone. Raises CursorExpired when the log no longer
+    reaches back to `since`
+    """
+    oldest = oldest_seq()
+    if oldest is not None and since < oldest - 1:
+        raise CursorExpired()
+
+    bound = settled_head(since)
+
+    rows = list(
+        scope.filter_changes(JobChange.objects.filter(seq__gt=since, seq__lte=bound))
+        .order_by('seq').values_list('seq', 'job_id')[:limit + 1]
+    )
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    cursor = rows[-1][0] if has_more else max(bound, since)
+
+    # Latest change per job decides its position
+    last_seq = {}
+    for seq, job_id in rows:
+        last_seq[job_id] = seq
+    job_ids = sorted(last_seq, key=last_seq.get)
+
+    jobs = Job.objects.in_bulk(job_ids)
+    visible = scope.visible(jobs.values())
+    changes = [(job_id, jobs[job_id] if job_id in visible else None) for job_id in job_ids]
+
+    return ChangeBatch(changes, encode_cursor(cursor), has_more)
+
+
+def prune(days=None, batch_size=5000):
+    """Delete change rows older than the retention window; returns the count"""
+    days = days if days is not None else getattr(settings, 'JOB_CHANGES_RETENTION_DAYS', 30)
+    cutoff = timezone.now() - timedelta(days=days)
+    deleted = 0
+    while True:
+        seqs = list(
+            JobChange.objects.filter(created_at__lt=cutoff)
+            .order_by('seq').values_list('seq', flat=True)[:batch_size]
+        )
+        if not seqs:
+            return deleted
+        deleted += JobChange.objects.filter(seq__in=seqs).delete()[0]
@@ -0,0 +1,30 @@
+"""
+Job change events
+Every job write (ORM save/delete or bulk update) is announced through
+job_changed so caches, feeds and matchers can react in one place
+"""
+from django.dispatch import Signal
+
+
+CREATED = 'created'
+UPDATED = 'updated'
+STATUS_CHANGED = 'status_changed'
+DELETED = 'deleted'
+
+# Sent with job=<Job>, action=<one of the above>, previous_status=<str or None>
+job_changed = Signal()
+
+# Sent with job=<Job>, matches=<list of percolator.SearchMatch>
+saved_search_matched = Signal()
+
+
+def emit_job_changed(job, action, previous_status=None):
+    """Announce a job change; callers doing bulk updates call this per job"""
+    job_changed.send(sender=job.__class__, job=job, action=action, previous_status=previous_status)
+
+
+def became_open(action, job, previous_status):
+    """True when a change publishes an OPEN job (new or reopened)"""
+    if job.status != 'OPEN':
+        return False
+    return action == CREATED or (action == STATUS_CHANGED and previous_status != 'OPEN')
@@ -0,0 +1,82 @@
+"""
+Expiry of stale open jobs
+OPEN jobs whose deadline has passed, or that have been open longer than
+JOB_MAX_OPEN_DAYS, are set to EXPIRED so they leave feeds and radius scans.
+Each chunk is one short transaction: its rows are locked with SKIP LOCKED
+(rows held by a request or another node's sweep are left for the next run),
+updated with one UPDATE and announced through job_changed, so caches, the
+change log and live streams react as for any status change.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from . import events
+from .models import Job
+
+
+def max_open_days():
+    return getattr(settings, 'JOB_MAX_OPEN_DAYS', 0)
+
+
+def past_deadline(today=None):
+    """Open jobs whose deadline day is over, in deadline order (job_open_deadline_idx)"""
+    today = today or timezone.localdate()
+    return Job.objects.filter(status='OPEN', deadline__lt=today).order_by('deadline', 'id')
+
+
+def too_old(job_type, days=None, now=None):
+    """Open jobs of one type open for over `days`, oldest first (job_open_type_created_idx)"""
+    days = days if days is not None else max_open_days()
+    cutoff = (now or timezone.now()) - timedelta(days=days)
+    return Job.objects.filter(
+        status='OPEN', job_type=job_type, created_at__lt=cutoff
+    ).order_by('created_at', 'id')
+
+
+def expire_chunk(queryset, chunk_size=500):
+    """Expire up to chunk_size jobs of an ordered queryset; returns the expired jobs"""
+    with transaction.atomic():
+        ids = list(queryset.select_for_update(skip_locked=True).values_list('id', flat=True)[:chunk_size])
+        if not ids:
+            return []
+
+        # The status guard keeps the UPDATE a no-op for rows that changed
+        # since they were read (backends without row locks)
+        now = timezone.now()
+        Job.objects.filter(pk__in=ids, status='OPEN').update(status='EXPIRED', updated_at=now)
+        expired = list(Job.objects.filter(pk__in=ids, status='EXPIRED', updated_at=now))
+
+        for job in expired:
+            events.emit_job_changed(job, events.STATUS_CHANGED, 'OPEN')
+        return expired
+
+
+def _drain(queryset, chunk_size, limit):
+    expired = 0
+    while limit is None or expired < limit:
+        size = chunk_size if limit is None else min(chunk_size, limit - expired)
+        count = len(expire_chunk(queryset, size))
+        expired += count
+        if count < size:
+            break
+    return expired
+
+
+def sweep(chunk_size=500, max_days=None, limit=None):
+    """
+    Expire open jobs past their deadline, then those past the open-age
+    limit (skipped when it is 0); returns the number of jobs expired
+    """
+    expired = _drain(past_deadline(), chunk_size, limit)
+
+    days = max_days if max_days is not None else max_open_days()
+    if days:
+        for job_type in Job.JobType.values:
+            remaining = None if limit is None else limit - expired
+            if remaining == 0:
+                break
+            expired += _drain(too_old(job_type, days), chunk_size, remaining)
+    return expired
@@ -0,0 +1,129 @@
+"""
+Job list filters and facet counts
+Facets for job_type, status and budget bucket come from a single aggregate
+query using conditional counts
+"""
+from datetime import datetime, time
+from decimal import Decimal, InvalidOperation
+
+from django.conf import settings
+from django.db.models import Count, Q
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .models import Job
+
+
+DEFAULT_BUDGET_BUCKETS = [0, 1000, 5000, 20000, 100000]
+
+
+def budget_buckets():
+    """
+    (label, lower, upper) budget ranges on budget_max; upper is None for the last
+    Boundaries come from settings.JOB_BUDGET_BUCKETS
+    """
+    edges = sorted(getattr(settings, 'JOB_BUDGET_BUCKETS', DEFAULT_BUDGET_BUCKETS))
+    buckets = []
+    for i, lower in enumerate(edges):
+        upper = edges[i + 1] if i + 1 < len(edges) else None
+        label = f'{lower}-{upper}' if upper is not None else f'{lower}+'
+        buckets.append((label, lower, upper))
+    return buckets
+
+
+def _decimal(value):
+    try:
+        value = Decimal(value)
+    except (InvalidOperation, TypeError):
+        return None
+    # NaN and Infinity parse, but cannot be compared with a budget
+    return value if value.is_finite() else None
+
+
+def _date(value):
+    try:
+        return parse_date(value or '')
+    except ValueError:
+        # Well-formed but not a real date (2024-02-30)
+        return None
+
+
+def parse_moment(value):
+    """
+    Accept an ISO datetime or a plain date (start of that day)
+    Raises ValueError for well-formed values that are not real dates
+    """
+    moment = parse_datetime(value)
+    if moment is None:
+        day = parse_date(value)
+        if day is None:
+            return None
+        moment = datetime.combine(day, time.min)
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+def apply_filters(queryset, params):
+    """
+    Budget, deadline and posting-date filters
+    Query params: min_budget, max_budget (overlap with the job's range),
+    deadline_after, deadline_before (YYYY-MM-DD), posted_since (date or datetime)
+    """
+    min_budget = _decimal(params.get('min_budget'))
+    if min_budget is not None:
+        queryset = queryset.filter(budget_max__gte=min_budget)
+
+    max_budget = _decimal(params.get('max_budget'))
+    if max_budget is not None:
+        queryset = queryset.filter(budget_min__lte=max_budget)
+
+    deadline_after = _date(params.get('deadline_after'))
+    if deadline_after:
+        queryset = queryset.filter(deadline__gte=deadline_after)
+
+    deadline_before = _date(params.get('deadline_before'))
+    if deadline_before:
+        queryset = queryset.filter(deadline__lte=deadline_before)
+
+    try:
+        posted_since = parse_moment(params.get('posted_since') or '')
+    except ValueError:
+        posted_since = None
+    if posted_since:
+        queryset = queryset.filter(created_at__gte=posted_since)
+
+    return queryset
+
+
+def facet_counts(queryset):
+    """
+    Counts per job_type, status and budget bucket for a filtered queryset
+    Evaluated as one aggregate query
+    """
+    aggregates = {'total': Count('id')}
+
+    for value, _ in Job.JobType.choices:
+        aggregates[f'job_type__{value}'] = Count('id', filter=Q(job_type=value))
+
+    for value, _ in Job.Status.choices:
+        aggregates[f'status__{value}'] = Count('id', filter=Q(status=value))
+
+    buckets = budget_buckets()
+    for i, (_, lower, upper) in enumerate(buckets):
+        condition = Q(budget_max__gte=lower)
+        if upper is not None:
+            condition &= Q(budget_max__lt=upper)
+        aggregates[f'budget__{i}'] = Count('id', filter=condition)
+
+    row = queryset.order_by().aggregate(**aggregates)
+
+    return {
+        'total': row['total'],
+        'job_type': {value: row[f'job_type__{value}'] for value, _ in Job.JobType.choices},
+        'status': {value: row[f'status__{value}'] for value, _ in Job.Status.choices},
+        'budget': [
+            {'range': label, 'min': lower, 'max': upper, 'count': row[f'budget__{i}']}
+            for i, (label, lower, upper) in enumerate(buckets)
+        ],
+    }
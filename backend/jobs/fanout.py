@@ -0,0 +1,249 @@
+"""
+Materialized (fan-out-on-write) nearby feeds for active workers
+
+Reading the nearby feed stores it as the user's inbox in the cache: the
+(job_id, distance) list for their location and radius, nearest first. While
+the inbox lives the user counts as active, and every job that becomes OPEN
+(or moves while OPEN) is pushed into the inboxes of active workers or
+constructors in range, so their next read is one cache fetch.
+
+Users without an inbox (inactive ones) are skipped by the fan-out and served
+from the read-time geocell feed, which rebuilds the inbox. Inboxes hold at
+most MAX_ITEMS entries; closed jobs are pruned when read. Fan-out only
+reaches users within MAX_RADIUS_KM of a job, so larger radii are always
+served at read time and never materialized.
+
+Fan-out needs a cache shared by all processes, so it is on by default only
+with REDIS_URL (settings.JOB_FEED_FANOUT).
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from common.geo import bounding_box, calculate_distance, covering_cells
+from users.models import ProviderDirectory
+from .models import Job
+from . import feed_cache
+
+
+KEY_PREFIX = 'jobinbox'
+MAX_ITEMS = 500
+MAX_RADIUS_KM = 100
+# Candidate users checked per cache multi-get during fan-out
+FANOUT_BATCH = 1000
+LOCK_TIMEOUT = 5
+
+ROLE_FOR_JOB_TYPE = {'WORKER_JOB': 'WORKER', 'CONSTRUCTOR_JOB': 'CONSTRUCTOR'}
+
+
+def enabled():
+    return getattr(settings, 'JOB_FEED_FANOUT', False)
+
+
+def _active_seconds():
+    return getattr(settings, 'JOB_FEED_ACTIVE_SECONDS', 2 * 86400)
+
+
+def inbox_key(user_id):
+    return f'{KEY_PREFIX}:{user_id}'
+
+
+def _locked(user_id):
+    """Take the inbox lock; False when another writer holds it"""
+    return cache.add(f'{inbox_key(user_id)}:lock', 1, timeout=LOCK_TIMEOUT)
+
+
+def _unlock(user_id):
+    cache.delete(f'{inbox_key(user_id)}:lock')
+
+
+def _store(user_id, inbox):
+    """Write an inbox without extending the user's active window"""
+    remaining = inbox['active_until'] - time.time()
+    if remaining > 0:
+        cache.set(inbox_key(user_id), inbox, timeout=remaining)
+
+
+def _insert(inbox, job_id, distance):
+    items = [item for item in inbox['items'] if item[0] != job_id]
+    if distance is not None:
+        items.append((job_id, distance))
+        items.sort(key=lambda item: item[1])
+    if len(items) > MAX_ITEMS:
+        items = items[:MAX_ITEMS]
+        inbox['truncated'] = True
+    inbox['items'] = items
+
+
+def materialize(user, radius_km):
+    """
+    Compute the feed at read time and store it as the user's inbox
+    radius_km must be at most MAX_RADIUS_KM, the reach of fan_out()
+    """
+    job_type = 'WORKER_JOB' if user.role == 'WORKER' else 'CONSTRUCTOR_JOB'
+    if radius_km > MAX_RADIUS_KM:
+        return feed_cache.nearby_job_ids(user.latitude, user.longitude, job_type, radius_km)
+    inbox = {
+        'latitude': float(user.latitude),
+        'longitude': float(user.longitude),
+        'radius_km': radius_km,
+        'items': [],
+        'truncated': False,
+        'building': True,
+        'active_until': time.time() + _active_seconds(),
+    }
+    
+    # Register first so jobs opened while computing are pushed, not lost
+    if not _locked(user.pk):
+        return feed_cache.nearby_job_ids(user.latitude, user.longitude, job_type, radius_km)
+    try:
+        _store(user.pk, inbox)
+    finally:
+        _unlock(user.pk)
+    
+    items = feed_cache.nearby_job_ids(user.latitude, user.longitude, job_type, radius_km)
+    
+    if _locked(user.pk):
+        try:
+            pushed = cache.get(inbox_key(user.pk))
+            if pushed is not None and pushed.get('building'):
+                inbox['items'] = items[:MAX_ITEMS]
+                inbox['truncated'] = len(items) > MAX_ITEMS
+                for job_id, distance in pushed['items']:
+                    _insert(inbox, job_id, distance)
+                inbox['building'] = False
+                _store(user.pk, inbox)
+                return inbox['items']
+        finally:
+            _unlock(user.pk)
+    return items
+
+
+def _keep_active(user_id, inbox):
+    """Extend the active window, rewriting the inbox at most every half window"""
+    if inbox['active_until'] - time.time() > _active_seconds() / 2:
+        return
+    if not _locked(user_id):
+        return
+    try:
+        inbox = cache.get(inbox_key(user_id))
+        if inbox is not None:
+            inbox['active_until'] = time.time() + _active_seconds()
+            _store(user_id, inbox)
+    finally:
+        _unlock(user_id)
+
+
+def _usable(inbox, user, radius_km):
+    return (
+        inbox is not None
+        and not inbox.get('building')
+        and inbox['radius_km'] == radius_km
+        and inbox['latitude'] == float(user.latitude)
+        and inbox['longitude'] == float(user.longitude)
+    )
+
+
+def nearby_jobs(user, radius_km, queryset=None):
+    """
+    [(Job, distance_km)] of open jobs near the user, nearest first
+    From the inbox when the user is active, otherwise computed (and
+    materialized) at read time; jobs are loaded from queryset when given
+    """
+    materialized = enabled() and radius_km <= MAX_RADIUS_KM
+    inbox = cache.get(inbox_key(user.pk)) if materialized else None
+    
+    if _usable(inbox, user, radius_km):
+        items = inbox['items']
+        _keep_active(user.pk, inbox)
+    elif materialized:
+        items = materialize(user, radius_km)
+        inbox = None
+    else:
+        job_type = 'WORKER_JOB' if user.role == 'WORKER' else 'CONSTRUCTOR_JOB'
+        items = feed_cache.nearby_job_ids(user.latitude, user.longitude, job_type, radius_km)
+    
+    queryset = queryset if queryset is not None else Job.objects.all()
+    jobs = queryset.filter(status='OPEN').in_bulk([job_id for job_id, _ in items])
+    found = [(jobs[job_id], distance) for job_id, distance in items if job_id in jobs]
+    
+    if inbox is not None and len(found) < len(items):
+        _prune(user, radius_km, inbox, jobs)
+    
+    return found
+
+
+def _prune(user, radius_km, inbox, live):
+    """Drop closed jobs from an inbox; rebuild one that was trimmed too far"""
+    if inbox['truncated'] and len(live) < MAX_ITEMS // 2:
+        materialize(user, radius_km)
+        return
+    if not _locked(user.pk):
+        return
+    try:
+        current = cache.get(inbox_key(user.pk))
+        if current is None:
+            return
+        closed = {job_id for job_id, _ in inbox['items']} - live.keys()
+        current['items'] = [item for item in current['items'] if item[0] not in closed]
+        _store(user.pk, current)
+    finally:
+        _unlock(user.pk)
+
+
+def fan_out(job_id, job_type, latitude, longitude):
+    """
+    Push an OPEN job into the inboxes of active users in range, or take it
+    out of inboxes whose area it no longer reaches
+    Returns the number of inboxes written
+    """
+    role = ROLE_FOR_JOB_TYPE.get(job_type)
+    if role is None:
+        return 0
+    
+    latitude, longitude = float(latitude), float(longitude)
+    min_lat, max_lat, min_lon, max_lon = bounding_box(latitude, longitude, MAX_RADIUS_KM)
+    user_ids = ProviderDirectory.objects.filter(
+        role=role,
+        cell__in=covering_cells(latitude, longitude, MAX_RADIUS_KM),
+        latitude__range=(min_lat, max_lat),
+        longitude__range=(min_lon, max_lon),
+    ).values_list('user_id', flat=True)
+    
+    written = 0
+    batch = []
+    for user_id in user_ids.iterator(chunk_size=FANOUT_BATCH):
+        batch.append(user_id)
+        if len(batch) == FANOUT_BATCH:
+            written += _push(batch, job_id, latitude, longitude)
+            batch = []
+    if batch:
+        written += _push(batch, job_id, latitude, longitude)
+    return written
+
+
+def _push(user_ids, job_id, latitude, longitude):
+    # Only users whose inbox exists are active
+    keys = {inbox_key(user_id): user_id for user_id in user_ids}
+    active = [keys[key] for key in cache.get_many(list(keys))]
+    
+    written = 0
+    for user_id in active:
+        if not _locked(user_id):
+            # A concurrent writer; drop the inbox so the next read rebuilds it
+            cache.delete(inbox_key(user_id))
+            continue
+        try:
+            inbox = cache.get(inbox_key(user_id))
+            if inbox is None:
+                continue
+            distance = round(calculate_distance(
+                inbox['latitude'], inbox['longitude'], latitude, longitude
+            ), 2)
+            _insert(inbox, job_id, distance if distance <= inbox['radius_km'] else None)
+            _store(user_id, inbox)
+            written += 1
+        finally:
+            _unlock(user_id)
+    return written
@@ -0,0 +1,225 @@
+"""
+Geocell-keyed cache for nearby and list job feeds
+
+Requests from the same coarse geocell, for the same job type, radius bucket
+and filters share one cache entry. The entry holds (id, lat, lon) of every
+matching OPEN job within the bucket radius of the cell centre plus the cell's
+half diagonal, so it is a superset for any point in the cell; each request
+then computes exact distances from the cached coordinates.
+
+Every cell has a version token that is part of the entry key. A job write
+replaces the token of every cell whose entries could contain that job, so
+stale entries are never read again and simply expire.
+
+Invalidation only reaches other processes through a shared cache, so the
+feed cache is on by default only with REDIS_URL (settings.JOB_FEED_CACHE);
+otherwise every request computes its candidates.
+"""
+import hashlib
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+from django.utils.http import urlencode
+
+from common import singleflight
+from common.db.replicas import use_primary
+from common.geo import (
+    KM_PER_DEGREE_LAT, covering_cells, distances_from, geocell, geocell_size, bounding_box
+)
+from users.models import ProviderDirectory
+from .models import Job
+from . import facets
+
+
+RADIUS_BUCKETS = [5, 10, 25, 50, 100]
+FILTER_PARAMS = ['min_budget', 'max_budget', 'deadline_after', 'deadline_before', 'posted_since']
+KEY_PREFIX = 'jobfeed'
+
+
+def enabled():
+    return getattr(settings, 'JOB_FEED_CACHE', False)
+
+
+def _timeout():
+    return getattr(settings, 'JOB_FEED_CACHE_TIMEOUT', 300)
+
+
+def _half_diagonal_km(size):
+    """Upper bound on the distance from a cell centre to any point in the cell"""
+    return size * KM_PER_DEGREE_LAT * 0.75
+
+
+def radius_bucket(radius_km):
+    """Smallest bucket covering the radius, or None when it is too large to cache"""
+    for bucket in RADIUS_BUCKETS:
+        if radius_km <= bucket:
+            return bucket
+    return None
+
+
+def cell_center(cell, size=None):
+    """Centre point of a geocell key"""
+    size = size or geocell_size()
+    lat_idx, lon_idx = (int(part) for part in cell.split(':'))
+    return (lat_idx + 0.5) * size, (lon_idx + 0.5) * size
+
+
+def filters_signature(params):
+    """Stable short hash of the feed filters present in the request"""
+    if not params:
+        return '-'
+    items = sorted((name, params.get(name)) for name in FILTER_PARAMS if params.get(name))
+    if not items:
+        return '-'
+    return hashlib.md5(urlencode(items).encode()).hexdigest()[:12]
+
+
+def _version_key(cell):
+    return f'{KEY_PREFIX}:ver:{cell}'
+
+
+def cell_version(cell):
+    """Current version token of a cell, created on first use"""
+    key = _version_key(cell)
+    version = cache.get(key)
+    if version is None:
+        version = uuid.uuid4().hex[:12]
+        # add() keeps a token another process created in the meantime
+        if not cache.add(key, version, timeout=None):
+            version = cache.get(key, version)
+    return version
+
+
+def entry_key(cell, job_type, bucket, params=None):
+    return ':'.join([
+        KEY_PREFIX, cell, job_type, str(bucket),
+        filters_signature(params), cell_version(cell)
+    ])
+
+
+def compute_candidates(cell, job_type, bucket, params=None):
+    """
+    (id, lat, lon) of open jobs that can be within `bucket` km of any point
+    in the cell, after the request filters
+    """
+    size = geocell_size()
+    center_lat, center_lon = cell_center(cell, size)
+    region_km = bucket + _half_diagonal_km(size)
+    min_lat, max_lat, min_lon, max_lon = bounding_box(center_lat, center_lon, region_km)
+    
+    queryset = Job.objects.filter(
+        status='OPEN',
+        job_type=job_type,
+        latitude__range=(min_lat, max_lat),
+        longitude__range=(min_lon, max_lon),
+    )
+    queryset = facets.apply_filters(queryset, params or {})
+    # Entries outlive replica lag, so they are filled from the primary
+    with use_primary():
+        rows = list(queryset.values_list('id', 'latitude', 'longitude'))
+    if not rows:
+        return []
+    
+    ids, lats, lons = zip(*rows)
+    distances = distances_from(center_lat, center_lon, lats, lons)
+    return [
+        (job_id, float(lat), float(lon))
+        for job_id, lat, lon, distance in zip(ids, lats, lons, distances)
+        if distance <= region_km
+    ]
+
+
+def get_candidates(cell, job_type, bucket, params=None):
+    """
+    Cached candidate list for a (cell, job_type, radius bucket, filters) entry
+    Filled through single-flight so concurrent misses compute it once
+    """
+    return singleflight.get_or_compute(
+        entry_key(cell, job_type, bucket, params),
+        lambda: compute_candidates(cell, job_type, bucket, params),
+        timeout=_timeout()
+    )
+
+
+def nearby_job_ids(lat, lon, job_type, radius_km, params=None):
+    """
+    [(job_id, distance_km)] of open jobs within radius_km, nearest first
+    Served from the geocell cache when it is enabled and the radius fits a bucket
+    """
+    bucket = radius_bucket(radius_km) if enabled() else None
+    if bucket is None:
+        candidates = compute_candidates(geocell(lat, lon), job_type, radius_km, params)
+    else:
+        candidates = get_candidates(geocell(lat, lon), job_type, bucket, params)
+    
+    if not candidates:
+        return []
+    
+    ids, lats, lons = zip(*candidates)
+    distances = distances_from(lat, lon, lats, lons)
+    nearby = [
+        (job_id, round(float(distance), 2))
+        for job_id, distance in zip(ids, distances)
+        if distance <= radius_km
+    ]
+    nearby.sort(key=lambda item: item[1])
+    return nearby
+
+
+def affected_cells(lat, lon):
+    """Cells whose cached entries may include a job at this location"""
+    size = geocell_size()
+    return covering_cells(lat, lon, RADIUS_BUCKETS[-1] + _half_diagonal_km(size), size)
+
+
+def invalidate_location(lat, lon):
+    """Rotate the version of every cell that can see this location"""
+    if lat is None or lon is None:
+        return
+    cache.set_many(
+        {_version_key(cell): uuid.uuid4().hex[:12] for cell in affected_cells(lat, lon)},
+        timeout=None
+    )
+
+
+def invalidate_for_change(status, location, previous_status=None, previous_location=None):
+    """
+    Invalidate for a job change that can alter an OPEN feed
+    Changes to jobs that neither were nor are OPEN leave the cache untouched
+    """
+    if not enabled() or (previous_status != 'OPEN' and status != 'OPEN'):
+        return
+    
+    invalidate_location(*location)
+    
+    if previous_location and previous_location != location:
+        invalidate_location(*previous_location)
+
+
+def hottest_cells(limit=50):
+    """Cells with the most available workers and constructors"""
+    return list(
+        ProviderDirectory.objects.filter(
+            role__in=['WORKER', 'CONSTRUCTOR'], is_available=True
+        ).exclude(cell='').values('cell', 'role').annotate(
+            providers=Count('user')
+        ).order_by('-providers')[:limit]
+    )
+
+
+def warm(limit=50, radius_km=50):
+    """
+    Precompute the default (unfiltered) entries of the hottest cells
+    Returns the number of entries written
+    """
+    if not enabled():
+        return 0
+    bucket = radius_bucket(radius_km) or RADIUS_BUCKETS[-1]
+    written = 0
+    for row in hottest_cells(limit):
+        job_type = 'WORKER_JOB' if row['role'] == 'WORKER' else 'CONSTRUCTOR_JOB'
+        get_candidates(row['cell'], job_type, bucket)
+        written += 1
+    return written
@@ -0,0 +1,105 @@
+"""
+Per-job serialized fragment cache
+Each job's rendered representation is cached under a key versioned by the
+job's updated_at, so a changed job can never be served stale. List
+serializers assemble pages from one multi-get and only render the misses.
+Data owned by other rows (the customer) is left out of the fragment and
+filled in by attach() after assembly. Sparse fieldsets get their own
+fragments, keyed by the rendered field names.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Manager, prefetch_related_objects
+from rest_framework import serializers
+
+
+# Bump when serializer output changes so old fragments are ignored
+FRAGMENT_VERSION = 3
+
+
+def _timeout():
+    return getattr(settings, 'JOB_FRAGMENT_CACHE_TIMEOUT', 3600)
+
+
+def _stamp(moment):
+    return f'{moment.timestamp():.6f}' if moment else '0'
+
+
+def fieldset_signature(field_names):
+    return hashlib.md5(','.join(field_names).encode()).hexdigest()[:8]
+
+
+def fragment_key(serializer_class, job, fieldset='all'):
+    """Versioned cache key for one job rendered by one serializer class"""
+    return (
+        f'jobfrag:{serializer_class.__name__}:{FRAGMENT_VERSION}:{fieldset}:'
+        f'{job.pk}:{_stamp(job.updated_at)}'
+    )
+
+
+class FragmentCacheMixin:
+    """
+    Serializer mixin caching each instance's representation
+    Pair with FragmentListSerializer as Meta.list_serializer_class
+    """
+    
+    # Relations loaded only for the instances that have to be rendered
+    fragment_prefetch = ()
+    
+    def fragment_key(self, instance):
+        if not hasattr(self, '_fieldset'):
+            self._fieldset = fieldset_signature(self.fields)
+        return fragment_key(type(self), instance, self._fieldset)
+    
+    def render_prefetch(self):
+        """fragment_prefetch minus relations no rendered field reads"""
+        if not hasattr(self, 'required_relations'):
+            return self.fragment_prefetch
+        needed = self.required_relations()
+        return [name for name in self.fragment_prefetch if name in needed]
+    
+    def render(self, instance):
+        return super().to_representation(instance)
+    
+    def attach(self, representations, instances):
+        """Fill in data kept out of the cached fragments, for a whole page at once"""
+    
+    def to_representation(self, instance):
+        key = self.fragment_key(instance)
+        data = cache.get(key)
+        if data is None:
+            data = self.render(instance)
+            cache.set(key, data, timeout=_timeout())
+        self.attach([data], [instance])
+        return data
+
+
+class FragmentListSerializer(serializers.ListSerializer):
+    """List serializer that fetches all cached fragments in one multi-get"""
+    
+    def to_representation(self, data):
+        items = list(data.all() if isinstance(data, Manager) else data)
+        keys = [self.child.fragment_key(item) for item in items]
+        cached = cache.get_many(keys)
+        
+        misses = [item for key, item in zip(keys, items) if key not in cached]
+        prefetch = self.child.render_prefetch()
+        if misses and prefetch:
+            prefetch_related_objects(misses, *prefetch)
+        
+        missing = {}
+        representation = []
+        for key, item in zip(keys, items):
+            fragment = cached.get(key)
+            if fragment is None:
+                fragment = missing[key] = self.child.render(item)
+            representation.append(fragment)
+        
+        if missing:
+            cache.set_many(missing, timeout=_timeout())
+        
+        # After set_many, so attached data never ends up in a fragment
+        self.child.attach(representation, items)
+        return representation
@@ -0,0 +1,30 @@
+"""
+Move long-closed jobs and their images to the archive tables (run daily)
+"""
+from django.core.management.base import BaseCommand
+from jobs import archive
+
+
+class Command(BaseCommand):
+    help = 'Move completed and cancelled jobs out of the hot jobs table in batches'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=None, help='Days closed and unchanged (default: JOB_ARCHIVE_AFTER_DAYS)')
+        parser.add_argument('--batch-size', type=int, default=500, help='Jobs moved per transaction')
+        parser.add_argument('--pause', type=float, default=0.0, help='Seconds to sleep between batches')
+        parser.add_argument('--limit', type=int, default=None, help='Stop after this many jobs')
+        parser.add_argument('--dry-run', action='store_true', help='Only count the jobs that would move')
+    
+    def handle(self, *args, **options):
+        if options['dry_run']:
+            count = archive.cold_jobs(options['days']).count()
+            self.stdout.write(f'{count} jobs would be archived')
+            return
+        
+        moved = archive.archive(
+            days=options['days'],
+            batch_size=options['batch_size'],
+            pause=options['pause'],
+            limit=options['limit'],
+        )
+        self.stdout.write(self.style.SUCCESS(f'Archived {moved} jobs'))
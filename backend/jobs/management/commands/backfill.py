@@ -0,0 +1,80 @@
+"""
+List or run registered backfills (see jobs.backfill)
+Interrupted runs resume from their checkpoint
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from jobs import backfill
+from jobs.models import BackfillCheckpoint
+
+
+class Command(BaseCommand):
+    help = 'Run a chunked, throttled, resumable backfill; without a name, list them'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('name', nargs='?', help='Backfill to run')
+        parser.add_argument('--target-seconds', type=float, default=0.5, help='Chunk duration the chunk size adapts toward')
+        parser.add_argument('--chunk-size', type=int, default=500, help='Rows in the first chunk')
+        parser.add_argument('--min-chunk', type=int, default=50)
+        parser.add_argument('--max-chunk', type=int, default=10000)
+        parser.add_argument('--pause', type=float, default=0.0, help='Seconds to sleep between chunks')
+        parser.add_argument('--max-lag', type=float, default=None, help='Pause while a replica is this many seconds behind (default: REPLICA_MAX_LAG_SECONDS)')
+        parser.add_argument('--limit', type=int, default=None, help='Stop after this many rows (resume later)')
+        parser.add_argument('--reset', action='store_true', help='Discard the checkpoint and start over')
+        parser.add_argument('--report-every', type=float, default=5.0, help='Seconds between progress lines')
+    
+    def handle(self, *args, **options):
+        backfills = backfill.registry()
+        name = options['name']
+        if not name:
+            self.list(backfills)
+            return
+        if name not in backfills:
+            raise CommandError(f'Unknown backfill {name!r}; choose from {", ".join(backfills)}')
+        
+        self._reported = 0.0
+        runner = backfill.Runner(
+            backfills[name](),
+            target_seconds=options['target_seconds'],
+            chunk_size=options['chunk_size'],
+            min_chunk=options['min_chunk'],
+            max_chunk=options['max_chunk'],
+            pause=options['pause'],
+            max_lag=options['max_lag'],
+            report=lambda progress: self.report(progress, options['report_every']),
+        )
+        checkpoint = runner.run(limit=options['limit'], reset=options['reset'])
+        
+        if checkpoint.finished_at is None:
+            self.stdout.write(f'Stopped at pk {checkpoint.last_pk} after {checkpoint.rows_done} rows; run again to resume')
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f'Backfill {name} finished: {checkpoint.rows_done} rows (use --reset to run it again)'
+            ))
+    
+    def list(self, backfills):
+        checkpoints = BackfillCheckpoint.objects.in_bulk(list(backfills), field_name='name')
+        for name, backfill_class in backfills.items():
+            checkpoint = checkpoints.get(name)
+            if checkpoint is None:
+                state = 'not started'
+            elif checkpoint.finished_at:
+                state = f'finished {checkpoint.finished_at:%Y-%m-%d %H:%M}, {checkpoint.rows_done} rows'
+            else:
+                state = f'{checkpoint.rows_done} rows, resumes after pk {checkpoint.last_pk}'
+            self.stdout.write(f'{name:<24} {backfill_class.description} [{state}]')
+    
+    def report(self, progress, every):
+        now = time.monotonic()
+        if now - self._reported < every and progress.rows < progress.total:
+            return
+        self._reported = now
+        
+        percent = 100 * progress.rows / progress.total if progress.total else 100
+        rate = progress.processed / progress.elapsed if progress.elapsed else 0
+        self.stdout.write(
+            f'{progress.rows}/{progress.total} rows ({percent:.1f}%), {rate:.0f} rows/s, '
+            f'chunk {progress.chunk_size}, last pk {progress.last_pk}'
+        )
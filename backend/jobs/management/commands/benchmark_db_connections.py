@@ -0,0 +1,67 @@
+"""
+Compare per-request database latency with and without connection reuse
+"""
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connections
+
+
+def _summary(samples):
+    ordered = sorted(samples)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    return statistics.median(ordered), p95
+
+
+class Command(BaseCommand):
+    help = 'Time a one-query request with a new connection each time vs the configured reuse/pool'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=50, help='Requests timed per mode')
+        parser.add_argument('--database', default='default', help='Database alias')
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        if connection.vendor != 'postgresql':
+            raise CommandError('Connection benchmarks need a PostgreSQL database')
+        iterations = options['iterations']
+
+        # Every request pays TCP + TLS + auth, as before CONN_MAX_AGE
+        params = connection.get_connection_params()
+        fresh = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            raw = connection.Database.connect(**params)
+            try:
+                with raw.cursor() as cursor:
+                    cursor.execute('SELECT 1')
+                    cursor.fetchone()
+            finally:
+                raw.close()
+            fresh.append(time.perf_counter() - start)
+
+        # The request cycle as configured: close_old_connections() runs on
+        # request start and finish, reusing or pooling the connection
+        configured = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            close_old_connections()
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+                cursor.fetchone()
+            close_old_connections()
+            configured.append(time.perf_counter() - start)
+        connection.close()
+
+        settings_dict = connection.settings_dict
+        self.stdout.write(
+            f"Engine {settings_dict['ENGINE']}, CONN_MAX_AGE {settings_dict['CONN_MAX_AGE']}, "
+            f"{iterations} requests per mode"
+        )
+        for label, samples in [('new connection', fresh), ('configured', configured)]:
+            median, p95 = _summary(samples)
+            self.stdout.write(f'{label:>16}: median {median * 1000:.2f} ms, p95 {p95 * 1000:.2f} ms')
+
+        saved = statistics.median(fresh) - statistics.median(configured)
+        self.stdout.write(self.style.SUCCESS(f'Connection setup removed per request: {saved * 1000:.2f} ms'))
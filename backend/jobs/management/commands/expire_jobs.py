@@ -0,0 +1,23 @@
+"""
+Expire open jobs past their deadline or the open-age limit (run hourly)
+Safe to run on several nodes at once
+"""
+from django.core.management.base import BaseCommand
+from jobs import expiry
+
+
+class Command(BaseCommand):
+    help = 'Set stale OPEN jobs to EXPIRED in small chunks'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=500, help='Jobs expired per transaction')
+        parser.add_argument('--max-days', type=int, default=None, help='Open-age limit in days, 0 to skip (default: JOB_MAX_OPEN_DAYS)')
+        parser.add_argument('--limit', type=int, default=None, help='Stop after this many jobs')
+    
+    def handle(self, *args, **options):
+        expired = expiry.sweep(
+            chunk_size=options['chunk_size'],
+            max_days=options['max_days'],
+            limit=options['limit'],
+        )
+        self.stdout.write(self.style.SUCCESS(f'Expired {expired} jobs'))
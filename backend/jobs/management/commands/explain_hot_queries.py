@@ -0,0 +1,141 @@
+"""
+EXPLAIN every hot query and fail if any of them reads a table sequentially
+Run it after changing indexes or the queries behind the job, feed, change
+and directory endpoints. PostgreSQL is authoritative; SQLite plans are only
+reported, since SQLite shows an ordered primary key walk as a plain SCAN
+"""
+import json
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+from django.utils import timezone
+
+from common.geo import bounding_box
+from jobs import archive, expiry
+from jobs.models import ArchivedJob, Job, JobChange, JobImage, SavedSearchCell
+from users.models import AvailabilitySlot, ProviderDirectory, User
+
+
+def hot_queries():
+    """(label, queryset) pairs shaped like the queries the endpoints run"""
+    min_lat, max_lat, min_lon, max_lon = bounding_box(12.97, 77.59, 25)
+    since = timezone.now() - timedelta(days=1)
+    return [
+        ('job list: newest first', Job.objects.order_by('-created_at')[:20]),
+        ('job list: my jobs', Job.objects.filter(customer_id=1).order_by('-created_at')[:20]),
+        ('job list: open jobs of a type', Job.objects.filter(
+            status='OPEN', job_type='WORKER_JOB'
+        ).order_by('-created_at')[:20]),
+        ('job detail', Job.objects.filter(pk=1)),
+        ('job list: my archived jobs', ArchivedJob.objects.filter(customer_id=1).order_by('-created_at')[:20]),
+        ('feed cache: candidates in a box', Job.objects.filter(
+            status='OPEN',
+            job_type='WORKER_JOB',
+            latitude__range=(min_lat, max_lat),
+            longitude__range=(min_lon, max_lon),
+        ).values_list('id', 'latitude', 'longitude')),
+        ('ranking: candidates in a box', Job.objects.filter(
+            status='OPEN',
+            job_type='CONSTRUCTOR_JOB',
+            latitude__range=(min_lat, max_lat),
+            longitude__range=(min_lon, max_lon),
+        ).order_by('-created_at').values_list('id', 'latitude', 'longitude')[:500]),
+        ('job images of a page', JobImage.objects.filter(job_id__in=[1, 2, 3])),
+        ('expiry: past deadline', expiry.past_deadline().values_list('id', flat=True)[:500]),
+        ('archive: cold closed jobs', archive.cold_jobs().order_by('id').values_list('id', flat=True)[:500]),
+        ('expiry: open too long', expiry.too_old('WORKER_JOB', 30).values_list('id', flat=True)[:500]),
+        ('changes: since a seq', JobChange.objects.filter(seq__gt=1).order_by('seq')[:100]),
+        ('changes: one customer', JobChange.objects.filter(customer_id=1, seq__gt=1).order_by('seq')[:100]),
+        ('changes: pruning', JobChange.objects.filter(
+            created_at__lt=since
+        ).order_by('seq').values_list('seq', flat=True)[:1000]),
+        ('user by supabase id', User.objects.filter(supabase_id='00000000-0000-0000-0000-000000000000')),
+        ('user by email', User.objects.filter(email='someone@example.com')),
+        ('users by role', User.objects.filter(role='WORKER')),
+        ('directory: area', ProviderDirectory.objects.filter(
+            role='WORKER', is_available=True, cell__in=['a', 'b']
+        ).order_by('-rating').values_list('user_id', flat=True)[:50]),
+        ('directory: top rated', ProviderDirectory.objects.filter(
+            role='CONSTRUCTOR', is_available=True
+        ).order_by('-rating').values_list('user_id', flat=True)[:50]),
+        ('saved search cells', SavedSearchCell.objects.filter(
+            cell='a', job_type__in=['WORKER_JOB', '']
+        ).values_list('search_id', flat=True)),
+        ('availability: worker overlap', AvailabilitySlot.objects.filter(
+            worker_id=1, kind='BOOKED', start_date__lte=timezone.localdate()
+        )),
+    ]
+
+
+def _postgres_seq_scans(plan):
+    """Tables read by Seq Scan nodes of a JSON plan"""
+    found = []
+    nodes = [plan]
+    while nodes:
+        node = nodes.pop()
+        if node.get('Node Type') == 'Seq Scan':
+            found.append(node.get('Relation Name', '?'))
+        nodes.extend(node.get('Plans', []))
+    return found
+
+
+def _sqlite_seq_scans(plan):
+    """Tables scanned without an index in an EXPLAIN QUERY PLAN text"""
+    found = []
+    for line in plan.splitlines():
+        detail = line.split('SCAN ', 1)
+        if len(detail) == 2 and 'INDEX' not in detail[1] and 'PRIMARY KEY' not in detail[1]:
+            found.append(detail[1].split()[0])
+    return found
+
+
+class Command(BaseCommand):
+    help = 'EXPLAIN the hot queries and fail if any plan contains a sequential scan'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default', help='Database alias')
+        parser.add_argument(
+            '--allow-seqscan',
+            action='store_true',
+            help='Let the planner pick sequential scans (small tables) instead of forcing index plans'
+        )
+        parser.add_argument('--verbose-plans', action='store_true', help='Print every plan')
+
+    def handle(self, *args, **options):
+        alias = options['database']
+        connection = connections[alias]
+        vendor = connection.vendor
+        if vendor not in ('postgresql', 'sqlite'):
+            raise CommandError(f'Plan checks support PostgreSQL and SQLite, not {vendor}')
+
+        failures = []
+        for label, queryset in hot_queries():
+            queryset = queryset.using(alias)
+            with transaction.atomic(using=alias):
+                if vendor == 'postgresql':
+                    # On a near-empty table a seq scan is cheapest; with it
+                    # priced out the planner shows whether an index applies
+                    if not options['allow_seqscan']:
+                        with connection.cursor() as cursor:
+                            cursor.execute('SET LOCAL enable_seqscan = off')
+                    plan = queryset.explain(format='json')
+                    seq_scans = _postgres_seq_scans(json.loads(plan)[0]['Plan'])
+                else:
+                    plan = queryset.explain()
+                    seq_scans = _sqlite_seq_scans(plan)
+
+            if seq_scans:
+                failures.append(label)
+                self.stdout.write(self.style.ERROR(f'SEQ SCAN  {label}: {", ".join(seq_scans)}'))
+            else:
+                self.stdout.write(f'ok        {label}')
+            if options['verbose_plans'] or seq_scans:
+                self.stdout.write(plan)
+
+        if failures and vendor != 'postgresql':
+            self.stdout.write(self.style.WARNING('SQLite plans are advisory; run against PostgreSQL to verify'))
+            return
+        if failures:
+            raise CommandError(f'{len(failures)} hot queries use a sequential scan: {", ".join(failures)}')
+        self.stdout.write(self.style.SUCCESS('No sequential scans in the hot query plans'))
@@ -0,0 +1,17 @@
+"""
+Delete delta-sync change rows past the retention window (run daily)
+"""
+from django.core.management.base import BaseCommand
+from jobs import changes
+
+
+class Command(BaseCommand):
+    help = 'Prune old rows from the job change log'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=None, help='Retention in days (default: JOB_CHANGES_RETENTION_DAYS)')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Rows deleted per statement')
+    
+    def handle(self, *args, **options):
+        deleted = changes.prune(days=options['days'], batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} job change rows'))
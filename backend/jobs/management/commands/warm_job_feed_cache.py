@@ -0,0 +1,21 @@
+"""
+Warm the geocell feed cache for the busiest cells (run after deploys)
+"""
+from django.core.management.base import BaseCommand
+from jobs import feed_cache
+
+
+class Command(BaseCommand):
+    help = 'Precompute nearby-job feed cache entries for the hottest geocells'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--cells', type=int, default=50, help='Number of hottest cells to warm')
+        parser.add_argument('--radius', type=float, default=50, help='Radius (km) to warm')
+    
+    def handle(self, *args, **options):
+        if not feed_cache.enabled():
+            self.stdout.write('The feed cache is off (no shared cache); nothing to warm')
+            return
+        
+        written = feed_cache.warm(limit=options['cells'], radius_km=options['radius'])
+        self.stdout.write(self.style.SUCCESS(f'Warmed {written} feed cache entries'))
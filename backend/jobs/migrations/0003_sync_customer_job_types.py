@@ -0,0 +1,54 @@
+# Brings the migration state in line with the customer/job-type models
+# consumer is renamed (not dropped) so existing job ownership is preserved
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('users', '0003_sync_role_profiles'),
+        ('jobs', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='job',
+            name='jobs_consume_3e4869_idx',
+        ),
+        migrations.RenameField(
+            model_name='job',
+            old_name='consumer',
+            new_name='customer',
+        ),
+        migrations.AlterField(
+            model_name='job',
+            name='customer',
+            field=models.ForeignKey(limit_choices_to={'role': 'CUSTOMER'}, on_delete=django.db.models.deletion.CASCADE, related_name='jobs_posted', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.RemoveField(
+            model_name='job',
+            name='selected_provider',
+        ),
+        migrations.AlterField(
+            model_name='job',
+            name='job_type',
+            field=models.CharField(choices=[('CONSTRUCTOR_JOB', 'Constructor Job (Large Project)'), ('WORKER_JOB', 'Worker Job (Freelance Work)')], max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='job',
+            name='status',
+            field=models.CharField(choices=[('OPEN', 'Open'), ('IN_PROGRESS', 'In Progress'), ('COMPLETED', 'Completed'), ('CANCELLED', 'Cancelled')], default='OPEN', max_length=20),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['customer'], name='jobs_custome_d3929b_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['job_type'], name='jobs_job_typ_e7f4d4_idx'),
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 4.2.7 on 2026-10-19 00:28
+
+from django.conf import settings
+import django.core.validators
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('jobs', '0003_sync_customer_job_types'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SavedSearch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(blank=True, max_length=100)),
+                ('latitude', models.DecimalField(decimal_places=6, max_digits=9)),
+                ('longitude', models.DecimalField(decimal_places=6, max_digits=9)),
+                ('radius_km', models.DecimalField(decimal_places=2, default=25, max_digits=6, validators=[django.core.validators.MinValueValidator(0)])),
+                ('job_type', models.CharField(blank=True, choices=[('CONSTRUCTOR_JOB', 'Constructor Job (Large Project)'), ('WORKER_JOB', 'Worker Job (Freelance Work)')], max_length=20)),
+                ('min_budget', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True, validators=[django.core.validators.MinValueValidator(0)])),
+                ('skills', models.TextField(blank=True, help_text='Comma-separated skills; any one must appear in the job')),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='saved_searches', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'saved_searches',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='SavedSearchCell',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('cell', models.CharField(max_length=32)),
+                ('job_type', models.CharField(blank=True, max_length=20)),
+                ('search', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='cells', to='jobs.savedsearch')),
+            ],
+            options={
+                'db_table': 'saved_search_cells',
+                'indexes': [models.Index(fields=['cell', 'job_type'], include=('search',), name='saved_search_cell_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 4.2.7 on 2026-10-19 00:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0004_saved_searches'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobChange',
+            fields=[
+                ('seq', models.BigAutoField(primary_key=True, serialize=False)),
+                ('job_id', models.BigIntegerField()),
+                ('action', models.CharField(max_length=20)),
+                ('customer_id', models.BigIntegerField()),
+                ('job_type', models.CharField(choices=[('CONSTRUCTOR_JOB', 'Constructor Job (Large Project)'), ('WORKER_JOB', 'Worker Job (Freelance Work)')], max_length=20)),
+                ('status', models.CharField(choices=[('OPEN', 'Open'), ('IN_PROGRESS', 'In Progress'), ('COMPLETED', 'Completed'), ('CANCELLED', 'Cancelled')], max_length=20)),
+                ('previous_status', models.CharField(blank=True, max_length=20)),
+                ('latitude', models.DecimalField(decimal_places=6, max_digits=9)),
+                ('longitude', models.DecimalField(decimal_places=6, max_digits=9)),
+                ('previous_latitude', models.DecimalField(blank=True, decimal_places=6, max_digits=9, null=True)),
+                ('previous_longitude', models.DecimalField(blank=True, decimal_places=6, max_digits=9, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'job_changes',
+                'ordering': ['seq'],
+                'indexes': [models.Index(fields=['customer_id', 'seq'], name='job_change_customer_idx'), models.Index(fields=['created_at'], name='job_change_created_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 4.2.7 on 2026-10-19 00:58
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('jobs', '0005_job_changes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='job',
+            name='jobs_status_92f544_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='job',
+            name='jobs_latitud_205dfc_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='job',
+            name='jobs_custome_d3929b_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='job',
+            name='jobs_job_typ_e7f4d4_idx',
+        ),
+        migrations.AlterField(
+            model_name='job',
+            name='customer',
+            field=models.ForeignKey(db_index=False, limit_choices_to={'role': 'CUSTOMER'}, on_delete=django.db.models.deletion.CASCADE, related_name='jobs_posted', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['customer', '-created_at'], name='job_customer_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('status', 'OPEN')), fields=['job_type', '-created_at'], name='job_open_type_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('status', 'OPEN')), fields=['job_type', 'latitude', 'longitude'], include=('id',), name='job_open_geo_idx'),
+        ),
+    ]
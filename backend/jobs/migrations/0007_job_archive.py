@@ -0,0 +1,60 @@
+# Generated by Django 4.2.7 on 2026-10-19 01:01
+
+from django.conf import settings
+import django.core.validators
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('jobs', '0006_workload_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedJob',
+            fields=[
+                ('job_type', models.CharField(choices=[('CONSTRUCTOR_JOB', 'Constructor Job (Large Project)'), ('WORKER_JOB', 'Worker Job (Freelance Work)')], max_length=20)),
+                ('title', models.CharField(max_length=255)),
+                ('description', models.TextField()),
+                ('budget_min', models.DecimalField(decimal_places=2, max_digits=10, validators=[django.core.validators.MinValueValidator(0)])),
+                ('budget_max', models.DecimalField(decimal_places=2, max_digits=10, validators=[django.core.validators.MinValueValidator(0)])),
+                ('latitude', models.DecimalField(decimal_places=6, max_digits=9)),
+                ('longitude', models.DecimalField(decimal_places=6, max_digits=9)),
+                ('address', models.TextField()),
+                ('status', models.CharField(choices=[('OPEN', 'Open'), ('IN_PROGRESS', 'In Progress'), ('COMPLETED', 'Completed'), ('CANCELLED', 'Cancelled')], default='OPEN', max_length=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('deadline', models.DateField(blank=True, null=True)),
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('archived_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('customer', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='archived_jobs', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'jobs_archive',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedJobImage',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('image_url', models.URLField(max_length=500)),
+                ('caption', models.CharField(blank=True, max_length=255)),
+                ('uploaded_at', models.DateTimeField()),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='images', to='jobs.archivedjob')),
+            ],
+            options={
+                'db_table': 'job_images_archive',
+                'ordering': ['uploaded_at'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='archivedjob',
+            index=models.Index(fields=['customer', '-created_at'], name='job_archive_customer_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-19 01:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0009_backfill_checkpoints'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('status__in', ['COMPLETED', 'CANCELLED', 'EXPIRED'])), fields=['updated_at'], name='job_closed_updated_idx'),
+        ),
+    ]
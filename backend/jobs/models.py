@@ -4,13 +4,13 @@ Defines Job postings
 """
 from django.db import models
 from django.core.validators import MinValueValidator
+from django.utils import timezone
 from users.models import User
 
 
-class Job(models.Model):
+class AbstractJob(models.Model):
     """
-    Job posting by customers
-    For constructor jobs (large projects) or worker jobs (freelance work)
+    Columns shared by hot jobs and their archived copies
     """
     
     class JobType(models.TextChoices):
@@ -22,16 +22,8 @@ class Job(models.Model):
         IN_PROGRESS = 'IN_PROGRESS', 'In Progress'
         COMPLETED = 'COMPLETED', 'Completed'
         CANCELLED = 'CANCELLED', 'Cancelled'
-    
-    id = models.BigAutoField(primary_key=True)
-    
-    # Customer who posted the job
-    customer = models.ForeignKey(
-        User, 
-        on_delete=models.CASCADE, 
-        related_name='jobs_posted',
-        limit_choices_to={'role': 'CUSTOMER'}
-    )
+        # Passed its deadline or the open-age limit (see jobs.expiry)
+        EXPIRED = 'EXPIRED', 'Expired'
     
     # Job details
     job_type = models.CharField(max_length=20, choices=JobType.choices)
@@ -63,19 +55,98 @@ class Job(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     deadline = models.DateField(null=True, blank=True)
     
+    class Meta:
+        abstract = True
+
+
+class JobManager(models.Manager):
+    """
+    Hot jobs; closed jobs moved out by jobs.archive are reached through
+    archived() and get_including_archived()
+    """
+    
+    def archived(self):
+        return ArchivedJob.objects.all()
+    
+    def get_including_archived(self, **lookup):
+        """The job from the hot table, else its archived copy"""
+        try:
+            return self.get(**lookup)
+        except Job.DoesNotExist:
+            try:
+                return self.archived().get(**lookup)
+            except ArchivedJob.DoesNotExist:
+                raise Job.DoesNotExist('Job matching query does not exist.')
+
+
+class Job(AbstractJob):
+    """
+    Job posting by customers
+    For constructor jobs (large projects) or worker jobs (freelance work)
+    """
+    
+    id = models.BigAutoField(primary_key=True)
+    
+    # Customer who posted the job
+    customer = models.ForeignKey(
+        User, 
+        on_delete=models.CASCADE, 
+        related_name='jobs_posted',
+        limit_choices_to={'role': 'CUSTOMER'},
+        # Served by job_customer_created_idx, which leads with customer
+        db_index=False
+    )
+    
+    objects = JobManager()
+    
     class Meta:
         db_table = 'jobs'
         ordering = ['-created_at']
         indexes = [
-            models.Index(fields=['customer']),
-            models.Index(fields=['status']),
-            models.Index(fields=['job_type']),
-            models.Index(fields=['latitude', 'longitude']),
+            # Unfiltered listings, newest first
             models.Index(fields=['-created_at']),
+            # MyJobsView and my_jobs: one customer's jobs, newest first
+            models.Index(fields=['customer', '-created_at'], name='job_customer_created_idx'),
+            # Worker/constructor listings: open jobs of one type, newest first
+            models.Index(
+                fields=['job_type', '-created_at'],
+                condition=models.Q(status='OPEN'),
+                name='job_open_type_created_idx',
+            ),
+            # Feed cache and ranking candidates: open jobs of one type in a
+            # bounding box, read from the index alone
+            models.Index(
+                fields=['job_type', 'latitude', 'longitude'],
+                condition=models.Q(status='OPEN'),
+                include=['id'],
+                name='job_open_geo_idx',
+            ),
+            # Expiry sweeps: open jobs in deadline order
+            models.Index(
+                fields=['deadline'],
+                condition=models.Q(status='OPEN'),
+                name='job_open_deadline_idx',
+            ),
+            # Archiving: closed jobs (archive.CLOSED_STATUSES) by last change
+            models.Index(
+                fields=['updated_at'],
+                condition=models.Q(status__in=['COMPLETED', 'CANCELLED', 'EXPIRED']),
+                name='job_closed_updated_idx',
+            ),
         ]
     
     def __str__(self):
         return f"{self.title} by {self.customer.name}"
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember stored status and location so saves can detect transitions
+        loaded = dict(zip(field_names, values))
+        instance._loaded_status = loaded.get('status')
+        if 'latitude' in loaded and 'longitude' in loaded:
+            instance._loaded_location = (loaded['latitude'], loaded['longitude'])
+        return instance
 
 
 class JobImage(models.Model):
@@ -95,3 +166,171 @@ class JobImage(models.Model):
     
     def __str__(self):
         return f"Image for {self.job.title}"
+
+
+class ArchivedJob(AbstractJob):
+    """
+    Completed or cancelled job moved out of the hot jobs table
+    Rows keep their original id and timestamps; they are written only by
+    jobs.archive (INSERT ... SELECT) and read through Job.objects.archived()
+    """
+    
+    id = models.BigIntegerField(primary_key=True)
+    customer = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='archived_jobs',
+        db_index=False
+    )
+    archived_at = models.DateTimeField(default=timezone.now)
+    
+    class Meta:
+        db_table = 'jobs_archive'
+        ordering = ['-created_at']
+        indexes = [
+            # A customer's job history, newest first
+            models.Index(fields=['customer', '-created_at'], name='job_archive_customer_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.title} by {self.customer.name} (archived)"
+
+
+class ArchivedJobImage(models.Model):
+    """
+    Image of an archived job, moved with it
+    """
+    
+    id = models.BigIntegerField(primary_key=True)
+    job = models.ForeignKey(ArchivedJob, on_delete=models.CASCADE, related_name='images')
+    image_url = models.URLField(max_length=500)
+    caption = models.CharField(max_length=255, blank=True)
+    uploaded_at = models.DateTimeField()
+    
+    class Meta:
+        db_table = 'job_images_archive'
+        ordering = ['uploaded_at']
+    
+    def __str__(self):
+        return f"Image for {self.job.title} (archived)"
+
+
+class SavedSearch(models.Model):
+    """
+    Stored job search of a worker or constructor
+    New and reopened jobs are matched against it (see jobs.percolator)
+    """
+    
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='saved_searches')
+    name = models.CharField(max_length=100, blank=True)
+    
+    # Search area
+    latitude = models.DecimalField(max_digits=9, decimal_places=6)
+    longitude = models.DecimalField(max_digits=9, decimal_places=6)
+    radius_km = models.DecimalField(
+        max_digits=6,
+        decimal_places=2,
+        default=25,
+        validators=[MinValueValidator(0)]
+    )
+    
+    # Filters; blank job_type matches any type
+    job_type = models.CharField(max_length=20, choices=Job.JobType.choices, blank=True)
+    min_budget = models.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+        null=True,
+        blank=True,
+        validators=[MinValueValidator(0)]
+    )
+    skills = models.TextField(blank=True, help_text="Comma-separated skills; any one must appear in the job")
+    
+    is_active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'saved_searches'
+        ordering = ['-created_at']
+    
+    def __str__(self):
+        return f"Saved search {self.name or self.pk} by {self.user.name}"
+
+
+class SavedSearchCell(models.Model):
+    """
+    Reverse index row: (geocell, job_type) -> saved search
+    One row per geocell covered by the search radius
+    """
+    
+    search = models.ForeignKey(SavedSearch, on_delete=models.CASCADE, related_name='cells')
+    cell = models.CharField(max_length=32)
+    job_type = models.CharField(max_length=20, blank=True)
+    
+    class Meta:
+        db_table = 'saved_search_cells'
+        indexes = [
+            models.Index(fields=['cell', 'job_type'], include=['search'], name='saved_search_cell_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.cell}/{self.job_type or '*'} -> {self.search_id}"
+
+
+class JobChange(models.Model):
+    """
+    Append-only log of job writes backing the delta-sync feed
+    seq is the change sequence clients page through; job_id is not a foreign
+    key so entries outlive deleted jobs and serve as tombstones
+    """
+    
+    seq = models.BigAutoField(primary_key=True)
+    job_id = models.BigIntegerField()
+    action = models.CharField(max_length=20)
+    
+    # Job state after the change, used to scope the feed per caller
+    customer_id = models.BigIntegerField()
+    job_type = models.CharField(max_length=20, choices=Job.JobType.choices)
+    status = models.CharField(max_length=20, choices=Job.Status.choices)
+    previous_status = models.CharField(max_length=20, blank=True)
+    latitude = models.DecimalField(max_digits=9, decimal_places=6)
+    longitude = models.DecimalField(max_digits=9, decimal_places=6)
+    
+    # Location before a move, so callers near the old spot hear about it
+    previous_latitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
+    previous_longitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'job_changes'
+        ordering = ['seq']
+        indexes = [
+            models.Index(fields=['customer_id', 'seq'], name='job_change_customer_idx'),
+            models.Index(fields=['created_at'], name='job_change_created_idx'),
+        ]
+    
+    def __str__(self):
+        return f"#{self.seq} {self.action} job {self.job_id}"
+
+
+class BackfillCheckpoint(models.Model):
+    """
+    Progress of one backfill (see jobs.backfill)
+    Saved with every chunk, so an interrupted run resumes after last_pk
+    """
+    
+    name = models.CharField(max_length=100, unique=True)
+    last_pk = models.BigIntegerField(default=0)
+    rows_done = models.BigIntegerField(default=0)
+    
+    started_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        db_table = 'backfill_checkpoints'
+    
+    def __str__(self):
+        state = 'finished' if self.finished_at else f'at pk {self.last_pk}'
+        return f"Backfill {self.name}: {self.rows_done} rows, {state}"
@@ -0,0 +1,88 @@
+"""
+Saved-search percolator
+Matches a single job against every stored search through a reverse index
+(geocell, job_type) -> searches instead of evaluating each subscriber
+"""
+from collections import namedtuple
+
+from django.db import transaction
+
+from common.geo import calculate_distance, covering_cells, geocell
+from .models import SavedSearch, SavedSearchCell
+
+
+SearchMatch = namedtuple('SearchMatch', ['search_id', 'user_id', 'job_id', 'distance_km'])
+
+MAX_SEARCH_RADIUS_KM = 100
+
+
+def index_cells(search):
+    """Unsaved reverse index rows for a saved search; none when inactive"""
+    if not search.is_active:
+        return []
+    return [
+        SavedSearchCell(search=search, cell=cell, job_type=search.job_type)
+        for cell in covering_cells(search.latitude, search.longitude, search.radius_km)
+    ]
+
+
+def index_search(search):
+    """(Re)build the reverse index rows for a saved search"""
+    with transaction.atomic():
+        SavedSearchCell.objects.filter(search=search).delete()
+        SavedSearchCell.objects.bulk_create(index_cells(search))
+
+
+def index_searches(searches):
+    """index_search() for a batch of searches, in one delete and one insert"""
+    with transaction.atomic():
+        SavedSearchCell.objects.filter(search__in=searches).delete()
+        SavedSearchCell.objects.bulk_create(
+            [cell for search in searches for cell in index_cells(search)]
+        )
+
+
+def candidate_searches(job):
+    """Active searches whose indexed cells and job type can match the job"""
+    search_ids = SavedSearchCell.objects.filter(
+        cell=geocell(job.latitude, job.longitude),
+        job_type__in=[job.job_type, ''],
+    ).values('search_id')
+    
+    return SavedSearch.objects.filter(pk__in=search_ids, is_active=True)
+
+
+def matches_search(search, job, text):
+    """
+    Exact check of one candidate; returns the distance or None
+    `text` is the lower-cased job title and description
+    """
+    if search.min_budget is not None and job.budget_max < search.min_budget:
+        return None
+    
+    skills = [s.strip().lower() for s in search.skills.split(',') if s.strip()]
+    if skills and not any(skill in text for skill in skills):
+        return None
+    
+    distance = calculate_distance(search.latitude, search.longitude, job.latitude, job.longitude)
+    if distance > float(search.radius_km):
+        return None
+    
+    return distance
+
+
+def percolate(job):
+    """
+    Return the SearchMatch list for a job, closest searches first
+    The job's own customer is never matched
+    """
+    text = f'{job.title} {job.description}'.lower()
+    matches = []
+    
+    for search in candidate_searches(job).exclude(user_id=job.customer_id):
+        distance = matches_search(search, job, text)
+        if distance is not None:
+            matches.append(SearchMatch(search.pk, search.user_id, job.pk, round(distance, 2)))
+    
+    matches.sort(key=lambda m: m.distance_km)
+    return matches
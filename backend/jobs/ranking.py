@@ -0,0 +1,188 @@
+"""
+Personalized "for you" ranking of open jobs
+Scores every candidate job for a worker or constructor in one vectorized pass
+"""
+import numpy as np
+from django.conf import settings
+from django.utils import timezone
+
+from common.geo import bounding_box, distances_from
+from .models import Job
+
+
+DEFAULT_WEIGHTS = {
+    'distance': 0.30,
+    'budget': 0.25,
+    'skills': 0.20,
+    'deadline': 0.10,
+    'recency': 0.15,
+}
+
+
+class JobRanker:
+    """
+    Rank open jobs for a single worker or constructor
+
+    Candidates are the open jobs of the user's job type inside the bounding
+    box of the search radius. Each factor is scored in [0, 1] over NumPy
+    arrays and combined with configurable weights (settings.JOB_RANKING_WEIGHTS,
+    optionally overridden per request).
+    """
+
+    CANDIDATE_LIMIT = 5000
+    RECENCY_HALF_LIFE_DAYS = 7
+    DEADLINE_HORIZON_DAYS = 30
+    HOURS_PER_DAY = 8
+    # Smallest project value that keeps one constructor team member busy
+    PROJECT_VALUE_PER_TEAM_MEMBER = 10000
+    NEUTRAL_SCORE = 0.5
+
+    def __init__(self, user, radius_km=50, weights=None):
+        self.user = user
+        self.radius_km = float(radius_km)
+        self.weights = dict(DEFAULT_WEIGHTS)
+        self.weights.update(getattr(settings, 'JOB_RANKING_WEIGHTS', {}))
+        if weights:
+            self.weights.update(weights)
+
+    def get_candidates(self):
+        """Open jobs of the user's type within the radius bounding box"""
+        job_type = 'WORKER_JOB' if self.user.role == 'WORKER' else 'CONSTRUCTOR_JOB'
+        min_lat, max_lat, min_lon, max_lon = bounding_box(
+            self.user.latitude, self.user.longitude, self.radius_km
+        )
+
+        return Job.objects.filter(
+            status='OPEN',
+            job_type=job_type,
+            latitude__range=(min_lat, max_lat),
+            longitude__range=(min_lon, max_lon),
+        ).order_by('-created_at').values_list(
+            'id', 'latitude', 'longitude', 'budget_min', 'budget_max',
+            'deadline', 'created_at', 'title', 'description'
+        )[:self.CANDIDATE_LIMIT]
+
+    def rank(self, limit=20):
+        """
+        Return up to `limit` (job_id, score, distance_km) tuples, best first
+        """
+        rows = list(self.get_candidates())
+        if not rows:
+            return []
+
+        ids, lats, lons = zip(*(row[:3] for row in rows))
+        distances = distances_from(self.user.latitude, self.user.longitude, lats, lons)
+        in_range = np.flatnonzero(distances <= self.radius_km)
+        if not len(in_range):
+            return []
+
+        # Bounding box corners fall outside the circle; score only what is left
+        rows = [rows[i] for i in in_range]
+        distances = distances[in_range]
+        _, _, _, bmin, bmax, deadlines, created, titles, descriptions = zip(*rows)
+        ids = np.array([row[0] for row in rows], dtype=np.int64)
+        budget_min = np.array(bmin, dtype=np.float64)
+        budget_max = np.array(bmax, dtype=np.float64)
+        texts = np.char.lower(np.array(
+            [f'{title} {description}' for title, description in zip(titles, descriptions)],
+            dtype=str
+        ))
+
+        factors = {
+            'distance': 1.0 - np.clip(distances / max(self.radius_km, 1e-6), 0.0, 1.0),
+            'budget': self._budget_scores(budget_min, budget_max),
+            'skills': self._skill_scores(texts),
+            'deadline': self._deadline_scores(deadlines),
+            'recency': self._recency_scores(created),
+        }
+
+        scores = np.zeros(len(rows), dtype=np.float64)
+        total_weight = 0.0
+        for name, values in factors.items():
+            weight = float(self.weights.get(name, 0))
+            scores += weight * values
+            total_weight += weight
+        if total_weight > 0:
+            scores /= total_weight
+
+        top_count = min(limit, len(rows))
+        # argpartition keeps selection O(n) before sorting only the top slice
+        top = np.argpartition(-scores, top_count - 1)[:top_count]
+        top = top[np.argsort(-scores[top], kind='stable')]
+
+        return [
+            (int(ids[i]), round(float(scores[i]), 4), round(float(distances[i]), 2))
+            for i in top
+        ]
+
+    def _budget_scores(self, budget_min, budget_max):
+        """How well the job budget matches the user's rates or capacity"""
+        if self.user.role == 'WORKER':
+            profile = getattr(self.user, 'worker_profile', None)
+            expected = None
+            if profile is not None:
+                if profile.daily_rate:
+                    expected = float(profile.daily_rate)
+                elif profile.hourly_rate:
+                    expected = float(profile.hourly_rate) * self.HOURS_PER_DAY
+            if not expected:
+                return np.full(budget_max.shape, self.NEUTRAL_SCORE)
+            # A job paying at least one day's rate is a full match
+            return np.clip(budget_max / expected, 0.0, 1.0)
+
+        profile = getattr(self.user, 'constructor_profile', None)
+        if profile is None:
+            return np.full(budget_max.shape, self.NEUTRAL_SCORE)
+
+        if profile.max_project_value:
+            capacity = float(profile.max_project_value)
+            # Jobs that need more than the constructor can handle score zero
+            capacity_fit = np.where(
+                budget_min <= capacity,
+                np.clip(budget_max / capacity, 0.0, 1.0),
+                0.0
+            )
+        else:
+            capacity_fit = np.full(budget_max.shape, self.NEUTRAL_SCORE)
+
+        team_floor = max(profile.team_size, 1) * self.PROJECT_VALUE_PER_TEAM_MEMBER
+        team_fit = np.clip(budget_max / team_floor, 0.0, 1.0)
+
+        return (capacity_fit + team_fit) / 2
+
+    def _skill_scores(self, texts):
+        """Fraction of the user's skills mentioned in the job title/description"""
+        if self.user.role == 'WORKER':
+            profile = getattr(self.user, 'worker_profile', None)
+            raw = profile.skills if profile else ''
+        else:
+            profile = getattr(self.user, 'constructor_profile', None)
+            raw = profile.specializations if profile else ''
+
+        skills = [s.strip().lower() for s in (raw or '').split(',') if s.strip()]
+        if not skills:
+            return np.full(texts.shape, self.NEUTRAL_SCORE)
+
+        hits = np.zeros(texts.shape, dtype=np.float64)
+        for skill in skills:
+            hits += np.char.find(texts, skill) >= 0
+        return hits / len(skills)
+
+    def _deadline_scores(self, deadlines):
+        """Sooner deadlines rank higher; expired ones score zero"""
+        today = timezone.localdate()
+        days_left = np.array(
+            [(d - today).days if d is not None else np.nan for d in deadlines],
+            dtype=np.float64
+        )
+        scores = 1.0 - np.clip(days_left / self.DEADLINE_HORIZON_DAYS, 0.0, 1.0)
+        scores[days_left < 0] = 0.0
+        scores[np.isnan(days_left)] = self.NEUTRAL_SCORE
+        return scores
+
+    def _recency_scores(self, created):
+        """Exponential decay on job age"""
+        now = timezone.now().timestamp()
+        created_ts = np.fromiter((c.timestamp() for c in created), dtype=np.float64, count=len(created))
+        age_days = np.maximum(now - created_ts, 0.0) / 86400
+        return np.exp2(-age_days / self.RECENCY_HALF_LIFE_DAYS)
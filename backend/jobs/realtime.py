@@ -0,0 +1,248 @@
+"""
+Real-time push of job events to streaming (SSE) clients
+
+Each ASGI process keeps a hub of subscriptions indexed by the geocells their
+radius covers. Job changes are turned into events after commit and fanned
+out only to the subscribers of the job's cells; an exact distance check then
+decides what each subscriber gets. Every event is encoded once and the same
+frame is queued for all of its subscribers.
+
+Without REDIS_URL events only reach streams served by the process that made
+the write. With REDIS_URL they go through a Redis pub/sub channel that every
+process listens on, so writes from WSGI workers reach ASGI streams too.
+"""
+import asyncio
+import json
+import logging
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+
+from common.geo import calculate_distance, covering_cells, geocell
+from . import events
+from .serializers import JobListSerializer
+
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = 'jobs:events'
+MAX_RADIUS_KM = 100
+QUEUE_SIZE = 100
+HEARTBEAT_SECONDS = 15
+RETRY_MS = 3000
+
+
+def _max_connections():
+    return getattr(settings, 'JOB_STREAM_MAX_CONNECTIONS', 5000)
+
+
+def _max_connection_seconds():
+    # Streams are recycled so a client that vanished without a disconnect
+    # being noticed cannot hold a subscription forever; EventSource reconnects
+    return getattr(settings, 'JOB_STREAM_MAX_SECONDS', 300)
+
+
+def frame(event_type, data):
+    """One encoded SSE frame"""
+    return f'event: {event_type}\ndata: {json.dumps(data, cls=DjangoJSONEncoder)}\n\n'
+
+
+class Subscription:
+    """One connected stream: a worker's job type, area and outgoing queue"""
+
+    def __init__(self, user_id, job_type, latitude, longitude, radius_km):
+        self.user_id = user_id
+        self.job_type = job_type
+        self.latitude = float(latitude)
+        self.longitude = float(longitude)
+        self.radius_km = min(float(radius_km), MAX_RADIUS_KM)
+        self.cells = covering_cells(self.latitude, self.longitude, self.radius_km)
+        self.queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+        self.overflowed = False
+
+    def covers(self, point):
+        if point is None:
+            return False
+        return calculate_distance(self.latitude, self.longitude, *point) <= self.radius_km
+
+    def offer(self, message):
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # A client this far behind resyncs from the changes feed instead
+            self.overflowed = True
+
+
+class Hub:
+    """Subscriptions of this process by geocell; used from one event loop"""
+
+    def __init__(self):
+        self.loop = None
+        self.cells = {}
+        self.count = 0
+        self._listener = None
+
+    def subscribe(self, subscription):
+        loop = asyncio.get_running_loop()
+        if self.loop is not loop:
+            self.loop = loop
+            self.cells = {}
+            self.count = 0
+            self._listener = None
+
+        for cell in subscription.cells:
+            self.cells.setdefault(cell, set()).add(subscription)
+        self.count += 1
+
+        if settings.REDIS_URL and self._listener is None:
+            self._listener = loop.create_task(self._listen())
+
+    def unsubscribe(self, subscription):
+        for cell in subscription.cells:
+            subscribers = self.cells.get(cell)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self.cells[cell]
+        self.count -= 1
+
+    def full(self):
+        return self.count >= _max_connections()
+
+    def dispatch(self, event):
+        """Queue an event's frames for the subscribers it concerns"""
+        point = tuple(event['point'])
+        previous = tuple(event['previous_point']) if event['previous_point'] else None
+
+        seen = set()
+        for cell in event['cells']:
+            for subscription in self.cells.get(cell, ()):
+                if subscription in seen or subscription.job_type != event['job_type']:
+                    continue
+                seen.add(subscription)
+
+                if subscription.covers(point):
+                    subscription.offer(event['message'])
+                elif subscription.covers(previous):
+                    # Moved out of this subscriber's area
+                    subscription.offer(event['removal'])
+
+    def publish_local(self, event):
+        """Hand an event to the hub's loop; safe from any thread"""
+        loop = self.loop
+        if loop is None or loop.is_closed():
+            return
+        loop.call_soon_threadsafe(self.dispatch, event)
+
+    async def _listen(self):
+        import redis.asyncio as redis
+
+        while True:
+            try:
+                client = redis.from_url(settings.REDIS_URL)
+                pubsub = client.pubsub()
+                await pubsub.subscribe(CHANNEL)
+                async for message in pubsub.listen():
+                    if message['type'] == 'message':
+                        self.dispatch(json.loads(message['data']))
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception('Job event listener failed, reconnecting')
+                await asyncio.sleep(1)
+
+
+hub = Hub()
+_redis = None
+
+
+def enabled():
+    """Whether any stream can receive events published from this process"""
+    return bool(settings.REDIS_URL) or hub.loop is not None
+
+
+def publish(event):
+    """Send an event to every process's hub; called after commit"""
+    global _redis
+
+    if not settings.REDIS_URL:
+        hub.publish_local(event)
+        return
+
+    if _redis is None:
+        import redis
+        _redis = redis.Redis.from_url(settings.REDIS_URL)
+    try:
+        _redis.publish(CHANNEL, json.dumps(event))
+    except Exception:
+        # Push is best effort; clients catch up from the changes feed
+        logger.exception('Could not publish job event')
+
+
+def build_event(job, action, previous_status, previous_location):
+    """
+    Event for a job change, or None when no stream cares about it
+    job (new, reopened or edited OPEN job), status (a status change that
+    involves OPEN) or removed (an OPEN job was deleted)
+    """
+    point = (float(job.latitude), float(job.longitude))
+    previous_point = None
+    if previous_location and None not in previous_location:
+        previous_point = (float(previous_location[0]), float(previous_location[1]))
+        if previous_point == point:
+            previous_point = None
+
+    removal = frame('removed', {'id': job.pk})
+
+    if action == events.DELETED:
+        if previous_status != 'OPEN':
+            return None
+        message = removal
+    elif job.status == 'OPEN':
+        message = frame('job', JobListSerializer(job).data)
+    elif previous_status == 'OPEN':
+        message = frame('status', {
+            'id': job.pk, 'status': job.status, 'previous_status': previous_status
+        })
+    else:
+        return None
+
+    cells = {geocell(*point)}
+    if previous_point:
+        cells.add(geocell(*previous_point))
+
+    return {
+        'job_type': job.job_type,
+        'point': point,
+        'previous_point': previous_point,
+        'cells': sorted(cells),
+        'message': message,
+        'removal': removal,
+    }
+
+
+async def stream(subscription):
+    """SSE body for one subscription: events, heartbeats, then a clean close"""
+    hub.subscribe(subscription)
+    try:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + _max_connection_seconds()
+        yield f'retry: {RETRY_MS}\n: connected\n\n'
+
+        while not subscription.overflowed:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                message = await asyncio.wait_for(
+                    subscription.queue.get(), timeout=min(HEARTBEAT_SECONDS, remaining)
+                )
+            except asyncio.TimeoutError:
+                yield ': keepalive\n\n'
+                continue
+            yield message
+
+        if subscription.overflowed:
+            yield frame('resync', {})
+    finally:
+        hub.unsubscribe(subscription)
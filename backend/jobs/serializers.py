@@ -3,8 +3,12 @@ Serializers for Job and JobImage
 Updated for simplified job system (no bidding)
 """
 from rest_framework import serializers
-from .models import Job, JobImage
+from .models import Job, JobImage, SavedSearch
+from .percolator import MAX_SEARCH_RADIUS_KM
+from .fragments import FragmentCacheMixin, FragmentListSerializer
+from common.fieldsets import SparseFieldsMixin
 from users.serializers import UserSerializer
+from users import summary_cache
 
 
 class JobImageSerializer(serializers.ModelSerializer):
@@ -52,13 +56,43 @@ class JobSerializer(serializers.ModelSerializer):
         return job
 
 
-class JobListSerializer(serializers.ModelSerializer):
-    """Lightweight serializer for job listings"""
+class CustomerSummaryMixin:
+    """
+    Fill customer fields from the user-summary cache
+    One multi-get per page instead of a customer join or per-row queries
+    """
     
-    customer_name = serializers.CharField(source='customer.name', read_only=True)
-    customer_role = serializers.CharField(source='customer.role', read_only=True)
+    # Fields filled from the summary; no lookup when none of them is rendered
+    customer_fields = ()
+    
+    def customer_placeholder(self, obj):
+        # Rendered as null into the fragment, replaced in attach()
+        return None
+    
+    def attach(self, representations, instances):
+        if not any(name in self.fields for name in self.customer_fields):
+            return
+        summaries = summary_cache.get_many({job.customer_id for job in instances})
+        for data, job in zip(representations, instances):
+            self.attach_customer(data, summaries.get(job.customer_id))
+    
+    def attach_customer(self, data, summary):
+        raise NotImplementedError
+
+
+class JobListSerializer(SparseFieldsMixin, CustomerSummaryMixin, FragmentCacheMixin, serializers.ModelSerializer):
+    """Lightweight serializer for job listings (fragment cached, sparse fieldsets)"""
+    
+    customer_name = serializers.SerializerMethodField(method_name='customer_placeholder')
+    customer_role = serializers.SerializerMethodField(method_name='customer_placeholder')
     image_count = serializers.SerializerMethodField()
     
+    fragment_prefetch = ('images',)
+    customer_fields = ('customer_name', 'customer_role')
+    field_requirements = {'image_count': ('images',)}
+    # Fragment keys and the customer summary lookup
+    always_load = ('pk', 'updated_at', 'customer')
+    
     class Meta:
         model = Job
         fields = [
@@ -66,16 +100,27 @@ class JobListSerializer(serializers.ModelSerializer):
             'latitude', 'longitude', 'customer_name', 'customer_role',
             'created_at', 'image_count'
         ]
+        list_serializer_class = FragmentListSerializer
     
     def get_image_count(self, obj):
         return obj.images.count()
+    
+    def attach_customer(self, data, summary):
+        if 'customer_name' in data:
+            data['customer_name'] = summary['name'] if summary else None
+        if 'customer_role' in data:
+            data['customer_role'] = summary['role'] if summary else None
 
 
-class JobDetailSerializer(serializers.ModelSerializer):
-    """Detailed job serializer with all information"""
+class JobDetailSerializer(SparseFieldsMixin, CustomerSummaryMixin, FragmentCacheMixin, serializers.ModelSerializer):
+    """Detailed job serializer with all information (fragment cached, sparse fieldsets)"""
     
     images = JobImageSerializer(many=True, read_only=True)
-    customer_details = UserSerializer(source='customer', read_only=True)
+    customer_details = serializers.SerializerMethodField(method_name='customer_placeholder')
+    
+    fragment_prefetch = ('images',)
+    customer_fields = ('customer_details',)
+    always_load = ('pk', 'updated_at', 'customer')
     
     class Meta:
         model = Job
@@ -85,6 +130,11 @@ class JobDetailSerializer(serializers.ModelSerializer):
             'status', 'deadline', 'created_at', 'updated_at',
             'customer_details', 'images'
         ]
+        list_serializer_class = FragmentListSerializer
+    
+    def attach_customer(self, data, summary):
+        if 'customer_details' in data:
+            data['customer_details'] = summary
 
 
 class JobCreateSerializer(serializers.ModelSerializer):
@@ -127,3 +177,44 @@ class JobCreateSerializer(serializers.ModelSerializer):
             JobImage.objects.create(job=job, image_url=url)
         
         return job
+    
+    def update(self, instance, validated_data):
+        """
+        Save only the submitted fields; a full-row save would write the status
+        loaded with the job back over a concurrent status transition
+        """
+        validated_data.pop('image_urls', None)
+        for field, value in validated_data.items():
+            setattr(instance, field, value)
+        instance.save(update_fields=[*validated_data, 'updated_at'])
+        return instance
+
+
+class SavedSearchSerializer(serializers.ModelSerializer):
+    """Serializer for a worker's saved job search"""
+    
+    class Meta:
+        model = SavedSearch
+        fields = [
+            'id', 'name', 'latitude', 'longitude', 'radius_km',
+            'job_type', 'min_budget', 'skills', 'is_active',
+            'created_at', 'updated_at'
+        ]
+        read_only_fields = ['id', 'created_at', 'updated_at']
+    
+    def validate_job_type(self, value):
+        """Only the job type the user's role can see; blank means that type"""
+        user = self.context['request'].user
+        job_type = 'WORKER_JOB' if user.role == 'WORKER' else 'CONSTRUCTOR_JOB'
+        if value and value != job_type:
+            raise serializers.ValidationError(
+                f"{user.get_role_display()}s can only save searches for {job_type}."
+            )
+        return job_type
+    
+    def validate_radius_km(self, value):
+        if value > MAX_SEARCH_RADIUS_KM:
+            raise serializers.ValidationError(
+                f"Radius cannot be more than {MAX_SEARCH_RADIUS_KM} km."
+            )
+        return value
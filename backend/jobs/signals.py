@@ -0,0 +1,150 @@
+"""
+Signal handlers for the jobs app
+Translates ORM writes into job_changed events and wires their consumers
+"""
+from django.db import transaction
+from django.utils import timezone
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from users import counters
+from users.models import AvailabilitySlot
+from .models import Job, JobImage, SavedSearch
+from . import badges, changes, events, fanout, feed_cache, percolator, realtime
+
+
+@receiver(post_save, sender=Job)
+def announce_job_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    
+    previous_status = getattr(instance, '_loaded_status', None)
+    if created:
+        action = events.CREATED
+    elif previous_status is not None and previous_status != instance.status:
+        action = events.STATUS_CHANGED
+    else:
+        action = events.UPDATED
+    
+    events.emit_job_changed(instance, action, previous_status)
+    instance._loaded_status = instance.status
+    instance._loaded_location = (instance.latitude, instance.longitude)
+
+
+@receiver(post_delete, sender=Job)
+def announce_job_delete(sender, instance, **kwargs):
+    events.emit_job_changed(instance, events.DELETED, instance.status)
+
+
+@receiver(events.job_changed)
+def percolate_open_job(sender, job, action, previous_status=None, **kwargs):
+    if not events.became_open(action, job, previous_status):
+        return
+    
+    def run():
+        matches = percolator.percolate(job)
+        if matches:
+            events.saved_search_matched.send(sender=sender, job=job, matches=matches)
+    
+    transaction.on_commit(run)
+
+
+@receiver(events.job_changed)
+def invalidate_feed_cache(sender, job, action, previous_status=None, **kwargs):
+    # Capture the state now; the instance may change again before commit
+    job_status = job.status
+    location = (job.latitude, job.longitude)
+    previous_location = getattr(job, '_loaded_location', None)
+    
+    # After commit, so a concurrent reader cannot re-cache the old rows
+    transaction.on_commit(lambda: feed_cache.invalidate_for_change(
+        job_status, location, previous_status, previous_location
+    ))
+
+
+@receiver(events.job_changed)
+def count_new_job(sender, job, action, previous_status=None, **kwargs):
+    if not badges.enabled() or not events.became_open(action, job, previous_status):
+        return
+    
+    location, job_type = (job.latitude, job.longitude), job.job_type
+    transaction.on_commit(lambda: badges.record_new_job(*location, job_type))
+
+
+@receiver(events.job_changed)
+def fan_out_open_job(sender, job, action, previous_status=None, **kwargs):
+    if not fanout.enabled() or job.status != 'OPEN' or action == events.DELETED:
+        return
+    
+    location = (job.latitude, job.longitude)
+    moved = getattr(job, '_loaded_location', location) != location
+    if not (events.became_open(action, job, previous_status) or moved):
+        return
+    
+    job_id, job_type = job.pk, job.job_type
+    transaction.on_commit(lambda: fanout.fan_out(job_id, job_type, *location))
+
+
+@receiver(events.job_changed)
+def count_completion(sender, job, action, previous_status=None, **kwargs):
+    if action != events.STATUS_CHANGED or job.status != 'COMPLETED' or previous_status == 'COMPLETED':
+        return
+    
+    # Providers booked for the job; write-behind counters are logged once
+    # the completion commits, inline ones are bumped in its transaction
+    providers = list(
+        AvailabilitySlot.objects.filter(job_id=job.pk, kind=AvailabilitySlot.Kind.BOOKED)
+        .order_by().values_list('worker_id', 'worker__role').distinct()
+    )
+    if counters.write_behind():
+        transaction.on_commit(lambda: [counters.record(user_id, role) for user_id, role in providers])
+    else:
+        for user_id, role in providers:
+            counters.record(user_id, role)
+
+
+@receiver(events.job_changed)
+def record_job_change(sender, job, action, previous_status=None, **kwargs):
+    # Same transaction as the write, so rolled back changes never show up
+    changes.record(job, action, previous_status, getattr(job, '_loaded_location', None))
+
+
+@receiver(events.job_changed)
+def push_job_event(sender, job, action, previous_status=None, **kwargs):
+    if not realtime.enabled():
+        return
+    
+    previous_location = getattr(job, '_loaded_location', None)
+    
+    def build():
+        return realtime.build_event(job, action, previous_status, previous_location)
+    
+    # A deleted instance loses its pk, so build that event now; others are
+    # built after commit to show the committed job
+    if action == events.DELETED:
+        event = build()
+        if event is not None:
+            transaction.on_commit(lambda: realtime.publish(event))
+        return
+    
+    def send():
+        event = build()
+        if event is not None:
+            realtime.publish(event)
+    
+    transaction.on_commit(send)
+
+
+@receiver(post_save, sender=SavedSearch)
+def index_saved_search(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    percolator.index_search(instance)
+
+
+@receiver(post_save, sender=JobImage)
+@receiver(post_delete, sender=JobImage)
+def touch_job_on_image_change(sender, instance, raw=False, **kwargs):
+    # Images are part of the job's cached fragments; move its version on
+    if raw:
+        return
+    Job.objects.filter(pk=instance.job_id).update(updated_at=timezone.now())
@@ -0,0 +1,125 @@
+"""
+Job view tests (python manage.py test --settings=config.test_settings)
+"""
+from datetime import timedelta
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.test import AsyncRequestFactory, TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from users.models import User, WorkerProfile
+from . import changes, feed_cache
+from .models import Job, JobChange
+from .views import JobStreamView
+
+
+class RecommendedJobsViewTests(APITestCase):
+    def setUp(self):
+        customer = User.objects.create_user(
+            'customer@example.com', 'Customer', role='CUSTOMER', latitude=19.0, longitude=72.8
+        )
+        self.worker = User.objects.create_user(
+            'worker@example.com', 'Worker', role='WORKER', latitude=19.05, longitude=72.85
+        )
+        WorkerProfile.objects.create(user=self.worker, skills='plumbing')
+        self.job = Job.objects.create(
+            customer=customer, title='Fix a leak', description='Kitchen sink',
+            job_type='WORKER_JOB', budget_min=500, budget_max=1000,
+            latitude=19.0, longitude=72.8, address='Mumbai',
+        )
+        self.client.force_authenticate(self.worker)
+
+    def test_weights_rank_jobs(self):
+        response = self.client.get(reverse('recommended-jobs'), {'w_distance': '2'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([job['id'] for job in response.json()['jobs']], [self.job.pk])
+
+    def test_non_finite_weights_are_rejected(self):
+        for value in ('nan', 'inf', '-inf', 'abc'):
+            with self.subTest(value=value):
+                response = self.client.get(reverse('recommended-jobs'), {'w_distance': value})
+                self.assertEqual(response.status_code, 400)
+
+    def test_huge_weights_are_capped(self):
+        response = self.client.get(reverse('recommended-jobs'), {'w_budget': '1e308', 'w_skills': '1e308'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([job['id'] for job in response.json()['jobs']], [self.job.pk])
+
+
+class JobListViewTests(APITestCase):
+    def setUp(self):
+        customer = User.objects.create_user(
+            'customer@example.com', 'Customer', role='CUSTOMER', latitude=19.0, longitude=72.8
+        )
+        self.worker = User.objects.create_user(
+            'worker@example.com', 'Worker', role='WORKER', latitude=19.05, longitude=72.85
+        )
+        self.job = Job.objects.create(
+            customer=customer, title='Fix a leak', description='Kitchen sink',
+            job_type='WORKER_JOB', budget_min=500, budget_max=1000,
+            latitude=19.0, longitude=72.8, address='Mumbai',
+        )
+        self.client.force_authenticate(self.worker)
+
+    def test_nearby_jobs_are_looked_up_once(self):
+        with mock.patch.object(feed_cache, 'nearby_job_ids', wraps=feed_cache.nearby_job_ids) as nearby:
+            response = self.client.get(reverse('job-list'))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('ETag', response)
+        self.assertEqual([job['id'] for job in response.data['results']], [self.job.pk])
+        self.assertEqual(nearby.call_count, 1)
+
+
+class JobStreamViewTests(TestCase):
+    def setUp(self):
+        self.worker = User.objects.create_user(
+            'worker@example.com', 'Worker', role='WORKER', latitude=19.05, longitude=72.85
+        )
+        patcher = mock.patch('jobs.views.stream_user', return_value=self.worker)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def stream(self, **params):
+        request = AsyncRequestFactory().get(reverse('job-stream'), params)
+        return async_to_sync(JobStreamView.as_view())(request)
+
+    def test_invalid_location_is_rejected(self):
+        for lat, lng in (('nan', '72.8'), ('19.0', 'inf'), ('-inf', '72.8'), ('91', '72.8'), ('19.0', '-181')):
+            with self.subTest(lat=lat, lng=lng):
+                self.assertEqual(self.stream(lat=lat, lng=lng).status_code, 400)
+
+    def test_missing_location_is_rejected(self):
+        self.worker.latitude = self.worker.longitude = None
+        self.assertEqual(self.stream().status_code, 400)
+
+
+class CurrentCursorTests(TestCase):
+    def log(self, seq, age_seconds=0):
+        change = JobChange.objects.create(
+            seq=seq, job_id=1, action='created', customer_id=1,
+            job_type='WORKER_JOB', status='OPEN', latitude=19.0, longitude=72.8,
+        )
+        JobChange.objects.filter(seq=seq).update(
+            created_at=timezone.now() - timedelta(seconds=age_seconds)
+        )
+        return change
+
+    def current(self):
+        return changes.decode_cursor(changes.current_cursor())
+
+    def test_cursor_is_the_head_once_settled(self):
+        self.log(1, age_seconds=60)
+        self.log(2)
+        self.assertEqual(self.current(), 2)
+
+    def test_cursor_stops_in_front_of_changes_in_flight(self):
+        self.log(1, age_seconds=60)
+        # seq 2 is taken by a transaction that has not committed yet
+        self.log(3)
+        self.assertEqual(self.current(), 1)
+
+    def test_cursor_of_an_empty_log(self):
+        self.assertEqual(self.current(), 0)
@@ -0,0 +1,96 @@
+"""
+Job status state machine
+A transition is a compare-and-set: the status is read, checked against
+TRANSITIONS, then written by one conditional
+UPDATE ... WHERE id IN (...) AND customer_id = ? AND status = <status read>
+touching only status and updated_at. A job whose status changed in between
+is not updated and reported as a conflict, so concurrent changes are never
+lost and a transition is always judged against the status it replaces.
+"""
+from collections import namedtuple
+
+from django.db import transaction
+from django.utils import timezone
+
+from . import events
+from .models import Job
+
+
+# Status -> statuses it may move to; COMPLETED is final
+TRANSITIONS = {
+    'OPEN': ('IN_PROGRESS', 'CANCELLED'),
+    'IN_PROGRESS': ('COMPLETED', 'CANCELLED', 'OPEN'),
+    'CANCELLED': ('OPEN',),
+    'EXPIRED': ('OPEN', 'CANCELLED'),
+    'COMPLETED': (),
+}
+
+# Error codes of failed transitions
+NOT_FOUND = 'not_found'
+FORBIDDEN = 'forbidden'
+INVALID = 'invalid_transition'
+CONFLICT = 'conflict'
+
+# job is the updated Job (None on failure); previous_status the status replaced
+TransitionResult = namedtuple('TransitionResult', ['job_id', 'job', 'previous_status', 'error'])
+
+
+def allowed(current, target):
+    return target in TRANSITIONS.get(current, ())
+
+
+def transition_many(customer, job_ids, target):
+    """
+    Move the customer's jobs to `target` in one transaction
+    Returns a TransitionResult per requested id, in request order; each job
+    succeeds or fails on its own
+    """
+    job_ids = list(dict.fromkeys(job_ids))
+    results = {}
+
+    with transaction.atomic():
+        current = {
+            row['id']: row for row in Job.objects.filter(pk__in=job_ids).values('id', 'customer_id', 'status')
+        }
+
+        by_status = {}
+        for job_id in job_ids:
+            row = current.get(job_id)
+            if row is None:
+                results[job_id] = TransitionResult(job_id, None, None, NOT_FOUND)
+            elif row['customer_id'] != customer.pk:
+                results[job_id] = TransitionResult(job_id, None, None, FORBIDDEN)
+            elif not allowed(row['status'], target):
+                results[job_id] = TransitionResult(job_id, None, row['status'], INVALID)
+            else:
+                by_status.setdefault(row['status'], []).append(job_id)
+
+        now = timezone.now()
+        for previous_status, ids in by_status.items():
+            # The compare-and-set: rows whose status moved on since the read
+            # do not match and are left untouched
+            Job.objects.filter(
+                pk__in=ids, customer_id=customer.pk, status=previous_status
+            ).update(status=target, updated_at=now)
+
+            updated = Job.objects.filter(pk__in=ids, status=target, updated_at=now)
+            for job in updated:
+                events.emit_job_changed(job, events.STATUS_CHANGED, previous_status)
+                results[job.pk] = TransitionResult(job.pk, job, previous_status, None)
+            for job_id in ids:
+                if job_id not in results:
+                    results[job_id] = TransitionResult(job_id, None, previous_status, CONFLICT)
+
+    return [results[job_id] for job_id in job_ids]
+
+
+def transition(customer, job_id, target, attempts=3):
+    """
+    Move one job to `target`, re-reading its status when a concurrent write
+    wins the compare-and-set; returns its TransitionResult
+    """
+    for _ in range(attempts):
+        result = transition_many(customer, [job_id], target)[0]
+        if result.error != CONFLICT:
+            return result
+    return result
@@ -1,17 +1,33 @@
 """
 URL configuration for jobs app
 """
+from django.conf import settings
 from django.urls import path
 from .views import (
-    JobCreateView, JobListView, JobDetailView,
-    MyJobsView, NearbyJobsView, JobStatusUpdateView
+    JobCreateView, JobListView, JobDetailView, AsyncJobListView, AsyncJobDetailView, AsyncNearbyJobsView,
+    MyJobsView, NearbyJobsView, JobChangesView, JobStreamView, JobBadgeView, RecommendedJobsView, JobStatusUpdateView,
+    JobBulkStatusUpdateView,
+    SavedSearchListCreateView, SavedSearchDetailView
 )
 
+# Async variants of the hot endpoints under ASGI
+if settings.ASYNC_VIEWS:
+    job_list, job_detail, nearby_jobs = AsyncJobListView, AsyncJobDetailView, AsyncNearbyJobsView
+else:
+    job_list, job_detail, nearby_jobs = JobListView, JobDetailView, NearbyJobsView
+
 urlpatterns = [
-    path('', JobListView.as_view(), name='job-list'),
+    path('', job_list.as_view(), name='job-list'),
     path('create/', JobCreateView.as_view(), name='job-create'),
     path('my-jobs/', MyJobsView.as_view(), name='my-jobs'),
-    path('nearby/', NearbyJobsView.as_view(), name='nearby-jobs'),
-    path('<int:pk>/', JobDetailView.as_view(), name='job-detail'),
+    path('nearby/', nearby_jobs.as_view(), name='nearby-jobs'),
+    path('changes/', JobChangesView.as_view(), name='job-changes'),
+    path('badge/', JobBadgeView.as_view(), name='job-badge'),
+    path('stream/', JobStreamView.as_view(), name='job-stream'),
+    path('for-you/', RecommendedJobsView.as_view(), name='recommended-jobs'),
+    path('status/', JobBulkStatusUpdateView.as_view(), name='job-bulk-status-update'),
+    path('saved-searches/', SavedSearchListCreateView.as_view(), name='saved-search-list'),
+    path('saved-searches/<int:pk>/', SavedSearchDetailView.as_view(), name='saved-search-detail'),
+    path('<int:pk>/', job_detail.as_view(), name='job-detail'),
     path('<int:pk>/status/', JobStatusUpdateView.as_view(), name='job-status-update'),
 ]
@@ -2,35 +2,40 @@
 Views for Job management
 Updated for simplified job system (no bidding)
 """
+import asyncio
+
 from rest_framework import generics, status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from rest_framework.exceptions import AuthenticationFailed
+from asgiref.sync import sync_to_async
 from django.db.models import Q
-from math import radians, cos, sin, asin, sqrt
-from .models import Job, JobImage
+from django.utils import timezone
+from django.core.handlers.asgi import ASGIRequest
+from django.http import Http404, JsonResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.views import View
+from common import aio, fieldsets
+from common.db import replicas
+from common.etags import ConditionalRequestMixin, ConditionalListMixin
+from common.geo import finite_float, valid_point
+from users.authentication import SupabaseAuthentication
+from users.models import User
+from .models import Job, JobImage, SavedSearch
+from . import badges, changes, facets, fanout, feed_cache, realtime, transitions
+from .fragments import FRAGMENT_VERSION
+from .ranking import JobRanker, DEFAULT_WEIGHTS
 from .serializers import (
     JobSerializer, JobListSerializer, 
-    JobDetailSerializer, JobCreateSerializer
+    JobDetailSerializer, JobCreateSerializer, SavedSearchSerializer
 )
 
 
-def calculate_distance(lat1, lon1, lat2, lon2):
-    """
-    Calculate distance between two coordinates in kilometers
-    Using Haversine formula
-    """
-    lat1, lon1, lat2, lon2 = map(float, [lat1, lon1, lat2, lon2])
-    lat1, lon1, lat2, lon2 = map(radians, [lat1, lon1, lat2, lon2])
-    
-    dlat = lat2 - lat1
-    dlon = lon2 - lon1
-    
-    a = sin(dlat/2)**2 + cos(lat1) * cos(lat2) * sin(dlon/2)**2
-    c = 2 * asin(sqrt(a))
-    km = 6371 * c  # Radius of earth in kilometers
-    
-    return km
+def parse_radius(value, default=50):
+    """Radius query param in km; the default when missing, malformed or not finite"""
+    radius_km = finite_float(value)
+    return default if radius_km is None else radius_km
 
 
 class JobCreateView(generics.CreateAPIView):
@@ -57,13 +62,19 @@ class JobCreateView(generics.CreateAPIView):
         }, status=status.HTTP_201_CREATED)
 
 
-class JobListView(generics.ListAPIView):
+class JobListView(ConditionalListMixin, generics.ListAPIView):
     """
     List all jobs with filtering
-    Query params: status, job_type, my_jobs, radius
+    Query params: status, job_type, my_jobs, radius, min_budget, max_budget,
+    deadline_after, deadline_before, posted_since, facets
+    Facet counts (job_type, status, budget bucket) for the filtered set are
+    returned alongside the page unless facets=false
+    Supports If-None-Match (304 when the filtered set is unchanged)
     """
     serializer_class = JobListSerializer
     permission_classes = [IsAuthenticated]
+    etag_version = FRAGMENT_VERSION
+    etag_related_stamps = ('customer__updated_at',)
     
     def get_queryset(self):
         queryset = Job.objects.all()
@@ -79,6 +90,9 @@ class JobListView(generics.ListAPIView):
         if job_type:
             queryset = queryset.filter(job_type=job_type.upper())
         
+        # Budget, deadline and posting-date filters
+        queryset = facets.apply_filters(queryset, self.request.query_params)
+        
         # Filter for customer's own jobs
         my_jobs = self.request.query_params.get('my_jobs')
         if my_jobs and user.role == 'CUSTOMER':
@@ -96,45 +110,89 @@ class JobListView(generics.ListAPIView):
             
             # Filter by location if user has coordinates
             if user.latitude and user.longitude:
-                radius_km = self.request.query_params.get('radius', 50)
-                try:
-                    radius_km = float(radius_km)
-                except ValueError:
-                    radius_km = 50
-                
-                # Filter nearby jobs
-                nearby_job_ids = []
-                for job in queryset:
-                    distance = calculate_distance(
-                        user.latitude, user.longitude,
-                        job.latitude, job.longitude
-                    )
-                    if distance <= radius_km:
-                        nearby_job_ids.append(job.id)
+                radius_km = parse_radius(self.request.query_params.get('radius', 50))
                 
-                queryset = queryset.filter(id__in=nearby_job_ids)
+                # Candidate ids come from the shared geocell feed cache
+                nearby = feed_cache.nearby_job_ids(
+                    user.latitude, user.longitude,
+                    'WORKER_JOB' if user.role == 'WORKER' else 'CONSTRUCTOR_JOB',
+                    radius_km, self.request.query_params
+                )
+                queryset = queryset.filter(id__in=[job_id for job_id, _ in nearby])
+        
+        # Only the columns the requested fields render
+        return self.get_serializer().narrow(queryset).order_by('-created_at')
+    
+    def wants_facets(self):
+        return self.request.query_params.get('facets', 'true').lower() != 'false'
+    
+    def render_page(self, queryset):
+        """Body of one page: results (plus count and links when paginated)"""
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(self.get_serializer(page, many=True).data).data
+        return {'results': self.get_serializer(queryset, many=True).data}
+    
+    def list(self, request, *args, **kwargs):
+        # Taken before the rows are read; clients pass it to changes/ later
+        cursor = changes.current_cursor()
+        queryset = self.filtered_queryset()
         
-        return queryset.order_by('-created_at')
+        data = self.render_page(queryset)
+        if self.wants_facets():
+            data['facets'] = facets.facet_counts(queryset)
+        
+        data['cursor'] = cursor
+        return Response(data)
 
 
-class JobDetailView(generics.RetrieveUpdateDestroyAPIView):
+class JobDetailView(ConditionalRequestMixin, generics.RetrieveUpdateDestroyAPIView):
     """
     Get, update, or delete a specific job
     Only job owner can update/delete
+    GET honours If-None-Match; PUT/PATCH/DELETE honour If-Match (412 when stale)
     """
     queryset = Job.objects.all()
     permission_classes = [IsAuthenticated]
+    etag_version = FRAGMENT_VERSION
     
     def get_serializer_class(self):
         if self.request.method in ['PUT', 'PATCH']:
             return JobCreateSerializer
         return JobDetailSerializer
     
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.request.method in ('GET', 'HEAD'):
+            queryset = self.get_serializer().narrow(queryset)
+        return queryset
+    
+    def get_etag_parts(self):
+        # The job and its embedded customer summary, by primary key only
+        versions = self.lock_for_write(Job.objects.filter(pk=self.kwargs['pk'])).values_list(
+            'updated_at', 'customer__updated_at'
+        ).first()
+        if versions is None:
+            return None
+        return (self.kwargs['pk'], *versions)
+    
+    def get_object(self):
+        try:
+            return super().get_object()
+        except Http404:
+            if self.request.method not in ('GET', 'HEAD'):
+                raise
+        # Closed jobs moved to the archive stay readable (read-only)
+        queryset = self.get_serializer().narrow(Job.objects.archived())
+        job = get_object_or_404(queryset, pk=self.kwargs['pk'])
+        self.check_object_permissions(self.request, job)
+        return job
+    
     def update(self, request, *args, **kwargs):
         job = self.get_object()
         
         # Only job owner can update
-        if job.customer != request.user:
+        if job.customer_id != request.user.pk:
             return Response({
                 'error': 'You do not have permission to update this job'
             }, status=status.HTTP_403_FORBIDDEN)
@@ -145,7 +203,7 @@ class JobDetailView(generics.RetrieveUpdateDestroyAPIView):
         job = self.get_object()
         
         # Only job owner can delete
-        if job.customer != request.user:
+        if job.customer_id != request.user.pk:
             return Response({
                 'error': 'You do not have permission to delete this job'
             }, status=status.HTTP_403_FORBIDDEN)
@@ -153,12 +211,15 @@ class JobDetailView(generics.RetrieveUpdateDestroyAPIView):
         return super().destroy(request, *args, **kwargs)
 
 
-class MyJobsView(generics.ListAPIView):
+class MyJobsView(ConditionalListMixin, generics.ListAPIView):
     """
     List jobs created by the current customer
+    ?archived=true lists the customer's archived (long-closed) jobs instead
+    Supports If-None-Match (304 when none of the jobs changed)
     """
     serializer_class = JobListSerializer
     permission_classes = [IsAuthenticated]
+    etag_version = FRAGMENT_VERSION
     
     def get_queryset(self):
         user = self.request.user
@@ -166,7 +227,11 @@ class MyJobsView(generics.ListAPIView):
         if user.role != 'CUSTOMER':
             return Job.objects.none()
         
-        return Job.objects.filter(customer=user).order_by('-created_at')
+        if self.request.query_params.get('archived', '').lower() in ('1', 'true'):
+            queryset = Job.objects.archived().filter(customer=user)
+        else:
+            queryset = Job.objects.filter(customer=user)
+        return self.get_serializer().narrow(queryset).order_by('-created_at')
 
 
 class NearbyJobsView(APIView):
@@ -192,33 +257,19 @@ class NearbyJobsView(APIView):
                 'message': 'Please update your location in profile to see nearby jobs'
             }, status=status.HTTP_200_OK)
         
-        radius_km = request.query_params.get('radius', 50)
-        try:
-            radius_km = float(radius_km)
-        except ValueError:
-            radius_km = 50
-        
-        # Get open jobs based on user role
-        jobs = Job.objects.filter(status='OPEN')
-        if user.role == 'WORKER':
-            jobs = jobs.filter(job_type='WORKER_JOB')
-        elif user.role == 'CONSTRUCTOR':
-            jobs = jobs.filter(job_type='CONSTRUCTOR_JOB')
-        
-        # Calculate distances and filter
-        nearby_jobs = []
-        for job in jobs:
-            distance = calculate_distance(
-                user.latitude, user.longitude,
-                job.latitude, job.longitude
-            )
-            if distance <= radius_km:
-                job_data = JobListSerializer(job).data
-                job_data['distance_km'] = round(distance, 2)
-                nearby_jobs.append(job_data)
-        
-        # Sort by distance
-        nearby_jobs.sort(key=lambda x: x['distance_km'])
+        radius_km = parse_radius(request.query_params.get('radius', 50))
+        
+        # Open jobs of the user's type within the radius, nearest first;
+        # the user's materialized feed when they are active
+        context = {'request': request}
+        queryset = JobListSerializer(context=context).narrow(Job.objects.all())
+        found = fanout.nearby_jobs(user, radius_km, queryset)
+        
+        # Rendered together so cached fragments come back in one multi-get
+        nearby_jobs = JobListSerializer([job for job, _ in found], many=True, context=context).data
+        if fieldsets.wants(request, 'distance_km'):
+            for job_data, (_, distance) in zip(nearby_jobs, found):
+                job_data['distance_km'] = distance
         
         return Response({
             'count': len(nearby_jobs),
@@ -226,38 +277,443 @@ class NearbyJobsView(APIView):
         })
 
 
-class JobStatusUpdateView(APIView):
+class JobChangesView(APIView):
     """
-    Update job status
-    Only job owner can update
+    Jobs created, updated or removed since a cursor (delta sync)
+    Query params: since (cursor from the job list or a previous call),
+    limit, radius, my_jobs; scoped like the job list for the user's role
+    Removed entries ({"id", "deleted": true}) cover deleted jobs and jobs
+    that left the caller's scope. Without since only the cursor is returned.
+    410 means the cursor is too old and the list must be fetched again.
     """
     permission_classes = [IsAuthenticated]
     
-    def patch(self, request, pk):
+    def get(self, request):
+        since = request.query_params.get('since')
+        if not since:
+            return Response({
+                'changes': [],
+                'cursor': changes.current_cursor(),
+                'has_more': False
+            })
+        
         try:
-            job = Job.objects.get(pk=pk)
-        except Job.DoesNotExist:
+            since = changes.decode_cursor(since)
+        except ValueError:
             return Response({
-                'error': 'Job not found'
-            }, status=status.HTTP_404_NOT_FOUND)
+                'error': 'Invalid cursor'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        radius_km = parse_radius(request.query_params.get('radius', 50))
+        
+        try:
+            limit = int(request.query_params.get('limit', changes.DEFAULT_LIMIT))
+        except ValueError:
+            limit = changes.DEFAULT_LIMIT
+        limit = max(1, min(limit, changes.MAX_LIMIT))
+        
+        scope = changes.FeedScope(
+            request.user, radius_km,
+            my_jobs=bool(request.query_params.get('my_jobs'))
+        )
         
-        # Only job owner can update status
-        if job.customer != request.user:
+        try:
+            batch = changes.changes_since(scope, since, limit)
+        except changes.CursorExpired:
             return Response({
-                'error': 'You do not have permission to update this job'
+                'error': 'Cursor has expired, reload the job list'
+            }, status=status.HTTP_410_GONE)
+        
+        live = [job for _, job in batch.changes if job is not None]
+        rendered = iter(JobListSerializer(live, many=True).data)
+        
+        return Response({
+            'changes': [
+                {'id': job_id, 'deleted': False, 'job': next(rendered)} if job is not None
+                else {'id': job_id, 'deleted': True}
+                for job_id, job in batch.changes
+            ],
+            'cursor': batch.cursor,
+            'has_more': batch.has_more
+        })
+
+
+class JobBadgeView(APIView):
+    """
+    Count of new jobs near the user since they last looked (app badge)
+    GET: {count, since}; query params: radius (max 100), since (overrides
+    the stored last look)
+    POST: mark nearby jobs as seen now
+    Served from per-geocell counters; no job rows are read
+    """
+    permission_classes = [IsAuthenticated]
+    
+    def get(self, request):
+        user = request.user
+        
+        if user.role not in ['WORKER', 'CONSTRUCTOR']:
+            return Response({
+                'error': 'This endpoint is only for workers and constructors'
             }, status=status.HTTP_403_FORBIDDEN)
         
-        new_status = request.data.get('status')
+        if not user.latitude or not user.longitude:
+            return Response({'count': 0, 'since': None})
+        
+        radius_km = min(parse_radius(request.query_params.get('radius', 50)), badges.MAX_RADIUS_KM)
         
-        if new_status not in ['OPEN', 'IN_PROGRESS', 'COMPLETED', 'CANCELLED']:
+        try:
+            since = facets.parse_moment(request.query_params.get('since') or '')
+        except ValueError:
             return Response({
-                'error': 'Invalid status. Must be OPEN, IN_PROGRESS, COMPLETED, or CANCELLED'
+                'since': ['Enter a valid date or datetime.']
             }, status=status.HTTP_400_BAD_REQUEST)
+        baseline = None
+        if since is None:
+            since = user.jobs_seen_at
+            baseline = badges.seen_baseline(user.pk)
+        since = badges.clamp_since(since)
         
-        job.status = new_status
-        job.save()
+        count = badges.count_new_jobs(
+            user.latitude, user.longitude, radius_km, self.job_type(user),
+            since, baseline=baseline
+        )
+        return Response({'count': count, 'since': since})
+    
+    def post(self, request):
+        user = request.user
+        seen_at = timezone.now()
+        # update() keeps updated_at (and ETags built on it) unchanged
+        User.objects.filter(pk=user.pk).update(jobs_seen_at=seen_at)
+        if user.role in ['WORKER', 'CONSTRUCTOR'] and user.latitude and user.longitude:
+            badges.mark_seen(user.pk, user.latitude, user.longitude, self.job_type(user), seen_at)
+        return Response({'count': 0, 'since': seen_at})
+    
+    def job_type(self, user):
+        return 'WORKER_JOB' if user.role == 'WORKER' else 'CONSTRUCTOR_JOB'
+
+
+def stream_user(request):
+    """
+    Authenticate a stream request; EventSource cannot send headers, so the
+    token may also come as ?token=
+    """
+    token = request.GET.get('token')
+    if token and 'HTTP_AUTHORIZATION' not in request.META:
+        request.META['HTTP_AUTHORIZATION'] = f'Bearer {token}'
+    try:
+        result = SupabaseAuthentication().authenticate(request)
+    except AuthenticationFailed:
+        return None
+    return result[0] if result else None
+
+
+class JobStreamView(View):
+    """
+    Server-sent events of new, edited and closed jobs near the worker
+    Async view: serve it through ASGI (config.asgi) to hold many streams
+    Query params: token, radius (max 100), lat, lng (default: profile location)
+    Events: job (new, reopened or edited OPEN job), status (left OPEN),
+    removed (deleted or moved away), resync (client fell behind; use changes/)
+    501 under WSGI, which buffers the whole stream and would hold a worker
+    """
+    
+    async def get(self, request):
+        if not isinstance(request, ASGIRequest):
+            return JsonResponse({
+                'error': 'Job streams need the ASGI server; poll changes/ instead'
+            }, status=status.HTTP_501_NOT_IMPLEMENTED)
+        
+        user = await sync_to_async(stream_user)(request)
+        if user is None:
+            return JsonResponse({
+                'error': 'Authentication credentials were not provided'
+            }, status=status.HTTP_401_UNAUTHORIZED)
+        
+        if user.role not in ['WORKER', 'CONSTRUCTOR']:
+            return JsonResponse({
+                'error': 'This endpoint is only for workers and constructors'
+            }, status=status.HTTP_403_FORBIDDEN)
+        
+        lat = finite_float(request.GET.get('lat') or user.latitude)
+        lng = finite_float(request.GET.get('lng') or user.longitude)
+        if not valid_point(lat, lng):
+            return JsonResponse({
+                'error': 'Please update your location in profile or pass lat and lng'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        radius_km = parse_radius(request.GET.get('radius', 50))
+        
+        if realtime.hub.full():
+            return JsonResponse({
+                'error': 'Too many open streams, try again later'
+            }, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        
+        subscription = realtime.Subscription(
+            user.pk,
+            'WORKER_JOB' if user.role == 'WORKER' else 'CONSTRUCTOR_JOB',
+            lat, lng, radius_km
+        )
+        
+        response = StreamingHttpResponse(
+            realtime.stream(subscription), content_type='text/event-stream'
+        )
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+
+class RecommendedJobsView(APIView):
+    """
+    Personalized "for you" job feed for workers and constructors
+    Query params: radius, limit, w_<factor> to override a ranking weight
+    (factors: distance, budget, skills, deadline, recency)
+    """
+    permission_classes = [IsAuthenticated]
+    MAX_LIMIT = 100
+    MAX_WEIGHT = 10.0
+    
+    def get(self, request):
+        user = request.user
+        
+        if user.role not in ['WORKER', 'CONSTRUCTOR']:
+            return Response({
+                'error': 'This endpoint is only for workers and constructors'
+            }, status=status.HTTP_403_FORBIDDEN)
+        
+        if not user.latitude or not user.longitude:
+            return Response({
+                'results': [],
+                'message': 'Please update your location in profile to see recommended jobs'
+            }, status=status.HTTP_200_OK)
+        
+        radius_km = parse_radius(request.query_params.get('radius', 50))
+        
+        try:
+            limit = min(int(request.query_params.get('limit', 20)), self.MAX_LIMIT)
+        except ValueError:
+            limit = 20
+        
+        weights = {}
+        for name in DEFAULT_WEIGHTS:
+            value = request.query_params.get(f'w_{name}')
+            if value is None:
+                continue
+            weight = finite_float(value)
+            if weight is None:
+                return Response({
+                    'error': f'Invalid weight for {name}'
+                }, status=status.HTTP_400_BAD_REQUEST)
+            weights[name] = min(max(weight, 0.0), self.MAX_WEIGHT)
+        
+        ranked = JobRanker(user, radius_km=radius_km, weights=weights).rank(limit=max(limit, 1))
+        
+        jobs_by_id = Job.objects.in_bulk(
+            [job_id for job_id, _, _ in ranked]
+        )
+        
+        found = [
+            (jobs_by_id[job_id], score, distance)
+            for job_id, score, distance in ranked if job_id in jobs_by_id
+        ]
+        recommended = JobListSerializer([job for job, _, _ in found], many=True).data
+        for job_data, (_, score, distance) in zip(recommended, found):
+            job_data['distance_km'] = distance
+            job_data['score'] = score
+        
+        return Response({
+            'count': len(recommended),
+            'jobs': recommended
+        })
+
+
+def transition_error(result, target):
+    """Message and HTTP status for a failed transition"""
+    if result.error == transitions.NOT_FOUND:
+        return 'Job not found', status.HTTP_404_NOT_FOUND
+    if result.error == transitions.FORBIDDEN:
+        return 'You do not have permission to update this job', status.HTTP_403_FORBIDDEN
+    if result.error == transitions.INVALID:
+        return f'Cannot change status from {result.previous_status} to {target}', status.HTTP_409_CONFLICT
+    return 'Job status changed concurrently, please retry', status.HTTP_409_CONFLICT
+
+
+def read_target_status(request):
+    """Requested status, or an error Response"""
+    if not isinstance(request.data, dict):
+        return None, Response({
+            'error': 'Request body must be an object'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    new_status = request.data.get('status')
+    if new_status not in transitions.TRANSITIONS:
+        return None, Response({
+            'error': f'Invalid status. Must be one of {", ".join(transitions.TRANSITIONS)}'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    return new_status, None
+
+
+class JobStatusUpdateView(APIView):
+    """
+    Update job status
+    Only job owner can update; only transitions in jobs.transitions are
+    allowed (409 otherwise), applied as a compare-and-set
+    """
+    permission_classes = [IsAuthenticated]
+    
+    def patch(self, request, pk):
+        new_status, error = read_target_status(request)
+        if error is not None:
+            return error
+        
+        result = transitions.transition(request.user, pk, new_status)
+        if result.error:
+            message, code = transition_error(result, new_status)
+            data = {'error': message}
+            if result.error == transitions.INVALID:
+                data['allowed'] = list(transitions.TRANSITIONS.get(result.previous_status, ()))
+            return Response(data, status=code)
         
         return Response({
             'message': 'Job status updated successfully',
-            'job': JobDetailSerializer(job).data
+            'job': JobDetailSerializer(result.job).data
+        })
+
+
+class JobBulkStatusUpdateView(APIView):
+    """
+    Move many of the customer's jobs to one status
+    Body: {"ids": [...], "status": "..."}; each job succeeds or fails on its
+    own and gets a result entry
+    """
+    permission_classes = [IsAuthenticated]
+    
+    MAX_JOBS = 100
+    MAX_JOB_ID = 2 ** 63 - 1
+    
+    def patch(self, request):
+        new_status, error = read_target_status(request)
+        if error is not None:
+            return error
+        
+        ids = request.data.get('ids')
+        if not isinstance(ids, list) or not ids:
+            return Response({
+                'error': 'ids must be a non-empty list of job ids'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        if len(ids) > self.MAX_JOBS:
+            return Response({
+                'error': f'At most {self.MAX_JOBS} jobs per request'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            ids = [int(job_id) for job_id in ids]
+        except (TypeError, ValueError):
+            ids = None
+        # Job ids are bigints; larger values cannot be looked up at all
+        if ids is None or not all(0 < job_id <= self.MAX_JOB_ID for job_id in ids):
+            return Response({
+                'error': 'ids must be a non-empty list of job ids'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        results = []
+        for result in transitions.transition_many(request.user, ids, new_status):
+            entry = {'id': result.job_id, 'previous_status': result.previous_status}
+            if result.error:
+                entry.update(updated=False, code=result.error, error=transition_error(result, new_status)[0])
+            else:
+                entry.update(updated=True, status=new_status)
+            results.append(entry)
+        
+        return Response({
+            'updated': sum(1 for entry in results if entry['updated']),
+            'results': results
         })
+
+
+class SavedSearchListCreateView(generics.ListCreateAPIView):
+    """
+    List or create the current user's saved searches
+    New and reopened jobs are matched against them on write
+    """
+    serializer_class = SavedSearchSerializer
+    permission_classes = [IsAuthenticated]
+    
+    def get_queryset(self):
+        return SavedSearch.objects.filter(user=self.request.user)
+    
+    def create(self, request, *args, **kwargs):
+        if request.user.role not in ['WORKER', 'CONSTRUCTOR']:
+            return Response({
+                'error': 'Only workers and constructors can save searches'
+            }, status=status.HTTP_403_FORBIDDEN)
+        
+        return super().create(request, *args, **kwargs)
+    
+    def perform_create(self, serializer):
+        user = self.request.user
+        # The serializer limits a given job_type to the role's; this covers
+        # searches that leave it out
+        job_type = 'WORKER_JOB' if user.role == 'WORKER' else 'CONSTRUCTOR_JOB'
+        serializer.save(user=user, job_type=job_type)
+
+
+class SavedSearchDetailView(generics.RetrieveUpdateDestroyAPIView):
+    """
+    Get, update, or delete one of the current user's saved searches
+    """
+    serializer_class = SavedSearchSerializer
+    permission_classes = [IsAuthenticated]
+    
+    def get_queryset(self):
+        return SavedSearch.objects.filter(user=self.request.user)
+
+
+class AsyncJobListView(aio.AsyncAPIView):
+    """
+    JobListView for ASGI: the ETag and cursor, then the page and facet
+    counts, are read concurrently
+    """
+    api_view = JobListView
+    
+    async def respond(self, view, request, *args, **kwargs):
+        # Decided once so every concurrent read uses the same database
+        await aio.run(replicas.read_alias)
+        
+        etag, cursor = await asyncio.gather(aio.run(view.get_etag), aio.run(changes.current_cursor))
+        if self.fresh(request, etag):
+            return self.not_modified(etag)
+        
+        queryset = await aio.run(view.filtered_queryset)
+        reads = [aio.run(view.render_page, queryset)]
+        if view.wants_facets():
+            reads.append(aio.run(facets.facet_counts, queryset))
+        data, *counts = await asyncio.gather(*reads)
+        
+        if counts:
+            data['facets'] = counts[0]
+        data['cursor'] = cursor
+        return self.with_etag(Response(data), etag)
+
+
+class AsyncJobDetailView(aio.AsyncAPIView):
+    """
+    JobDetailView for ASGI; without If-None-Match the version and the job
+    are read concurrently
+    """
+    api_view = JobDetailView
+    
+    def read(self, view, request, *args, **kwargs):
+        return Response(view.get_serializer(view.get_object()).data)
+    
+    async def respond(self, view, request, *args, **kwargs):
+        if request.headers.get('If-None-Match'):
+            return await super().respond(view, request, *args, **kwargs)
+        
+        await aio.run(replicas.read_alias)
+        etag, response = await asyncio.gather(
+            aio.run(view.get_etag), aio.run(self.read, view, request, *args, **kwargs)
+        )
+        return self.with_etag(response, etag)
+
+
+class AsyncNearbyJobsView(aio.AsyncAPIView):
+    """NearbyJobsView for ASGI"""
+    api_view = NearbyJobsView
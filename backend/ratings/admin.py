@@ -0,0 +1,14 @@
+from django.contrib import admin
+from .models import Rating
+
+
+@admin.register(Rating)
+class RatingAdmin(admin.ModelAdmin):
+    list_display = ('ratee', 'rater', 'job', 'stars', 'created_at')
+    list_filter = ('stars',)
+    search_fields = ('ratee__name', 'rater__name', 'review')
+    # Ratings are never edited; the aggregates only follow creates and deletes
+    readonly_fields = ('job', 'rater', 'ratee', 'stars', 'created_at')
+    
+    def has_add_permission(self, request):
+        return False
@@ -0,0 +1,117 @@
+"""
+Running rating aggregate of providers
+User.rating_sum and User.rating_count are adjusted by one relative
+UPDATE per rating created or deleted, and User.rating is recomputed from them
+in the same statement, so no AVG over all ratings is ever needed and
+concurrent ratings of one provider cannot lose each other's update.
+
+User.rating is a Bayesian average: the provider's ratings plus
+RATING_PRIOR_WEIGHT imaginary ratings of RATING_PRIOR_MEAN, so a single
+5-star rating does not outrank a long record of 4.8s. A weight of 0 gives
+the plain mean. Providers without ratings stay at 0.
+"""
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, Count, DecimalField, F, FloatField, OuterRef, Subquery, Sum, Value, When
+from django.db.models.functions import Cast
+from django.utils import timezone
+
+from users import summary_cache
+from users.models import ProviderDirectory, User
+from .models import Rating
+
+
+def _prior():
+    weight = float(getattr(settings, 'RATING_PRIOR_WEIGHT', 5))
+    mean = float(getattr(settings, 'RATING_PRIOR_MEAN', 3.5))
+    return weight, mean
+
+
+def score(rating_sum, rating_count):
+    """The rating shown for a provider with these totals"""
+    if rating_count <= 0:
+        return 0
+    weight, mean = _prior()
+    return round((weight * mean + rating_sum) / (weight + rating_count), 2)
+
+
+def _score_expression(sum_delta, count_delta):
+    """score() of the row's totals after the change, as SQL over the old values"""
+    weight, mean = _prior()
+    new_sum = Cast(F('rating_sum') + sum_delta, FloatField())
+    new_count = Cast(F('rating_count') + count_delta, FloatField())
+    return Case(
+        When(rating_count__lte=-count_delta, then=Value(0.0)),
+        default=(new_sum + weight * mean) / (new_count + weight),
+        output_field=DecimalField(max_digits=3, decimal_places=2),
+    )
+
+
+def sync_directory(*user_ids):
+    """Copy the users' rating to their directory rows and drop their summaries"""
+    ProviderDirectory.objects.filter(user_id__in=user_ids).update(
+        rating=Subquery(User.objects.filter(pk=OuterRef('user_id')).values('rating')[:1])
+    )
+    summary_cache.invalidate(*user_ids)
+    transaction.on_commit(lambda: summary_cache.invalidate(*user_ids))
+
+
+def _adjust(user_id, sum_delta, count_delta):
+    with transaction.atomic():
+        User.objects.filter(pk=user_id).update(
+            rating=_score_expression(sum_delta, count_delta),
+            rating_sum=F('rating_sum') + sum_delta,
+            rating_count=F('rating_count') + count_delta,
+            # User representations are versioned by updated_at
+            updated_at=timezone.now(),
+        )
+        sync_directory(user_id)
+
+
+def add(rating):
+    """Fold a new rating into its provider's aggregate"""
+    _adjust(rating.ratee_id, rating.stars, 1)
+
+
+def retract(rating):
+    """Take a deleted rating out of its provider's aggregate"""
+    _adjust(rating.ratee_id, -rating.stars, -1)
+
+
+def recompute(batch_size=1000):
+    """
+    Rebuild every user's aggregate from the ratings table, in primary-key
+    batches; returns the number of users corrected
+    """
+    corrected = 0
+    last_pk = 0
+    while True:
+        users = list(
+            User.objects.filter(pk__gt=last_pk).order_by('pk')
+            .only('pk', 'rating', 'rating_sum', 'rating_count')[:batch_size]
+        )
+        if not users:
+            return corrected
+        last_pk = users[-1].pk
+        
+        totals = {
+            row['ratee']: (row['total'], row['count'])
+            for row in Rating.objects.filter(ratee__in=users).order_by().values('ratee').annotate(
+                total=Sum('stars'), count=Count('pk')
+            )
+        }
+        
+        stale = []
+        for user in users:
+            rating_sum, rating_count = totals.get(user.pk, (0, 0))
+            rating = score(rating_sum, rating_count)
+            if (user.rating_sum, user.rating_count, float(user.rating)) != (rating_sum, rating_count, rating):
+                user.rating_sum, user.rating_count, user.rating = rating_sum, rating_count, rating
+                stale.append(user)
+        if not stale:
+            continue
+        
+        with transaction.atomic():
+            User.objects.bulk_update(stale, ['rating_sum', 'rating_count', 'rating'])
+            sync_directory(*[user.pk for user in stale])
+        corrected += len(stale)
@@ -0,0 +1,16 @@
+"""
+Rebuild every user's rating aggregate from the ratings table (repairs)
+"""
+from django.core.management.base import BaseCommand
+from ratings import aggregate
+
+
+class Command(BaseCommand):
+    help = 'Recompute rating_sum, rating_count and rating for all users from their ratings'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Users per batch')
+    
+    def handle(self, *args, **options):
+        corrected = aggregate.recompute(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Ratings recomputed: {corrected} users corrected'))
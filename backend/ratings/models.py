@@ -0,0 +1,49 @@
+"""
+Rating models for Mistribazar
+Customers rate the providers booked for their completed jobs
+"""
+from django.db import models
+from django.core.validators import MinValueValidator, MaxValueValidator
+from users.models import User
+
+
+class Rating(models.Model):
+    """
+    1-5 star rating (with optional review) of a provider for a completed job
+    One per job and provider; ratings are not edited, and the provider's
+    running aggregate follows creates and deletes (see ratings.aggregate)
+    """
+    
+    job = models.ForeignKey('jobs.Job', on_delete=models.CASCADE, related_name='ratings')
+    rater = models.ForeignKey(User, on_delete=models.CASCADE, related_name='ratings_given')
+    ratee = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='ratings_received',
+        # Served by rating_ratee_created_idx, which leads with ratee
+        db_index=False
+    )
+    
+    stars = models.PositiveSmallIntegerField(validators=[MinValueValidator(1), MaxValueValidator(5)])
+    review = models.TextField(blank=True)
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'ratings'
+        ordering = ['-created_at']
+        indexes = [
+            # A provider's ratings, newest first
+            models.Index(fields=['ratee', '-created_at'], name='rating_ratee_created_idx'),
+            models.Index(fields=['-created_at'], name='rating_created_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['job', 'ratee'], name='rating_once_per_job'),
+            models.CheckConstraint(
+                check=models.Q(stars__gte=1, stars__lte=5),
+                name='rating_stars_range'
+            ),
+        ]
+    
+    def __str__(self):
+        return f"{self.stars}* for {self.ratee.name} on {self.job_id}"
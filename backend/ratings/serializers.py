@@ -0,0 +1,38 @@
+"""
+Serializers for ratings
+"""
+from rest_framework import serializers
+from users.models import AvailabilitySlot
+from .models import Rating
+
+
+class RatingSerializer(serializers.ModelSerializer):
+    """Rating with the names of both sides"""
+    
+    rater_name = serializers.CharField(source='rater.name', read_only=True)
+    ratee_name = serializers.CharField(source='ratee.name', read_only=True)
+    
+    class Meta:
+        model = Rating
+        fields = ['id', 'job', 'rater', 'rater_name', 'ratee', 'ratee_name', 'stars', 'review', 'created_at']
+        read_only_fields = ['id', 'rater', 'created_at']
+    
+    def validate(self, attrs):
+        """Only the job's customer rates, only completed jobs, only booked providers, once"""
+        job, ratee = attrs['job'], attrs['ratee']
+        request = self.context['request']
+        
+        if job.customer_id != request.user.pk:
+            raise serializers.ValidationError({"job": "You can only rate providers on your own jobs."})
+        if job.status != 'COMPLETED':
+            raise serializers.ValidationError({"job": "Only completed jobs can be rated."})
+        
+        booked = AvailabilitySlot.objects.filter(
+            job=job, worker=ratee, kind=AvailabilitySlot.Kind.BOOKED
+        ).exists()
+        if not booked:
+            raise serializers.ValidationError({"ratee": "This provider was not booked for the job."})
+        
+        if Rating.objects.filter(job=job, ratee=ratee).exists():
+            raise serializers.ValidationError({"job": "You already rated this provider for this job."})
+        return attrs
@@ -0,0 +1,20 @@
+"""
+Signal handlers for the ratings app
+Keep each provider's running rating aggregate in step with their ratings
+"""
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import Rating
+from . import aggregate
+
+
+@receiver(post_save, sender=Rating)
+def add_to_aggregate(sender, instance, created, raw=False, **kwargs):
+    if raw or not created:
+        return
+    aggregate.add(instance)
+
+
+@receiver(post_delete, sender=Rating)
+def retract_from_aggregate(sender, instance, **kwargs):
+    aggregate.retract(instance)
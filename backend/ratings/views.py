@@ -0,0 +1,67 @@
+"""
+Views for ratings
+"""
+from django.db import IntegrityError, transaction
+from rest_framework import generics, status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from .models import Rating
+from .serializers import RatingSerializer
+
+
+class RatingListView(generics.ListAPIView):
+    """
+    List ratings, newest first
+    """
+    serializer_class = RatingSerializer
+    permission_classes = [IsAuthenticated]
+    queryset = Rating.objects.select_related('rater', 'ratee')
+
+
+class RatingCreateView(generics.CreateAPIView):
+    """
+    Rate a provider booked for one of your completed jobs (Customer only)
+    The provider's rating is updated incrementally (see ratings.aggregate)
+    """
+    serializer_class = RatingSerializer
+    permission_classes = [IsAuthenticated]
+    
+    def create(self, request, *args, **kwargs):
+        if request.user.role != 'CUSTOMER':
+            return Response({
+                'error': 'Only customers can rate providers'
+            }, status=status.HTTP_403_FORBIDDEN)
+        
+        try:
+            with transaction.atomic():
+                return super().create(request, *args, **kwargs)
+        except IntegrityError:
+            # A concurrent request rated the same provider for the job
+            return Response({
+                'error': 'You already rated this provider for this job'
+            }, status=status.HTTP_400_BAD_REQUEST)
+    
+    def perform_create(self, serializer):
+        serializer.save(rater=self.request.user)
+
+
+class RatingDetailView(generics.RetrieveAPIView):
+    """
+    Get a single rating
+    """
+    serializer_class = RatingSerializer
+    permission_classes = [IsAuthenticated]
+    queryset = Rating.objects.select_related('rater', 'ratee')
+
+
+class UserRatingsView(generics.ListAPIView):
+    """
+    Ratings a user received, newest first
+    """
+    serializer_class = RatingSerializer
+    permission_classes = [IsAuthenticated]
+    
+    def get_queryset(self):
+        return Rating.objects.filter(
+            ratee_id=self.kwargs['user_id']
+        ).select_related('rater', 'ratee').order_by('-created_at')
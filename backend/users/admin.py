@@ -1,6 +1,6 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
-from .models import User, WorkerProfile, TraderProfile, ConstructorProfile
+from .models import User, WorkerProfile, TraderProfile, ConstructorProfile, ProviderDirectory, AvailabilitySlot
 
 
 @admin.register(User)
@@ -50,3 +50,18 @@ class ConstructorProfileAdmin(admin.ModelAdmin):
     list_filter = ('is_verified', 'is_available')
     search_fields = ('user__name', 'company_name', 'specializations')
     readonly_fields = ('completed_projects',)
+
+
+@admin.register(ProviderDirectory)
+class ProviderDirectoryAdmin(admin.ModelAdmin):
+    list_display = ('user', 'role', 'is_available', 'cell', 'rating', 'updated_at')
+    list_filter = ('role', 'is_available', 'is_verified')
+    search_fields = ('name', 'skills', 'cell')
+    readonly_fields = [f.name for f in ProviderDirectory._meta.fields]
+
+
+@admin.register(AvailabilitySlot)
+class AvailabilitySlotAdmin(admin.ModelAdmin):
+    list_display = ('worker', 'kind', 'start_date', 'end_date', 'booked_by', 'job')
+    list_filter = ('kind', 'start_date')
+    search_fields = ('worker__name', 'booked_by__name', 'note')
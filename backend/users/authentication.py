@@ -2,19 +2,31 @@
 Supabase JWT Authentication for Django REST Framework
 Verifies Supabase JWT tokens and links to Django users
 """
+import logging
+from decimal import Decimal, InvalidOperation
+
 from rest_framework import authentication, exceptions
 from django.conf import settings
 import jwt
 import requests
+from common import aio
 from users.models import User
 
 
+logger = logging.getLogger(__name__)
+
+# User.latitude/longitude decimal places
+COORDINATE_PLACES = Decimal('0.000001')
+
+
 class SupabaseAuthentication(authentication.BaseAuthentication):
     """
     Custom authentication class for Supabase JWT tokens
+    authenticate_async() serves the async views without holding a thread
+    while the token is checked
     """
     
-    def authenticate(self, request):
+    def get_token(self, request):
         # Try both META (WSGI standard) and headers (DRF/ASGI)
         auth_header = request.META.get('HTTP_AUTHORIZATION') or request.headers.get('Authorization')
         
@@ -30,76 +42,120 @@ class SupabaseAuthentication(authentication.BaseAuthentication):
         
         token = auth_header.split(' ')[1]
         print(f"DEBUG: Token found: {token[:10]}...")
+        return token
+    
+    def decode(self, token):
+        """Verified claims of a Supabase JWT"""
+        decoded = jwt.decode(
+            token,
+            settings.SUPABASE_JWT_SECRET,
+            algorithms=['HS256'],
+            audience='authenticated'
+        )
+        
+        if not decoded.get('sub'):
+            raise exceptions.AuthenticationFailed('Invalid token: missing user ID')
+        
+        if not decoded.get('email'):
+            raise exceptions.AuthenticationFailed('Invalid token: missing email')
+        
+        return decoded
+    
+    def apply_metadata(self, user, decoded):
+        """Copy changed Supabase details onto the user; returns the changed fields"""
+        email = decoded.get('email')
+        user_metadata = decoded.get('user_metadata', {})
+        changed = []
+        
+        if email and user.email != email:
+            user.email = email
+            changed.append('email')
+        
+        # Update fields from metadata if they exist and are different
+        for field in ['phone', 'role', 'name', 'latitude', 'longitude']:
+            value = user_metadata.get(field)
+            if value and field in ('latitude', 'longitude'):
+                # Metadata holds floats; compare as the stored decimal
+                value = self.coordinate(value)
+            if value and getattr(user, field) != value:
+                setattr(user, field, value)
+                changed.append(field)
+        
+        return changed
+    
+    def coordinate(self, value):
+        """A metadata coordinate rounded like User.latitude/longitude; None if invalid"""
+        try:
+            value = Decimal(str(value))
+            return value.quantize(COORDINATE_PLACES) if value.is_finite() else None
+        except InvalidOperation:
+            return None
+    
+    def get_user(self, decoded):
+        """Django user linked to the token's Supabase user, kept in sync"""
+        email = decoded.get('email')
+        user_metadata = decoded.get('user_metadata', {})
+        
+        # Get or create Django user linked to Supabase user
+        user, created = User.objects.get_or_create(
+            supabase_id=decoded['sub'],
+            defaults={
+                'email': email,
+                'name': user_metadata.get('name', email.split('@')[0]),
+                'phone': user_metadata.get('phone'),
+                'role': user_metadata.get('role', 'CUSTOMER'),
+                'latitude': user_metadata.get('latitude'),
+                'longitude': user_metadata.get('longitude'),
+            }
+        )
+        
+        # Update user details if they changed in Supabase metadata
+        changed = self.apply_metadata(user, decoded)
+        if changed:
+            # post_save drops the cached user summary
+            user.save(update_fields=changed + ['updated_at'])
+        
+        return user
+    
+    def authenticate(self, request):
+        token = self.get_token(request)
+        if token is None:
+            return None
         
         try:
             # Decode and verify the Supabase JWT token
-            decoded = jwt.decode(
-                token,
-                settings.SUPABASE_JWT_SECRET,
-                algorithms=['HS256'],
-                audience='authenticated'
-            )
-            
-            supabase_user_id = decoded.get('sub')
-            email = decoded.get('email')
-            user_metadata = decoded.get('user_metadata', {})
-            
-            if not supabase_user_id:
-                raise exceptions.AuthenticationFailed('Invalid token: missing user ID')
-            
-            if not email:
-                raise exceptions.AuthenticationFailed('Invalid token: missing email')
-            
-            # Get or create Django user linked to Supabase user
-            user, created = User.objects.get_or_create(
-                supabase_id=supabase_user_id,
-                defaults={
-                    'email': email,
-                    'name': user_metadata.get('name', email.split('@')[0]),
-                    'phone': user_metadata.get('phone'),
-                    'role': user_metadata.get('role', 'CUSTOMER'),
-                    'latitude': user_metadata.get('latitude'),
-                    'longitude': user_metadata.get('longitude'),
-                }
-            )
-            
-            # Update user details if they changed in Supabase metadata
-            should_save = False
-            
-            if email and user.email != email:
-                user.email = email
-                should_save = True
-                
-            # Update fields from metadata if they exist and are different
-            if user_metadata.get('phone') and user.phone != user_metadata.get('phone'):
-                user.phone = user_metadata.get('phone')
-                should_save = True
-                
-            if user_metadata.get('role') and user.role != user_metadata.get('role'):
-                user.role = user_metadata.get('role')
-                should_save = True
-                
-            if user_metadata.get('name') and user.name != user_metadata.get('name'):
-                user.name = user_metadata.get('name')
-                should_save = True
-                
-            if user_metadata.get('latitude') and user.latitude != user_metadata.get('latitude'):
-                user.latitude = user_metadata.get('latitude')
-                should_save = True
-                
-            if user_metadata.get('longitude') and user.longitude != user_metadata.get('longitude'):
-                user.longitude = user_metadata.get('longitude')
-                should_save = True
-                
-            if should_save:
-                user.save()
+            return (self.get_user(self.decode(token)), token)
+        
+        except jwt.ExpiredSignatureError:
+            raise exceptions.AuthenticationFailed('Token has expired')
+        except jwt.InvalidTokenError as e:
+            raise exceptions.AuthenticationFailed(f'Invalid token: {str(e)}')
+        except Exception as e:
+            print(f"DEBUG: Auth Exception: {str(e)}")
+            raise exceptions.AuthenticationFailed(f'Authentication failed: {str(e)}')
+    
+    async def authenticate_async(self, request):
+        token = self.get_token(request)
+        if token is None:
+            return None
+        
+        try:
+            decoded = self.decode(token)
             
+            # Known users with unchanged details take one async lookup
+            user = await User.objects.filter(supabase_id=decoded['sub']).afirst()
+            if user is None:
+                user = await aio.run(self.get_user, decoded)
+            else:
+                changed = self.apply_metadata(user, decoded)
+                if changed:
+                    await aio.run(user.save, update_fields=changed + ['updated_at'])
             return (user, token)
-            
+        
         except jwt.ExpiredSignatureError:
             raise exceptions.AuthenticationFailed('Token has expired')
         except jwt.InvalidTokenError as e:
             raise exceptions.AuthenticationFailed(f'Invalid token: {str(e)}')
         except Exception as e:
-            print(f"DEBUG: Auth Exception: {str(e)}")
+            logger.exception('Async authentication failed')
             raise exceptions.AuthenticationFailed(f'Authentication failed: {str(e)}')
@@ -0,0 +1,141 @@
+"""
+Worker availability calendar
+Interval logic for publishing availability, booking workers and finding
+workers who are free over a date range
+"""
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+
+from common.geo import area_cells, bounding_box
+from .models import User, AvailabilitySlot, ProviderDirectory
+
+
+# Searches wider than this are clamped; past MAX_AREA_CELLS covering cells
+# the bounding box alone narrows the search
+MAX_RADIUS_KM = 100
+MAX_AREA_CELLS = 400
+
+
+class BookingConflict(Exception):
+    """Raised when a booking overlaps an existing booking"""
+
+    def __init__(self, conflicts):
+        self.conflicts = conflicts
+        super().__init__('Worker is already booked for part of this period')
+
+
+def _lock_calendar(worker):
+    """Serialize calendar edits for a worker by locking their user row"""
+    User.objects.select_for_update().only('pk').get(pk=worker.pk)
+
+
+def overlapping(queryset, start_date, end_date):
+    """
+    Slots intersecting [start_date, end_date]
+    Two closed intervals overlap when each starts before the other ends
+    """
+    return queryset.filter(start_date__lte=end_date, end_date__gte=start_date)
+
+
+def add_availability(worker, start_date, end_date, note=''):
+    """
+    Publish an AVAILABLE interval, merging it with any overlapping or
+    adjacent AVAILABLE intervals so the calendar stays a set of disjoint ranges
+    """
+    with transaction.atomic():
+        _lock_calendar(worker)
+
+        slots = AvailabilitySlot.objects.filter(worker=worker, kind=AvailabilitySlot.Kind.AVAILABLE)
+        touching = list(overlapping(
+            slots, start_date - timedelta(days=1), end_date + timedelta(days=1)
+        ))
+
+        if touching:
+            start_date = min([start_date] + [s.start_date for s in touching])
+            end_date = max([end_date] + [s.end_date for s in touching])
+            AvailabilitySlot.objects.filter(pk__in=[s.pk for s in touching]).delete()
+
+        return AvailabilitySlot.objects.create(
+            worker=worker,
+            kind=AvailabilitySlot.Kind.AVAILABLE,
+            start_date=start_date,
+            end_date=end_date,
+            note=note,
+        )
+
+
+def find_conflicts(worker, start_date, end_date):
+    """BOOKED slots of the worker that overlap the requested range"""
+    return overlapping(
+        AvailabilitySlot.objects.filter(worker=worker, kind=AvailabilitySlot.Kind.BOOKED),
+        start_date, end_date
+    )
+
+
+def book(worker, start_date, end_date, booked_by=None, job=None, note=''):
+    """
+    Book a worker for a date range
+    The worker row is locked for the duration of the check-and-insert so two
+    concurrent bookings cannot both pass the overlap check
+    Raises BookingConflict listing the overlapping bookings
+    """
+    with transaction.atomic():
+        _lock_calendar(worker)
+
+        conflicts = list(find_conflicts(worker, start_date, end_date))
+        if conflicts:
+            raise BookingConflict(conflicts)
+
+        return AvailabilitySlot.objects.create(
+            worker=worker,
+            kind=AvailabilitySlot.Kind.BOOKED,
+            start_date=start_date,
+            end_date=end_date,
+            booked_by=booked_by,
+            job=job,
+            note=note,
+        )
+
+
+def available_workers(start_date, end_date, lat=None, lng=None, radius_km=None, skills=None):
+    """
+    Directory entries of available workers who are free for the whole range
+
+    Candidates come from the provider directory (role, availability, area
+    and skills), then two correlated EXISTS checks on the slot indexes keep
+    workers with an AVAILABLE slot covering the range and no overlapping
+    BOOKED slot. Nothing is evaluated in Python.
+    """
+    entries = ProviderDirectory.objects.filter(role=User.Role.WORKER, is_available=True)
+
+    if radius_km is not None and lat is not None and lng is not None:
+        radius_km = min(radius_km, MAX_RADIUS_KM)
+        min_lat, max_lat, min_lng, max_lng = bounding_box(lat, lng, radius_km)
+        entries = entries.filter(
+            latitude__range=(min_lat, max_lat),
+            longitude__range=(min_lng, max_lng),
+        )
+        cells = area_cells(lat, lng, radius_km, MAX_AREA_CELLS)
+        if cells is not None:
+            entries = entries.filter(cell__in=cells)
+
+    for skill in skills or []:
+        entries = entries.filter(skills__icontains=skill.strip().lower())
+
+    covering = AvailabilitySlot.objects.filter(
+        worker=OuterRef('user_id'),
+        kind=AvailabilitySlot.Kind.AVAILABLE,
+        start_date__lte=start_date,
+        end_date__gte=end_date,
+    )
+    booked = overlapping(
+        AvailabilitySlot.objects.filter(
+            worker=OuterRef('user_id'),
+            kind=AvailabilitySlot.Kind.BOOKED,
+        ),
+        start_date, end_date
+    )
+
+    return entries.filter(Exists(covering), ~Exists(booked)).order_by('-rating', 'user_id')
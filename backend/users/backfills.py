@@ -0,0 +1,17 @@
+"""
+Backfills of derived user data (run with `python manage.py backfill`)
+"""
+from jobs.backfill import Backfill, register
+from . import directory
+
+
+@register
+class ProviderDirectoryRows(Backfill):
+    name = 'provider_directory'
+    description = 'Rewrite provider directory rows (geocells, normalized skills, profile fields)'
+    
+    def queryset(self):
+        return directory.providers()
+    
+    def process(self, rows):
+        directory.write_entries(rows)
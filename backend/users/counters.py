@@ -0,0 +1,214 @@
+"""
+Write-behind completion counters
+completed_jobs / completed_projects / completed_orders are not bumped on the
+profile row at completion time; a busy provider's row would become a lock
+hot spot. record() appends the increment to a log in the shared cache
+(one atomic incr for the sequence number, one key per entry) and flush()
+periodically folds the log into batched UPDATE ... SET n = n + delta
+statements, one per role and delta. The log only works in a cache every
+process shares (settings.COMPLETION_COUNTERS_WRITE_BEHIND, on with
+REDIS_URL); otherwise record() applies the increment inline.
+
+The cache is not durable: entries can be evicted, and a flush interrupted
+between its commit and advancing the log position applies those entries
+again. reconcile() recomputes every counter from the source of truth
+(completed jobs the provider was booked for) and runs daily.
+"""
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import AvailabilitySlot, ConstructorProfile, TraderProfile, User, WorkerProfile
+from . import summary_cache
+
+
+KEY_PREFIX = 'ctrlog'
+SEQ_KEY = f'{KEY_PREFIX}:seq'
+FLUSHED_KEY = f'{KEY_PREFIX}:flushed'
+GAP_KEY = f'{KEY_PREFIX}:gap'
+LOCK_KEY = f'{KEY_PREFIX}:lock'
+
+# Entries outlive many missed flushes; anything older is left to reconcile()
+ENTRY_TIMEOUT = 86400
+LOCK_TIMEOUT = 300
+
+COUNTERS = {
+    User.Role.WORKER: (WorkerProfile, 'completed_jobs'),
+    User.Role.CONSTRUCTOR: (ConstructorProfile, 'completed_projects'),
+    User.Role.TRADER: (TraderProfile, 'completed_orders'),
+}
+
+
+def write_behind():
+    return getattr(settings, 'COMPLETION_COUNTERS_WRITE_BEHIND', False)
+
+
+def entry_key(seq):
+    return f'{KEY_PREFIX}:{seq}'
+
+
+def _next_seq():
+    cache.add(SEQ_KEY, 0, timeout=None)
+    try:
+        return cache.incr(SEQ_KEY)
+    except ValueError:
+        # Evicted between add and incr
+        cache.add(SEQ_KEY, 0, timeout=None)
+        return cache.incr(SEQ_KEY)
+
+
+def record(user_id, role, delta=1):
+    """
+    Log a counter change for a provider, applied by the next flush()
+    Without a shared cache the change is applied right away
+    """
+    if role not in COUNTERS or not delta:
+        return
+    if not write_behind():
+        _apply({(role, user_id): delta})
+        summary_cache.invalidate(user_id)
+        return
+    cache.set(entry_key(_next_seq()), (role, user_id, delta), timeout=ENTRY_TIMEOUT)
+
+
+def _locked():
+    return cache.add(LOCK_KEY, 1, timeout=LOCK_TIMEOUT)
+
+
+def _unlock():
+    cache.delete(LOCK_KEY)
+
+
+def _apply(totals):
+    """
+    One UPDATE per (role, delta) for {(role, user_id): delta}, and one
+    touching the users' updated_at, which versions their representations
+    """
+    grouped = defaultdict(list)
+    for (role, user_id), delta in totals.items():
+        if delta:
+            grouped[role, delta].append(user_id)
+    if not grouped:
+        return
+    
+    with transaction.atomic():
+        for (role, delta), user_ids in grouped.items():
+            model, field = COUNTERS[role]
+            model.objects.filter(user_id__in=user_ids).update(**{field: F(field) + delta})
+        User.objects.filter(
+            pk__in={user_id for user_ids in grouped.values() for user_id in user_ids}
+        ).update(updated_at=timezone.now())
+
+
+def _read_log(flushed, head):
+    """
+    Entries after `flushed`, up to the first one not written yet
+    An entry missing on two flushes in a row was lost and is skipped
+    Returns (entries, position the log is read up to)
+    """
+    seqs = range(flushed + 1, head + 1)
+    found = cache.get_many([entry_key(seq) for seq in seqs])
+    gap = cache.get(GAP_KEY)
+    
+    entries = []
+    for seq in seqs:
+        entry = found.get(entry_key(seq))
+        if entry is not None:
+            entries.append(entry)
+        elif seq != gap:
+            # Its sequence number is taken but the entry may still be on
+            # its way; stop here and look again next time
+            cache.set(GAP_KEY, seq, timeout=None)
+            return entries, seq - 1
+    return entries, head
+
+
+def flush(batch_size=5000):
+    """
+    Apply logged increments; returns the number of log entries applied
+    Only one flush runs at a time; a concurrent call returns 0
+    """
+    if not _locked():
+        return 0
+    try:
+        applied = 0
+        while True:
+            flushed = cache.get(FLUSHED_KEY, 0)
+            head = cache.get(SEQ_KEY, 0)
+            if head < flushed:
+                # The sequence was evicted and restarted
+                flushed = 0
+            head = min(head, flushed + batch_size)
+            if head <= flushed:
+                return applied
+            
+            entries, position = _read_log(flushed, head)
+            totals = defaultdict(int)
+            for role, user_id, delta in entries:
+                totals[role, user_id] += delta
+            if totals:
+                _apply(totals)
+                summary_cache.invalidate(*{user_id for _, user_id in totals})
+            
+            cache.set(FLUSHED_KEY, position, timeout=None)
+            cache.delete_many([entry_key(seq) for seq in range(flushed + 1, position + 1)])
+            applied += len(entries)
+            if position < head or position == flushed:
+                return applied
+    finally:
+        _unlock()
+
+
+def completed_counts():
+    """Source of truth: distinct completed jobs each provider was booked for"""
+    return AvailabilitySlot.objects.filter(
+        worker=OuterRef('user_id'),
+        kind=AvailabilitySlot.Kind.BOOKED,
+        job__status='COMPLETED',
+    ).order_by().values('worker').annotate(
+        completed=Count('job', distinct=True)
+    ).values('completed')
+
+
+def reconcile(batch_size=1000):
+    """
+    Recompute every counter from completed jobs; returns the rows corrected
+    Pending log entries are discarded, since the recomputed counts already
+    include them
+    """
+    if not _locked():
+        return 0
+    try:
+        cache.set(FLUSHED_KEY, cache.get(SEQ_KEY, 0), timeout=None)
+        
+        corrected = 0
+        for model, field in COUNTERS.values():
+            actual = Coalesce(Subquery(completed_counts(), output_field=IntegerField()), Value(0))
+            last_pk = 0
+            while True:
+                pks = list(
+                    model.objects.filter(pk__gt=last_pk).order_by('pk').values_list('pk', flat=True)[:batch_size]
+                )
+                if not pks:
+                    break
+                stale = model.objects.filter(pk__in=pks).annotate(actual=actual).exclude(**{field: F('actual')})
+                rows = list(stale.values_list('pk', 'user_id', 'actual'))
+                with transaction.atomic():
+                    for pk, _, count in rows:
+                        model.objects.filter(pk=pk).update(**{field: count})
+                    if rows:
+                        User.objects.filter(pk__in=[user_id for _, user_id, _ in rows]).update(
+                            updated_at=timezone.now()
+                        )
+                if rows:
+                    summary_cache.invalidate(*[user_id for _, user_id, _ in rows])
+                corrected += len(rows)
+                last_pk = pks[-1]
+        return corrected
+    finally:
+        _unlock()
@@ -0,0 +1,130 @@
+"""
+Provider directory maintenance
+Keeps the flattened ProviderDirectory table in step with User and profile rows
+"""
+from common.geo import geocell
+from .models import User, ProviderDirectory
+
+
+PROVIDER_ROLES = [User.Role.WORKER, User.Role.CONSTRUCTOR, User.Role.TRADER]
+
+PROFILE_RELATED = ['worker_profile', 'constructor_profile', 'trader_profile']
+
+
+def _get_profile(user):
+    """Return the role-specific profile for a provider, or None"""
+    related = {
+        User.Role.WORKER: 'worker_profile',
+        User.Role.CONSTRUCTOR: 'constructor_profile',
+        User.Role.TRADER: 'trader_profile',
+    }.get(user.role)
+    
+    if related is None:
+        return None
+    return getattr(user, related, None)
+
+
+def build_entry(user):
+    """Build an unsaved ProviderDirectory row for a provider user"""
+    profile = _get_profile(user)
+    
+    entry = ProviderDirectory(
+        user=user,
+        role=user.role,
+        name=user.name,
+        cell=geocell(user.latitude, user.longitude),
+        latitude=user.latitude,
+        longitude=user.longitude,
+        rating=user.rating,
+    )
+    
+    # Providers without a profile are listed but never as available
+    if profile is None:
+        return entry
+    
+    entry.is_available = profile.is_available
+    entry.is_verified = profile.is_verified
+    
+    if user.role == User.Role.WORKER:
+        entry.skills = profile.skills
+        entry.experience_years = profile.experience_years
+        entry.hourly_rate = profile.hourly_rate
+        entry.daily_rate = profile.daily_rate
+    elif user.role == User.Role.CONSTRUCTOR:
+        entry.skills = profile.specializations
+        entry.experience_years = profile.experience_years
+        entry.team_size = profile.team_size
+        entry.max_project_value = profile.max_project_value
+    elif user.role == User.Role.TRADER:
+        entry.skills = profile.materials
+        entry.delivery_radius_km = profile.delivery_radius_km
+    
+    entry.skills = ', '.join(
+        s.strip().lower() for s in (entry.skills or '').split(',') if s.strip()
+    )
+    return entry
+
+
+def sync_user(user):
+    """
+    Insert, update or remove the directory row for a single user
+    Customers (or users who switched away from a provider role) are removed
+    """
+    if user.role not in PROVIDER_ROLES or not user.is_active:
+        ProviderDirectory.objects.filter(user_id=user.pk).delete()
+        return None
+    
+    entry = build_entry(user)
+    entry.save()
+    return entry
+
+
+def mark_unavailable(user_id):
+    """Flag a provider whose profile was removed as unavailable"""
+    ProviderDirectory.objects.filter(user_id=user_id).update(
+        is_available=False, is_verified=False
+    )
+
+
+def providers():
+    """Provider users with their profiles, in primary-key order"""
+    return User.objects.filter(
+        role__in=PROVIDER_ROLES, is_active=True
+    ).select_related(*PROFILE_RELATED).order_by('pk')
+
+
+def write_entries(users):
+    """Insert or overwrite the directory rows of a batch of provider users"""
+    update_fields = [
+        f.name for f in ProviderDirectory._meta.concrete_fields
+        if not f.primary_key
+    ]
+    ProviderDirectory.objects.bulk_create(
+        [build_entry(user) for user in users],
+        update_conflicts=True,
+        unique_fields=['user'],
+        update_fields=update_fields,
+    )
+
+
+def rebuild(batch_size=500):
+    """
+    Rebuild the whole directory in primary-key batches
+    Returns the number of rows written
+    """
+    ProviderDirectory.objects.exclude(
+        user__role__in=PROVIDER_ROLES, user__is_active=True
+    ).delete()
+    
+    written = 0
+    last_pk = 0
+    while True:
+        batch = list(providers().filter(pk__gt=last_pk)[:batch_size])
+        if not batch:
+            break
+        
+        write_entries(batch)
+        written += len(batch)
+        last_pk = batch[-1].pk
+    
+    return written
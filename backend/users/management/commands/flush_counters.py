@@ -0,0 +1,27 @@
+"""
+Apply logged completion counter increments (run every minute); with
+--reconcile, recompute all counters from completed jobs (run daily)
+"""
+from django.core.management.base import BaseCommand
+from users import counters
+
+
+class Command(BaseCommand):
+    help = 'Flush write-behind completion counters to provider profiles'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000, help='Log entries read per round')
+        parser.add_argument('--reconcile', action='store_true', help='Recompute every counter from completed jobs')
+    
+    def handle(self, *args, **options):
+        if options['reconcile']:
+            corrected = counters.reconcile()
+            self.stdout.write(self.style.SUCCESS(f'Reconciled completion counters: {corrected} corrected'))
+            return
+        
+        if not counters.write_behind():
+            self.stdout.write('Completion counters are updated inline (no shared cache); nothing to flush')
+            return
+        
+        applied = counters.flush(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Applied {applied} counter increments'))
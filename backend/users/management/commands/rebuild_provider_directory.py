@@ -0,0 +1,16 @@
+"""
+Rebuild the denormalized provider directory from users and profiles
+"""
+from django.core.management.base import BaseCommand
+from users import directory
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the provider_directory table from users and their profiles'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+    
+    def handle(self, *args, **options):
+        written = directory.rebuild(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Provider directory rebuilt: {written} rows'))
@@ -0,0 +1,91 @@
+# Generated by Django 4.2.7 on 2026-10-19 00:23
+
+from django.conf import settings
+import django.core.validators
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_add_email_field'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ConstructorProfile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('company_name', models.CharField(blank=True, max_length=255)),
+                ('license_number', models.CharField(blank=True, max_length=100)),
+                ('specializations', models.TextField(help_text='Comma-separated specializations e.g., residential, commercial, renovation')),
+                ('experience_years', models.PositiveIntegerField(default=0)),
+                ('team_size', models.PositiveIntegerField(default=1, help_text='Number of workers in team')),
+                ('max_project_value', models.DecimalField(blank=True, decimal_places=2, help_text='Maximum project value they can handle', max_digits=12, null=True, validators=[django.core.validators.MinValueValidator(0)])),
+                ('completed_projects', models.PositiveIntegerField(default=0)),
+                ('is_verified', models.BooleanField(default=False)),
+                ('is_available', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'constructor_profiles',
+            },
+        ),
+        migrations.CreateModel(
+            name='WorkerProfile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('skills', models.TextField(help_text='Comma-separated skills e.g., plumbing, masonry, electrical, carpentry')),
+                ('hourly_rate', models.DecimalField(blank=True, decimal_places=2, help_text='Hourly rate in local currency', max_digits=10, null=True, validators=[django.core.validators.MinValueValidator(0)])),
+                ('daily_rate', models.DecimalField(blank=True, decimal_places=2, help_text='Daily rate in local currency', max_digits=10, null=True, validators=[django.core.validators.MinValueValidator(0)])),
+                ('experience_years', models.PositiveIntegerField(default=0)),
+                ('available_dates', models.TextField(blank=True, help_text='JSON or comma-separated available date ranges')),
+                ('completed_jobs', models.PositiveIntegerField(default=0)),
+                ('is_verified', models.BooleanField(default=False)),
+                ('is_available', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'worker_profiles',
+            },
+        ),
+        migrations.RemoveField(
+            model_name='masonprofile',
+            name='user',
+        ),
+        migrations.RenameIndex(
+            model_name='user',
+            new_name='users_email_4b85f2_idx',
+            old_name='users_email_idx',
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='supabase_id',
+            field=models.UUIDField(blank=True, help_text='User ID from Supabase Auth', null=True, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='user',
+            name='role',
+            field=models.CharField(choices=[('CUSTOMER', 'Customer'), ('CONSTRUCTOR', 'Constructor'), ('WORKER', 'Worker'), ('TRADER', 'Trader')], default='CUSTOMER', max_length=15),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['supabase_id'], name='users_supabas_d3ed4d_idx'),
+        ),
+        migrations.DeleteModel(
+            name='MasonProfile',
+        ),
+        migrations.AddField(
+            model_name='workerprofile',
+            name='user',
+            field=models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='worker_profile', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='constructorprofile',
+            name='user',
+            field=models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='constructor_profile', to=settings.AUTH_USER_MODEL),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 4.2.7 on 2026-10-19 00:26
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_sync_role_profiles'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProviderDirectory',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='directory_entry', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('role', models.CharField(choices=[('CUSTOMER', 'Customer'), ('CONSTRUCTOR', 'Constructor'), ('WORKER', 'Worker'), ('TRADER', 'Trader')], max_length=15)),
+                ('name', models.CharField(max_length=255)),
+                ('is_available', models.BooleanField(default=False)),
+                ('is_verified', models.BooleanField(default=False)),
+                ('cell', models.CharField(blank=True, max_length=32)),
+                ('latitude', models.DecimalField(blank=True, decimal_places=6, max_digits=9, null=True)),
+                ('longitude', models.DecimalField(blank=True, decimal_places=6, max_digits=9, null=True)),
+                ('rating', models.DecimalField(decimal_places=2, default=0.0, max_digits=3)),
+                ('skills', models.TextField(blank=True)),
+                ('experience_years', models.PositiveIntegerField(default=0)),
+                ('hourly_rate', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('daily_rate', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('team_size', models.PositiveIntegerField(blank=True, null=True)),
+                ('max_project_value', models.DecimalField(blank=True, decimal_places=2, max_digits=12, null=True)),
+                ('delivery_radius_km', models.PositiveIntegerField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'provider_directory',
+                'indexes': [models.Index(fields=['role', 'is_available', 'cell', '-rating'], include=('user', 'latitude', 'longitude'), name='provider_dir_area_idx'), models.Index(fields=['role', 'is_available', '-rating'], include=('user',), name='provider_dir_rating_idx')],
+            },
+        ),
+    ]
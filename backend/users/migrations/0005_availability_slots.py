@@ -0,0 +1,39 @@
+# Generated by Django 4.2.7 on 2026-10-19 00:27
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0003_sync_customer_job_types'),
+        ('users', '0004_provider_directory'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AvailabilitySlot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('AVAILABLE', 'Available'), ('BOOKED', 'Booked')], default='AVAILABLE', max_length=10)),
+                ('start_date', models.DateField()),
+                ('end_date', models.DateField()),
+                ('note', models.CharField(blank=True, max_length=255)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('booked_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='bookings_made', to=settings.AUTH_USER_MODEL)),
+                ('job', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='bookings', to='jobs.job')),
+                ('worker', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='availability_slots', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'availability_slots',
+                'ordering': ['start_date'],
+                'indexes': [models.Index(fields=['worker', 'kind', 'start_date', 'end_date'], name='availabilit_worker__04e675_idx'), models.Index(fields=['kind', 'start_date', 'end_date'], name='availabilit_kind_e33585_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='availabilityslot',
+            constraint=models.CheckConstraint(check=models.Q(('end_date__gte', models.F('start_date'))), name='availability_slot_valid_range'),
+        ),
+    ]
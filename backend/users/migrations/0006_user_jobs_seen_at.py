@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-19 00:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0005_availability_slots'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='jobs_seen_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.7 on 2026-10-19 00:58
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0006_user_jobs_seen_at'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='user',
+            name='users_phone_af6883_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='user',
+            name='users_latitud_0614c3_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='user',
+            name='users_email_4b85f2_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='user',
+            name='users_supabas_d3ed4d_idx',
+        ),
+    ]
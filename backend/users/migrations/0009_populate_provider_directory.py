@@ -0,0 +1,81 @@
+"""
+Fill the provider directory for providers that existed before it
+0004 created the table empty; rows are written the way directory.build_entry
+writes them, with the historical models
+"""
+from django.db import migrations
+
+from common.geo import geocell
+
+
+PROVIDER_ROLES = ['WORKER', 'CONSTRUCTOR', 'TRADER']
+BATCH_SIZE = 500
+
+
+def normalized(skills):
+    return ', '.join(s.strip().lower() for s in (skills or '').split(',') if s.strip())
+
+
+def build_entry(ProviderDirectory, user):
+    entry = ProviderDirectory(
+        user_id=user.pk,
+        role=user.role,
+        name=user.name,
+        cell=geocell(user.latitude, user.longitude),
+        latitude=user.latitude,
+        longitude=user.longitude,
+        rating=user.rating,
+    )
+    related = {
+        'WORKER': 'worker_profile',
+        'CONSTRUCTOR': 'constructor_profile',
+        'TRADER': 'trader_profile',
+    }[user.role]
+    profile = getattr(user, related, None)
+    if profile is None:
+        return entry
+
+    entry.is_available = profile.is_available
+    entry.is_verified = profile.is_verified
+    if user.role == 'WORKER':
+        entry.skills = normalized(profile.skills)
+        entry.experience_years = profile.experience_years
+        entry.hourly_rate = profile.hourly_rate
+        entry.daily_rate = profile.daily_rate
+    elif user.role == 'CONSTRUCTOR':
+        entry.skills = normalized(profile.specializations)
+        entry.experience_years = profile.experience_years
+        entry.team_size = profile.team_size
+        entry.max_project_value = profile.max_project_value
+    else:
+        entry.skills = normalized(profile.materials)
+        entry.delivery_radius_km = profile.delivery_radius_km
+    return entry
+
+
+def populate(apps, schema_editor):
+    User = apps.get_model('users', 'User')
+    ProviderDirectory = apps.get_model('users', 'ProviderDirectory')
+
+    users = User.objects.filter(
+        role__in=PROVIDER_ROLES, is_active=True, directory_entry__isnull=True
+    ).select_related('worker_profile', 'constructor_profile', 'trader_profile').order_by('pk')
+
+    last_pk = 0
+    while True:
+        batch = list(users.filter(pk__gt=last_pk)[:BATCH_SIZE])
+        if not batch:
+            break
+        ProviderDirectory.objects.bulk_create([build_entry(ProviderDirectory, user) for user in batch])
+        last_pk = batch[-1].pk
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0008_user_rating_aggregate'),
+    ]
+
+    operations = [
+        migrations.RunPython(populate, migrations.RunPython.noop),
+    ]
@@ -51,16 +51,23 @@ class User(AbstractBaseUser, PermissionsMixin):
     latitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
     longitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
     
-    # Rating (average rating from jobs)
+    # Rating (Bayesian average of received ratings)
     rating = models.DecimalField(
         max_digits=3, 
         decimal_places=2, 
         default=0.00,
         validators=[MinValueValidator(0), MaxValueValidator(5)]
     )
+    # Running totals of received ratings; rating is derived from them
+    # (see ratings.aggregate)
+    rating_sum = models.PositiveIntegerField(default=0)
+    rating_count = models.PositiveIntegerField(default=0)
     
     language = models.CharField(max_length=50, default='English')
     
+    # When the user last looked at nearby jobs (start of the "new jobs" badge)
+    jobs_seen_at = models.DateTimeField(null=True, blank=True)
+    
     # Auth fields
     is_active = models.BooleanField(default=True)
     is_staff = models.BooleanField(default=False)
@@ -74,12 +81,12 @@ class User(AbstractBaseUser, PermissionsMixin):
     
     class Meta:
         db_table = 'users'
+        # email, phone and supabase_id are indexed by their unique constraints;
+        # area searches go through ProviderDirectory
         indexes = [
-            models.Index(fields=['email']),
-            models.Index(fields=['phone']),
-            models.Index(fields=['supabase_id']),
             models.Index(fields=['role']),
-            models.Index(fields=['latitude', 'longitude']),
+            # Provider lists and available workers, best rated first
+            models.Index(fields=['-rating', 'id'], name='user_rating_idx'),
         ]
     
     def __str__(self):
@@ -223,3 +230,115 @@ class ConstructorProfile(models.Model):
     
     def __str__(self):
         return f"Constructor: {self.user.name}"
+
+
+class ProviderDirectory(models.Model):
+    """
+    Flattened, denormalized row per provider (worker, constructor, trader)
+    Maintained from User and profile writes (see users.signals) so directory
+    queries by role, availability, area and rating read a single table
+    """
+    
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='directory_entry'
+    )
+    
+    role = models.CharField(max_length=15, choices=User.Role.choices)
+    name = models.CharField(max_length=255)
+    is_available = models.BooleanField(default=False)
+    is_verified = models.BooleanField(default=False)
+    
+    # Location and geocell key (see common.geo.geocell)
+    cell = models.CharField(max_length=32, blank=True)
+    latitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
+    longitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
+    
+    rating = models.DecimalField(max_digits=3, decimal_places=2, default=0.00)
+    
+    # Key profile fields; skills holds skills, specializations or materials
+    skills = models.TextField(blank=True)
+    experience_years = models.PositiveIntegerField(default=0)
+    hourly_rate = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    daily_rate = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    team_size = models.PositiveIntegerField(null=True, blank=True)
+    max_project_value = models.DecimalField(max_digits=12, decimal_places=2, null=True, blank=True)
+    delivery_radius_km = models.PositiveIntegerField(null=True, blank=True)
+    
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'provider_directory'
+        indexes = [
+            # Covering indexes: filters, rating order and the returned user id
+            models.Index(
+                fields=['role', 'is_available', 'cell', '-rating'],
+                include=['user', 'latitude', 'longitude'],
+                name='provider_dir_area_idx'
+            ),
+            models.Index(
+                fields=['role', 'is_available', '-rating'],
+                include=['user'],
+                name='provider_dir_rating_idx'
+            ),
+        ]
+    
+    def __str__(self):
+        return f"Directory: {self.name} ({self.role})"
+
+
+class AvailabilitySlot(models.Model):
+    """
+    Date interval on a worker's calendar (inclusive on both ends)
+    AVAILABLE slots are published by the worker, BOOKED slots are created
+    by customers booking the worker and may never overlap each other
+    """
+    
+    class Kind(models.TextChoices):
+        AVAILABLE = 'AVAILABLE', 'Available'
+        BOOKED = 'BOOKED', 'Booked'
+    
+    worker = models.ForeignKey(User, on_delete=models.CASCADE, related_name='availability_slots')
+    kind = models.CharField(max_length=10, choices=Kind.choices, default=Kind.AVAILABLE)
+    start_date = models.DateField()
+    end_date = models.DateField()
+    
+    # Booking details (BOOKED slots only)
+    booked_by = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='bookings_made'
+    )
+    job = models.ForeignKey(
+        'jobs.Job',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='bookings'
+    )
+    note = models.CharField(max_length=255, blank=True)
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'availability_slots'
+        ordering = ['start_date']
+        indexes = [
+            # Per-worker overlap checks: worker + kind, then start <= end scan
+            models.Index(fields=['worker', 'kind', 'start_date', 'end_date']),
+            # Calendar-wide "who is free" range lookups
+            models.Index(fields=['kind', 'start_date', 'end_date']),
+        ]
+        constraints = [
+            models.CheckConstraint(
+                check=models.Q(end_date__gte=models.F('start_date')),
+                name='availability_slot_valid_range'
+            ),
+        ]
+    
+    def __str__(self):
+        return f"{self.kind}: {self.worker.name} {self.start_date} - {self.end_date}"
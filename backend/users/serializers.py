@@ -3,7 +3,8 @@ Serializers for User, WorkerProfile, TraderProfile, and ConstructorProfile
 Updated for Supabase authentication
 """
 from rest_framework import serializers
-from .models import User, WorkerProfile, TraderProfile, ConstructorProfile
+from common.fieldsets import SparseFieldsMixin
+from .models import User, WorkerProfile, TraderProfile, ConstructorProfile, AvailabilitySlot
 
 
 class WorkerProfileSerializer(serializers.ModelSerializer):
@@ -43,8 +44,8 @@ class ConstructorProfileSerializer(serializers.ModelSerializer):
         read_only_fields = ['completed_projects', 'is_verified']
 
 
-class UserSerializer(serializers.ModelSerializer):
-    """Serializer for User with nested profiles"""
+class UserSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    """Serializer for User with nested profiles (sparse fieldsets)"""
     
     worker_profile = WorkerProfileSerializer(required=False, read_only=True)
     trader_profile = TraderProfileSerializer(required=False, read_only=True)
@@ -54,10 +55,10 @@ class UserSerializer(serializers.ModelSerializer):
         model = User
         fields = [
             'id', 'supabase_id', 'name', 'email', 'phone', 'role', 
-            'latitude', 'longitude', 'rating', 'language', 
+            'latitude', 'longitude', 'rating', 'rating_count', 'language', 
             'created_at', 'worker_profile', 'trader_profile', 'constructor_profile'
         ]
-        read_only_fields = ['id', 'supabase_id', 'email', 'rating', 'created_at']
+        read_only_fields = ['id', 'supabase_id', 'email', 'rating', 'rating_count', 'created_at']
 
 
 class ProfileCompletionSerializer(serializers.Serializer):
@@ -160,3 +161,36 @@ class UserUpdateSerializer(serializers.ModelSerializer):
                 ConstructorProfile.objects.create(user=instance, **constructor_profile_data)
         
         return instance
+
+
+class AvailabilitySlotSerializer(serializers.ModelSerializer):
+    """Serializer for worker calendar slots"""
+    
+    class Meta:
+        model = AvailabilitySlot
+        fields = ['id', 'kind', 'start_date', 'end_date', 'job', 'booked_by', 'note', 'created_at']
+        read_only_fields = ['id', 'kind', 'job', 'booked_by', 'created_at']
+    
+    def validate(self, attrs):
+        """Validate date range"""
+        if attrs['start_date'] > attrs['end_date']:
+            raise serializers.ValidationError({
+                "end_date": "End date cannot be before start date."
+            })
+        return attrs
+
+
+class BookingSerializer(serializers.Serializer):
+    """Serializer for booking a worker over a date range"""
+    start_date = serializers.DateField()
+    end_date = serializers.DateField()
+    job = serializers.IntegerField(required=False, allow_null=True)
+    note = serializers.CharField(max_length=255, required=False, allow_blank=True, default='')
+    
+    def validate(self, attrs):
+        """Validate date range"""
+        if attrs['start_date'] > attrs['end_date']:
+            raise serializers.ValidationError({
+                "end_date": "End date cannot be before start date."
+            })
+        return attrs
@@ -0,0 +1,58 @@
+"""
+Signal handlers for the users app
+Keeps denormalized user data in sync with User and profile writes
+"""
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from django.utils import timezone
+from .models import User, WorkerProfile, TraderProfile, ConstructorProfile
+from . import directory, summary_cache
+
+
+def invalidate_summary(user_id):
+    # Again after commit, so a reader cannot re-cache pre-commit data
+    summary_cache.invalidate(user_id)
+    transaction.on_commit(lambda: summary_cache.invalidate(user_id))
+
+
+def touch_user(user_id):
+    """
+    Move a user's updated_at forward after a profile change
+    Profiles are embedded in user representations versioned by updated_at
+    """
+    User.objects.filter(pk=user_id).update(updated_at=timezone.now())
+    invalidate_summary(user_id)
+
+
+@receiver(post_save, sender=User)
+def sync_directory_on_user_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    invalidate_summary(instance.pk)
+    directory.sync_user(instance)
+
+
+@receiver(post_delete, sender=User)
+def drop_summary_on_user_delete(sender, instance, **kwargs):
+    invalidate_summary(instance.pk)
+
+
+@receiver(post_save, sender=WorkerProfile)
+@receiver(post_save, sender=TraderProfile)
+@receiver(post_save, sender=ConstructorProfile)
+def sync_directory_on_profile_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    touch_user(instance.user_id)
+    directory.sync_user(User.objects.get(pk=instance.user_id))
+
+
+@receiver(post_delete, sender=WorkerProfile)
+@receiver(post_delete, sender=TraderProfile)
+@receiver(post_delete, sender=ConstructorProfile)
+def sync_directory_on_profile_delete(sender, instance, **kwargs):
+    # Only update in place: during a user cascade delete the directory row
+    # is already gone and must not be re-created
+    touch_user(instance.user_id)
+    directory.mark_unavailable(instance.user_id)
@@ -0,0 +1,60 @@
+"""
+Shared user-summary cache
+Rendered UserSerializer payloads keyed by user id, fetched in batches with
+one multi-get. Entries are dropped whenever a user or one of their profiles
+changes (see users.signals), so readers never need to join users.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from common.db.replicas import use_primary
+from .models import User
+from .serializers import UserSerializer
+
+
+# Bump when UserSerializer output changes so old summaries are ignored
+SUMMARY_VERSION = 2
+
+
+def _timeout():
+    return getattr(settings, 'USER_SUMMARY_CACHE_TIMEOUT', 3600)
+
+
+def summary_key(user_id):
+    return f'usersum:{SUMMARY_VERSION}:{user_id}'
+
+
+def get_many(user_ids):
+    """
+    Return {user_id: summary} for the given ids
+    Misses are loaded in one query (profiles joined) and cached together;
+    ids of users that do not exist are left out
+    """
+    user_ids = {int(user_id) for user_id in user_ids if user_id is not None}
+    if not user_ids:
+        return {}
+    
+    keys = {summary_key(user_id): user_id for user_id in user_ids}
+    summaries = {keys[key]: value for key, value in cache.get_many(list(keys)).items()}
+    
+    missing = user_ids - summaries.keys()
+    if missing:
+        users = User.objects.filter(pk__in=missing).select_related(
+            'worker_profile', 'trader_profile', 'constructor_profile'
+        )
+        # Filled from the primary so an invalidation is never undone by a
+        # replica that has not seen the write yet
+        with use_primary():
+            fresh = {user.pk: dict(UserSerializer(user).data) for user in users}
+        cache.set_many({summary_key(user_id): data for user_id, data in fresh.items()}, timeout=_timeout())
+        summaries.update(fresh)
+    
+    return summaries
+
+
+def get(user_id):
+    """Summary for a single user, or None"""
+    return get_many([user_id]).get(int(user_id))
+
+
+def invalidate(*user_ids):
+    cache.delete_many([summary_key(user_id) for user_id in user_ids])
@@ -0,0 +1,85 @@
+"""
+User view tests (python manage.py test --settings=config.test_settings)
+"""
+from datetime import date
+
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from . import availability
+from .models import User, WorkerProfile
+
+
+class UserListViewTests(APITestCase):
+    def setUp(self):
+        self.customer = User.objects.create_user(
+            'customer@example.com', 'Customer', role='CUSTOMER', latitude=19.0, longitude=72.8
+        )
+        self.worker = User.objects.create_user(
+            'worker@example.com', 'Worker', role='WORKER', latitude=19.05, longitude=72.85
+        )
+        WorkerProfile.objects.create(user=self.worker, is_available=True)
+        self.client.force_authenticate(self.customer)
+
+    def list_ids(self, **params):
+        response = self.client.get(reverse('user-list'), params)
+        self.assertEqual(response.status_code, 200)
+        return [user['id'] for user in response.data['results']]
+
+    def test_radius_finds_nearby_providers(self):
+        self.assertEqual(self.list_ids(radius=20), [self.worker.pk])
+
+    def test_non_finite_radius_lists_nobody(self):
+        for radius in ('nan', 'inf', '-inf', 'abc'):
+            with self.subTest(radius=radius):
+                self.assertEqual(self.list_ids(radius=radius), [])
+
+    def test_non_finite_or_off_map_location_lists_nobody(self):
+        for lat, lng in (('nan', '72.8'), ('19.0', 'inf'), ('91', '72.8'), ('19.0', '-181')):
+            with self.subTest(lat=lat, lng=lng):
+                self.assertEqual(self.list_ids(radius=20, lat=lat, lng=lng), [])
+
+    def test_huge_radius_is_clamped(self):
+        self.assertEqual(self.list_ids(radius=20000), [self.worker.pk])
+        self.assertEqual(self.list_ids(radius='1e308'), [self.worker.pk])
+
+    def test_non_finite_min_rating_is_ignored(self):
+        for rating in ('nan', 'inf', 'abc'):
+            with self.subTest(rating=rating):
+                self.assertEqual(self.list_ids(min_rating=rating), [self.worker.pk])
+
+
+class AvailableWorkersViewTests(APITestCase):
+    def setUp(self):
+        self.customer = User.objects.create_user(
+            'customer@example.com', 'Customer', role='CUSTOMER', latitude=19.0, longitude=72.8
+        )
+        self.worker = User.objects.create_user(
+            'worker@example.com', 'Worker', role='WORKER', latitude=19.05, longitude=72.85
+        )
+        WorkerProfile.objects.create(user=self.worker, is_available=True)
+        availability.add_availability(self.worker, date(2026, 11, 1), date(2026, 11, 30))
+        self.client.force_authenticate(self.customer)
+
+    def available_ids(self, **params):
+        params.update(start='2026-11-10', end='2026-11-12')
+        response = self.client.get(reverse('available-workers'), params)
+        self.assertEqual(response.status_code, 200)
+        return [user['id'] for user in response.data['results']]
+
+    def test_radius_finds_nearby_workers(self):
+        self.assertEqual(self.available_ids(radius=20), [self.worker.pk])
+
+    def test_non_finite_radius_lists_nobody(self):
+        for radius in ('nan', 'inf', '-inf', 'abc'):
+            with self.subTest(radius=radius):
+                self.assertEqual(self.available_ids(radius=radius), [])
+
+    def test_non_finite_or_off_map_location_lists_nobody(self):
+        for lat, lng in (('nan', '72.8'), ('19.0', 'inf'), ('91', '72.8'), ('19.0', '-181')):
+            with self.subTest(lat=lat, lng=lng):
+                self.assertEqual(self.available_ids(radius=20, lat=lat, lng=lng), [])
+
+    def test_huge_radius_is_clamped(self):
+        self.assertEqual(self.available_ids(radius=20000), [self.worker.pk])
+        self.assertEqual(self.available_ids(radius='1e308'), [self.worker.pk])
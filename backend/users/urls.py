@@ -2,16 +2,22 @@
 URL configuration for users app
 Updated for Supabase authentication
 """
+from django.conf import settings
 from django.urls import path
 from .views import (
-    ProfileCompletionView, UserProfileView, UserDetailView, UserListView,
-    WorkerProfileUpdateView, TraderProfileUpdateView, ConstructorProfileUpdateView
+    ProfileCompletionView, UserProfileView, AsyncUserProfileView, UserDetailView, UserListView,
+    WorkerProfileUpdateView, TraderProfileUpdateView, ConstructorProfileUpdateView,
+    AvailabilityListCreateView, AvailabilitySlotDeleteView, WorkerBookingView,
+    AvailableWorkersView
 )
 
+# Async profile view under ASGI
+profile_view = AsyncUserProfileView if settings.ASYNC_VIEWS else UserProfileView
+
 urlpatterns = [
     # Profile management (after Supabase auth)
     path('complete-profile/', ProfileCompletionView.as_view(), name='complete-profile'),
-    path('profile/', UserProfileView.as_view(), name='user-profile'),
+    path('profile/', profile_view.as_view(), name='user-profile'),
     path('list/', UserListView.as_view(), name='user-list'),
     path('<int:pk>/', UserDetailView.as_view(), name='user-detail'),
     
@@ -19,4 +25,10 @@ urlpatterns = [
     path('worker-profile/', WorkerProfileUpdateView.as_view(), name='worker-profile'),
     path('trader-profile/', TraderProfileUpdateView.as_view(), name='trader-profile'),
     path('constructor-profile/', ConstructorProfileUpdateView.as_view(), name='constructor-profile'),
+    
+    # Worker availability calendar
+    path('availability/', AvailabilityListCreateView.as_view(), name='availability'),
+    path('availability/<int:pk>/', AvailabilitySlotDeleteView.as_view(), name='availability-slot'),
+    path('available-workers/', AvailableWorkersView.as_view(), name='available-workers'),
+    path('<int:pk>/book/', WorkerBookingView.as_view(), name='worker-book'),
 ]
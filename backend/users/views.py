@@ -3,15 +3,35 @@ User views for Supabase-authenticated API
 Handles profile management after Supabase authentication
 """
 from rest_framework import generics, status
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.views import APIView
-from .models import User, WorkerProfile, TraderProfile, ConstructorProfile
+from django.db.models import Q
+from django.utils.dateparse import parse_date
+from common import aio, fieldsets
+from common.etags import ConditionalRequestMixin
+from common.geo import area_cells, bounding_box, finite_float, valid_point
+from jobs.models import Job
+from .models import (
+    User, WorkerProfile, TraderProfile, ConstructorProfile,
+    ProviderDirectory, AvailabilitySlot
+)
 from .serializers import (
     UserSerializer, UserUpdateSerializer, 
     ProfileCompletionSerializer,
-    WorkerProfileSerializer, TraderProfileSerializer, ConstructorProfileSerializer
+    WorkerProfileSerializer, TraderProfileSerializer, ConstructorProfileSerializer,
+    AvailabilitySlotSerializer, BookingSerializer
 )
+from . import availability, summary_cache
+
+
+def query_date(params, name):
+    """Optional YYYY-MM-DD query param; 400 when it is not a real date"""
+    try:
+        return parse_date(params.get(name, '') or '')
+    except ValueError:
+        raise ValidationError({name: ['Enter a valid date.']})
 
 
 class ProfileCompletionView(APIView):
@@ -57,13 +77,14 @@ class ProfileCompletionView(APIView):
         }, status=status.HTTP_200_OK)
 
 
-class UserProfileView(generics.RetrieveUpdateAPIView):
+class UserProfileView(ConditionalRequestMixin, generics.RetrieveUpdateAPIView):
     """
     Get or update current user's profile
-    GET: Retrieve current user's profile
-    PUT/PATCH: Update current user's profile
+    GET: Retrieve current user's profile (If-None-Match -> 304)
+    PUT/PATCH: Update current user's profile (If-Match -> 412 when stale)
     """
     permission_classes = [IsAuthenticated]
+    etag_version = summary_cache.SUMMARY_VERSION
     
     def get_serializer_class(self):
         if self.request.method in ['PUT', 'PATCH']:
@@ -72,44 +93,104 @@ class UserProfileView(generics.RetrieveUpdateAPIView):
     
     def get_object(self):
         return self.request.user
+    
+    def get_etag_parts(self):
+        user = self.request.user
+        if self.request.method in ('GET', 'HEAD'):
+            # Profile writes touch updated_at, and auth already loaded the row
+            return (user.pk, user.updated_at)
+        updated_at = self.lock_for_write(User.objects.filter(pk=user.pk)).values_list(
+            'updated_at', flat=True
+        ).get()
+        return (user.pk, updated_at)
 
 
 class UserDetailView(generics.RetrieveAPIView):
     """
     Get details of any user by ID
     Public endpoint for viewing other users' profiles
+    Served from the shared user-summary cache
     """
     queryset = User.objects.all()
     serializer_class = UserSerializer
     permission_classes = [IsAuthenticated]
+    
+    def retrieve(self, request, *args, **kwargs):
+        summary = summary_cache.get(self.kwargs['pk'])
+        if summary is None:
+            return Response({
+                'error': 'User not found'
+            }, status=status.HTTP_404_NOT_FOUND)
+        # The cached summary is the full representation; select from it
+        return Response(fieldsets.trim(summary, request))
 
 
 class UserListView(generics.ListAPIView):
     """
     List users with optional filtering
-    Query params: role, is_available
+    Query params: role, is_available, min_rating, radius (+ optional lat, lng)
+    Provider filters are answered from the flattened ProviderDirectory table
     """
     serializer_class = UserSerializer
     permission_classes = [IsAuthenticated]
+    # Beyond this many geocells a plain bounding-box range is cheaper
+    MAX_AREA_CELLS = 400
+    MAX_RADIUS_KM = 100
     
     def get_queryset(self):
-        queryset = User.objects.all()
+        params = self.request.query_params
+        # Profiles are joined only when their fields are requested
+        queryset = self.get_serializer().narrow(User.objects.all(), select_related=(
+            'worker_profile', 'trader_profile', 'constructor_profile'
+        ))
+        
+        role = params.get('role')
+        is_available = params.get('is_available')
+        min_rating = params.get('min_rating')
+        radius = params.get('radius')
+        
+        if not (is_available == 'true' or min_rating or radius):
+            if role:
+                queryset = queryset.filter(role=role.upper())
+            return queryset.order_by('id')
+        
+        entries = ProviderDirectory.objects.all()
         
         # Filter by role
-        role = self.request.query_params.get('role')
         if role:
-            queryset = queryset.filter(role=role.upper())
+            entries = entries.filter(role=role.upper())
         
         # Filter by availability (for workers/constructors/traders)
-        is_available = self.request.query_params.get('is_available')
         if is_available == 'true':
-            queryset = queryset.filter(
-                models.Q(worker_profile__is_available=True) |
-                models.Q(constructor_profile__is_available=True) |
-                models.Q(trader_profile__is_available=True)
+            entries = entries.filter(is_available=True)
+        
+        # Malformed and non-finite ratings are ignored
+        min_rating = finite_float(min_rating)
+        if min_rating is not None:
+            entries = entries.filter(rating__gte=min_rating)
+        
+        # Filter by area around lat/lng or the current user's location
+        if radius:
+            lat = finite_float(params.get('lat', self.request.user.latitude))
+            lng = finite_float(params.get('lng', self.request.user.longitude))
+            radius_km = finite_float(radius)
+            if radius_km is None or not valid_point(lat, lng):
+                return queryset.none()
+            radius_km = min(radius_km, self.MAX_RADIUS_KM)
+            
+            min_lat, max_lat, min_lng, max_lng = bounding_box(lat, lng, radius_km)
+            entries = entries.filter(
+                latitude__range=(min_lat, max_lat),
+                longitude__range=(min_lng, max_lng),
             )
+            
+            cells = area_cells(lat, lng, radius_km, self.MAX_AREA_CELLS)
+            if cells is not None:
+                entries = entries.filter(cell__in=cells)
         
-        return queryset
+        return queryset.filter(
+            pk__in=entries.values('user_id')
+        ).order_by('-rating', 'id')
 
 
 class WorkerProfileUpdateView(generics.RetrieveUpdateAPIView):
@@ -170,3 +251,156 @@ class ConstructorProfileUpdateView(generics.RetrieveUpdateAPIView):
         # Get or create constructor profile
         profile, created = ConstructorProfile.objects.get_or_create(user=user)
         return profile
+
+
+class AvailabilityListCreateView(generics.ListCreateAPIView):
+    """
+    GET: Current worker's calendar slots (optionally ?start=&end= to window)
+    POST: Publish an available date range (merged with adjacent ranges)
+    """
+    serializer_class = AvailabilitySlotSerializer
+    permission_classes = [IsAuthenticated]
+    
+    def get_queryset(self):
+        queryset = AvailabilitySlot.objects.filter(worker=self.request.user)
+        
+        start = query_date(self.request.query_params, 'start')
+        end = query_date(self.request.query_params, 'end')
+        if start and end:
+            queryset = availability.overlapping(queryset, start, end)
+        
+        return queryset
+    
+    def create(self, request, *args, **kwargs):
+        if request.user.role != User.Role.WORKER:
+            return Response({
+                'error': 'Only workers can publish availability'
+            }, status=status.HTTP_403_FORBIDDEN)
+        
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        
+        slot = availability.add_availability(
+            request.user,
+            serializer.validated_data['start_date'],
+            serializer.validated_data['end_date'],
+            note=serializer.validated_data.get('note', ''),
+        )
+        
+        return Response(AvailabilitySlotSerializer(slot).data, status=status.HTTP_201_CREATED)
+
+
+class AvailabilitySlotDeleteView(generics.DestroyAPIView):
+    """
+    Remove a calendar slot
+    Workers can remove their own slots; customers can cancel bookings they made
+    """
+    permission_classes = [IsAuthenticated]
+    
+    def get_queryset(self):
+        user = self.request.user
+        return AvailabilitySlot.objects.filter(
+            Q(worker=user) | Q(booked_by=user, kind=AvailabilitySlot.Kind.BOOKED)
+        )
+
+
+class WorkerBookingView(APIView):
+    """
+    Book a worker for a date range (Customer only)
+    Returns 409 with the overlapping bookings on conflict
+    """
+    permission_classes = [IsAuthenticated]
+    
+    def post(self, request, pk):
+        if request.user.role != User.Role.CUSTOMER:
+            return Response({
+                'error': 'Only customers can book workers'
+            }, status=status.HTTP_403_FORBIDDEN)
+        
+        try:
+            worker = User.objects.get(pk=pk, role=User.Role.WORKER)
+        except User.DoesNotExist:
+            return Response({
+                'error': 'Worker not found'
+            }, status=status.HTTP_404_NOT_FOUND)
+        
+        serializer = BookingSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        
+        job = None
+        if data.get('job'):
+            try:
+                job = Job.objects.get(pk=data['job'], customer=request.user)
+            except Job.DoesNotExist:
+                return Response({
+                    'error': 'Job not found'
+                }, status=status.HTTP_404_NOT_FOUND)
+        
+        try:
+            slot = availability.book(
+                worker, data['start_date'], data['end_date'],
+                booked_by=request.user, job=job, note=data.get('note', '')
+            )
+        except availability.BookingConflict as e:
+            return Response({
+                'error': str(e),
+                'conflicts': AvailabilitySlotSerializer(e.conflicts, many=True).data
+            }, status=status.HTTP_409_CONFLICT)
+        
+        return Response({
+            'message': 'Worker booked successfully',
+            'booking': AvailabilitySlotSerializer(slot).data
+        }, status=status.HTTP_201_CREATED)
+
+
+class AvailableWorkersView(generics.ListAPIView):
+    """
+    Workers free for a whole date range
+    Query params: start, end (YYYY-MM-DD, required), radius (+ optional lat, lng),
+    skills (comma-separated)
+    """
+    serializer_class = UserSerializer
+    permission_classes = [IsAuthenticated]
+    
+    def list(self, request, *args, **kwargs):
+        start = query_date(request.query_params, 'start')
+        end = query_date(request.query_params, 'end')
+        
+        if not start or not end or start > end:
+            return Response({
+                'error': 'Valid start and end dates (YYYY-MM-DD) are required'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        return super().list(request, *args, **kwargs)
+    
+    def get_queryset(self):
+        params = self.request.query_params
+        
+        lat = lng = radius_km = None
+        if params.get('radius'):
+            radius_km = finite_float(params['radius'])
+            lat = finite_float(params.get('lat', self.request.user.latitude))
+            lng = finite_float(params.get('lng', self.request.user.longitude))
+            if radius_km is None or not valid_point(lat, lng):
+                return User.objects.none()
+        
+        skills = [s for s in params.get('skills', '').split(',') if s.strip()]
+        
+        entries = availability.available_workers(
+            query_date(params, 'start'), query_date(params, 'end'),
+            lat=lat, lng=lng, radius_km=radius_km, skills=skills
+        )
+        
+        queryset = User.objects.filter(pk__in=entries.values('user_id'))
+        return self.get_serializer().narrow(
+            queryset, select_related=('worker_profile',)
+        ).order_by('-rating', 'id')
+
+
+class AsyncUserProfileView(aio.AsyncAPIView):
+    """UserProfileView for ASGI; updates go through UserProfileView"""
+    api_view = UserProfileView
+    
+    def read(self, view, request, *args, **kwargs):
+        return view.retrieve(request, *args, **kwargs)
@@ -7,6 +7,7 @@ const JobCard = ({ job }) => {
     IN_PROGRESS: 'bg-blue-100 text-blue-800',
     COMPLETED: 'bg-gray-100 text-gray-800',
     CANCELLED: 'bg-red-100 text-red-800',
+    EXPIRED: 'bg-yellow-100 text-yellow-800',
   }
 
   return (
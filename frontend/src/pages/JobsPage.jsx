@@ -77,6 +77,7 @@ const JobsPage = () => {
                 <option value="IN_PROGRESS">In Progress</option>
                 <option value="COMPLETED">Completed</option>
                 <option value="CANCELLED">Cancelled</option>
+                <option value="EXPIRED">Expired</option>
               </select>
             </div>
 